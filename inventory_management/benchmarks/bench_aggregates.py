@@ -0,0 +1,103 @@
+"""
+Compares sorting and filtering the first page of items and suppliers by
+their supplier count and item prices computed with annotate() over the
+whole join against the stored aggregates read through their indexes,
+and measures what keeping and repairing the aggregates costs.
+
+    python -m benchmarks.bench_aggregates --items 1000000 --suppliers 100000
+"""
+import argparse
+import json
+import time
+
+from benchmarks.common import setup_django, teardown_django
+
+
+def best(function, repeat: int) -> float:
+    """
+    Returns the best time of repeat calls in milliseconds.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        times.append(time.perf_counter() - start)
+    return round(min(times) * 1000, 2)
+
+
+def read_cases():
+    """
+    Returns (name, annotate query, stored aggregates query) triples, each
+    reading a page of 100 rows.
+    """
+    from django.db.models import Avg, Count, F
+    from supplier_inventory.models import Item, Supplier
+
+    counted = Item.objects.annotate(count=Count('suppliers'))
+    averaged = Supplier.objects.annotate(average=Avg('items__price'))
+    return [
+        ('items by supplier count',
+         counted.order_by('-count', '-id').values('id', 'count'),
+         Item.objects.order_by('-supplier_count', '-id').values(
+             'id', 'supplier_count')),
+        ('items with 3 suppliers or more',
+         counted.filter(count__gte=3).order_by('created_at', 'id').values(
+             'id', 'count'),
+         Item.objects.filter(supplier_count__gte=3).order_by(
+             'supplier_count', 'id').values('id', 'supplier_count')),
+        ('suppliers by average price',
+         averaged.order_by(F('average').desc(nulls_last=True), '-id').values(
+             'id', 'average'),
+         Supplier.objects.order_by(
+             F('avg_item_price').desc(nulls_last=True), '-id').values(
+                 'id', 'avg_item_price')),
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--items', type=int, default=100000)
+    parser.add_argument('--suppliers', type=int, default=10000)
+    parser.add_argument('--density', type=float, default=2.0)
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    path = setup_django()
+    try:
+        from supplier_inventory.generator import generate_inventory
+        from supplier_inventory.models import Item, Supplier
+        from supplier_inventory.signals import repair_aggregates
+
+        start = time.perf_counter()
+        generate_inventory(args.items, args.suppliers, args.density, seed=1)
+        results = {'seed_s': round(time.perf_counter() - start, 1)}
+
+        for name, annotated, stored in read_cases():
+            results[name] = {
+                'annotate_ms': best(
+                    lambda: list(annotated[:100]), args.repeat),
+                'stored_ms': best(lambda: list(stored[:100]), args.repeat),
+            }
+
+        # The busiest supplier, whose prices are recomputed on every link
+        supplier = Supplier.objects.order_by('-item_count').first()
+        item = Item.objects.exclude(suppliers=supplier).first()
+
+        def link():
+            supplier.items.add(item)
+            supplier.items.remove(item)
+        results['link and unlink'] = {
+            'items_of_supplier': supplier.item_count,
+            'ms': best(link, args.repeat)}
+
+        start = time.perf_counter()
+        repaired = repair_aggregates()
+        results['repair'] = {
+            **repaired, 's': round(time.perf_counter() - start, 1)}
+        print(json.dumps(results, indent=2))
+    finally:
+        teardown_django(path)
+
+
+if __name__ == '__main__':
+    main()
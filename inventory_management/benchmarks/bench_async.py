@@ -0,0 +1,113 @@
+"""
+Compares the sync read views served through WSGI with the async read
+views served through ASGI at high concurrency.
+
+WSGI requests run on a thread pool of --threads workers, the way a
+threaded WSGI server serves them; ASGI requests run as --concurrency
+coroutines on one event loop. Both go through the full handler and
+middleware stack in process, so the numbers exclude the network and
+the server itself. To compare real servers, load test
+
+    gunicorn inventory_management.wsgi:application --threads 32
+    uvicorn inventory_management.asgi:application
+
+with the same URLs, e.g. /api/view-items/?item_id=<id> against
+/api/async/view-items/?item_id=<id>.
+
+    python -m benchmarks.bench_async --requests 2000 --concurrency 200
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from benchmarks.common import seed, setup_django, summarise, teardown_django
+
+
+def request_paths(sync: bool, item_ids, count: int):
+    from django.urls import reverse
+    prefix = '' if sync else 'async_'
+    detail = reverse(f'{prefix}view_items')
+    listing = reverse(f'{prefix}view_suppliers')
+    paths = []
+    for n in range(count):
+        if n % 5 == 0:
+            paths.append(f'{listing}?page_size=20&expand=items')
+        else:
+            paths.append(f'{detail}?item_id={random.choice(item_ids)}')
+    return paths
+
+
+def bench_wsgi(paths, threads: int):
+    from django.db import connection
+    from django.test import Client
+
+    def call(path):
+        client = Client()
+        start = time.perf_counter()
+        response = client.get(path)
+        took = time.perf_counter() - start
+        assert response.status_code == 200, response.status_code
+        connection.close()
+        return took
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        latencies = list(pool.map(call, paths))
+    return summarise(latencies, time.perf_counter() - start)
+
+
+async def bench_asgi(paths, concurrency: int):
+    from django.test import AsyncClient
+
+    client = AsyncClient()
+    queue = list(reversed(paths))
+    latencies = []
+
+    async def worker():
+        while queue:
+            path = queue.pop()
+            start = time.perf_counter()
+            response = await client.get(path)
+            latencies.append(time.perf_counter() - start)
+            assert response.status_code == 200, response.status_code
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarise(latencies, time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--items', type=int, default=5000)
+    parser.add_argument('--suppliers', type=int, default=200)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--concurrency', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=32)
+    args = parser.parse_args()
+
+    path = setup_django()
+    try:
+        from supplier_inventory.cache import response_cache
+        from supplier_inventory.models import Item
+
+        # Measure the views, not the response cache.
+        response_cache.ttl = 0
+        seed(args.items, args.suppliers)
+        item_ids = list(Item.objects.values_list('id', flat=True))
+        results = {
+            'wsgi': bench_wsgi(
+                request_paths(True, item_ids, args.requests), args.threads),
+            'asgi': asyncio.run(bench_asgi(
+                request_paths(False, item_ids, args.requests),
+                args.concurrency)),
+        }
+        print(json.dumps(results, indent=2))
+    finally:
+        teardown_django(path)
+
+
+if __name__ == '__main__':
+    main()
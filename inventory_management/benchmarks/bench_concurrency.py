@@ -0,0 +1,162 @@
+"""
+Compares the development and production database profiles under
+threads doing mixed reads and writes through ItemView and SupplierView.
+
+Every profile runs in its own process on its own database, selected
+with INVENTORY_DB_PROFILE like the server. The connections are closed
+or kept between operations the way Django does between requests, so
+the development profile pays a new connection per operation.
+
+    python -m benchmarks.bench_concurrency --threads 8 --operations 300
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from benchmarks.common import seed, setup_django, summarise, teardown_django
+
+PROFILES = ('development', 'production')
+
+
+def operations(item_ids, supplier_ids, count: int, write_ratio: float):
+    """
+    Returns the view calls of one thread, as (view, method, data, kwargs).
+    """
+    from supplier_inventory.views import ItemView, SupplierView
+
+    calls = []
+    for n in range(count):
+        if random.random() < write_ratio:
+            if n % 2:
+                calls.append((ItemView, 'post', {
+                    'name': f'Item {n}', 'description': 'Benchmark',
+                    'price': n % 1000 + 1,
+                    'suppliers': random.sample(supplier_ids, 2)}, {}))
+            else:
+                supplier_id = random.choice(supplier_ids)
+                calls.append((SupplierView, 'put', {
+                    'name': f'Supplier {n}'}, {'supplier_id': supplier_id}))
+        elif n % 4 == 0:
+            calls.append((SupplierView, 'get', {'page_size': 20}, {}))
+        else:
+            calls.append((ItemView, 'get', {
+                'item_id': random.choice(item_ids)}, {}))
+    return calls
+
+
+def worker(calls, latencies, errors):
+    """
+    Runs view calls one after the other like requests of one server
+    thread.
+    """
+    from django.db import close_old_connections, connections
+    from rest_framework.test import APIRequestFactory
+
+    factory = APIRequestFactory()
+    views = {}
+    try:
+        for view_class, method, data, kwargs in calls:
+            view = views.setdefault(view_class, view_class.as_view())
+            if method == 'get':
+                request = factory.get('/', data)
+            else:
+                request = getattr(factory, method)('/', data, format='json')
+            close_old_connections()  # request_started
+            began = time.perf_counter()
+            response = view(request, **kwargs)
+            latencies.append(time.perf_counter() - began)
+            close_old_connections()  # request_finished
+            if response.status_code >= 400:
+                errors.append(str(response.data))
+    finally:
+        connections.close_all()
+
+
+def run(args) -> dict:
+    """
+    Runs the workload on the profile of this process.
+    """
+    path = os.path.join(
+        tempfile.gettempdir(), f'inventory_bench_{args.profile}.db')
+    path = setup_django(path)
+    try:
+        from django.conf import settings
+        from django.db import connection, connections
+        from supplier_inventory.cache import response_cache
+        from supplier_inventory.models import Item, Supplier
+
+        assert settings.INVENTORY_DB_PROFILE == args.profile
+        seed(items=2000, suppliers=100)
+        response_cache.ttl = 0
+        item_ids = [str(pk) for pk in Item.objects.values_list('id', flat=True)]
+        supplier_ids = [
+            str(pk) for pk in Supplier.objects.values_list('id', flat=True)]
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA journal_mode')
+            journal_mode = cursor.fetchone()[0]
+        connections.close_all()
+
+        random.seed(args.seed)
+        latencies, errors = [], []
+        threads = [
+            threading.Thread(target=worker, args=(
+                operations(item_ids, supplier_ids, args.operations,
+                           args.write_ratio),
+                latencies, errors))
+            for _ in range(args.threads)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        locked = sum('locked' in error for error in errors)
+        return {
+            'profile': args.profile,
+            'journal_mode': journal_mode,
+            **summarise(latencies, elapsed),
+            'errors': len(errors),
+            'lock_errors': locked,
+            'lock_error_rate': round(locked / len(latencies), 4),
+        }
+    finally:
+        teardown_django(path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--threads', type=int, default=8)
+    parser.add_argument(
+        '--operations', type=int, default=300, help='per thread')
+    parser.add_argument('--write-ratio', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--profile', choices=PROFILES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.profile:
+        print(json.dumps(run(args)))
+        return
+
+    results = []
+    for profile in PROFILES:
+        output = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.bench_concurrency',
+             '--profile', profile, '--threads', str(args.threads),
+             '--operations', str(args.operations),
+             '--write-ratio', str(args.write_ratio),
+             '--seed', str(args.seed)],
+            env={**os.environ, 'INVENTORY_DB_PROFILE': profile},
+            check=True, capture_output=True, text=True).stdout
+        results.append(json.loads(output.splitlines()[-1]))
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,158 @@
+"""
+Measures the latency and the SQL statements of creating items and
+suppliers: the create and add() sequence the views used to run, the
+validate then insert path they run now, and the POST endpoints.
+
+    python -m benchmarks.bench_create --creates 500 --links 5
+"""
+import argparse
+import json
+import time
+
+from benchmarks.common import seed, setup_django, summarise, teardown_django
+
+
+def orm_item(data):
+    """
+    The previous ItemView.post: count the suppliers, then create the
+    item and add its links in separate autocommitted statements.
+    """
+    from supplier_inventory.models import Item, Supplier
+
+    ids = data['suppliers']
+    assert Supplier.objects.filter(id__in=ids).count() == len(ids)
+    item = Item.objects.create(
+        name=data['name'], description=data['description'],
+        price=data['price'])
+    item.suppliers.add(*ids)
+    return {'Item_id': {item.id}, 'Item_info': str(item)}
+
+
+def orm_supplier(data):
+    """
+    The previous SupplierView.post, reading the items back for the
+    response.
+    """
+    from supplier_inventory.models import Item, Supplier
+    from supplier_inventory.serialiser import SupplierSerialiser
+
+    supplier = Supplier.objects.create(
+        name=data['name'], phone_number=data['phone_number'])
+    ids = data['items']
+    assert Item.objects.filter(id__in=ids).count() == len(ids)
+    supplier.items.add(*ids)
+    return SupplierSerialiser(supplier).data
+
+
+def view_call(view_class):
+    """
+    Returns a function posting data straight to a view method, without
+    the HTTP client and middleware.
+    """
+    from rest_framework.test import APIRequestFactory
+
+    factory, view = APIRequestFactory(), view_class.as_view()
+
+    def post(data):
+        response = view(factory.post('/', data, format='json'))
+        assert response.status_code == 201, response.data
+        return response.data
+    return post
+
+
+def endpoint(name):
+    """
+    Returns a function posting data to an endpoint through the test
+    client.
+    """
+    from django.urls import reverse
+    from rest_framework.test import APIClient
+
+    client, url = APIClient(), reverse(name)
+
+    def post(data):
+        response = client.post(url, data, format='json')
+        assert response.status_code == 201, response.data
+        return response.data
+    return post
+
+
+def measure(create, payloads):
+    """
+    Runs create once per payload, returning the latency summary and the
+    statements per create.
+    """
+    from django.db import connection
+
+    statements = 0
+
+    def count(execute, sql, params, many, context):
+        nonlocal statements
+        statements += 1
+        return execute(sql, params, many, context)
+
+    latencies = []
+    with connection.execute_wrapper(count):
+        start = time.perf_counter()
+        for payload in payloads:
+            began = time.perf_counter()
+            create(payload)
+            latencies.append(time.perf_counter() - began)
+        elapsed = time.perf_counter() - start
+    summary = summarise(latencies, elapsed)
+    summary['statements'] = round(statements / len(payloads), 1)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--creates', type=int, default=500)
+    parser.add_argument(
+        '--links', type=int, default=5,
+        help='suppliers per new item and items per new supplier')
+    args = parser.parse_args()
+
+    path = setup_django()
+    try:
+        from supplier_inventory.cache import response_cache
+        from supplier_inventory.models import Item, Supplier
+        from supplier_inventory.views import ItemView, SupplierView
+
+        seed(items=1000, suppliers=100)
+        response_cache.ttl = 0
+        supplier_ids = [str(pk) for pk in Supplier.objects.values_list(
+            'id', flat=True)[:args.links]]
+        item_ids = [str(pk) for pk in Item.objects.values_list(
+            'id', flat=True)[:args.links]]
+
+        def items(path):
+            return [
+                {'name': f'{path} item {n}', 'description': 'Benchmark',
+                 'price': n % 1000 + 1, 'suppliers': supplier_ids}
+                for n in range(args.creates)]
+
+        def suppliers(path):
+            return [
+                {'name': f'{path} supplier {n}', 'phone_number': '0700000000',
+                 'items': item_ids}
+                for n in range(args.creates)]
+
+        paths = [
+            ('item', 'orm', orm_item, items),
+            ('item', 'view', view_call(ItemView), items),
+            ('item', 'endpoint', endpoint('add_item'), items),
+            ('supplier', 'orm', orm_supplier, suppliers),
+            ('supplier', 'view', view_call(SupplierView), suppliers),
+            ('supplier', 'endpoint', endpoint('add_supplier'), suppliers),
+        ]
+        results = []
+        for model, name, create, payloads in paths:
+            summary = measure(create, payloads(name))
+            results.append({'create': model, 'path': name, **summary})
+        print(json.dumps(results, indent=2))
+    finally:
+        teardown_django(path)
+
+
+if __name__ == '__main__':
+    main()
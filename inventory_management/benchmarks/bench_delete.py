@@ -0,0 +1,86 @@
+"""
+Measures deleting a supplier linked to many items: the ORM delete the
+views used to run, which loads the supplier and updates the linked items
+in chunks of IDs from its signals, and the set based delete_objects.
+
+    python -m benchmarks.bench_delete --links 1000 10000 100000
+"""
+import argparse
+import json
+import time
+
+from benchmarks.common import setup_django, teardown_django
+
+
+def orm_delete(supplier_id):
+    from supplier_inventory.models import Supplier
+
+    supplier = Supplier.objects.get(id=supplier_id)
+    str(supplier)
+    supplier.delete()
+
+
+def set_delete(supplier_id):
+    from supplier_inventory.deleter import delete_object
+    from supplier_inventory.models import Supplier
+
+    assert delete_object(Supplier, str(supplier_id))
+
+
+def measure(delete, links: int, repeat: int) -> dict:
+    """
+    Deletes a supplier linked to links items, repeat times on fresh
+    data, returning the best time and the statements.
+    """
+    from django.db import connection
+    from supplier_inventory.generator import generate_inventory
+    from supplier_inventory.models import Item, Supplier
+
+    statements = 0
+
+    def count(execute, sql, params, many, context):
+        nonlocal statements
+        statements += 1
+        return execute(sql, params, many, context)
+
+    best = None
+    for run in range(repeat):
+        Item.objects.all()._raw_delete(connection.alias)
+        Supplier.objects.all().delete()
+        generate_inventory(links, 1, density=1, seed=run)
+        supplier_id = Supplier.objects.values_list('id', flat=True).get()
+        statements = 0
+        with connection.execute_wrapper(count):
+            start = time.perf_counter()
+            delete(supplier_id)
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+        assert not Supplier.items.through.objects.exists()
+    return {'ms': round(best * 1000, 1), 'statements': statements}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        '--links', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    path = setup_django()
+    try:
+        from supplier_inventory.cache import response_cache
+
+        response_cache.ttl = 0
+        results = []
+        for links in args.links:
+            for name, delete in (('orm', orm_delete), ('set', set_delete)):
+                results.append({
+                    'links': links, 'path': name,
+                    **measure(delete, links, args.repeat)})
+        print(json.dumps(results, indent=2))
+    finally:
+        teardown_django(path)
+
+
+if __name__ == '__main__':
+    main()
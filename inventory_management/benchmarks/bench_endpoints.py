@@ -0,0 +1,396 @@
+"""
+Drives every route of supplier_inventory/urls.py and reports the
+throughput, p50/p95/p99 latencies, SQL statements and status codes of
+each as JSON, to compare runs across commits.
+
+By default the requests go through the Django test client against a
+throwaway database seeded with --items and --suppliers. With --url they
+go over HTTP to a running server, which reports its statements when
+started with INVENTORY_QUERY_TIMING=1. The statements of a streamed
+response run after its headers are sent and are not counted.
+
+    python -m benchmarks.bench_endpoints --items 100000 --suppliers 10000 \\
+        --output before.json
+    python -m benchmarks.bench_endpoints --url http://127.0.0.1:8000 \\
+        --baseline before.json
+"""
+import argparse
+import http.client
+import json
+import logging
+import platform
+import subprocess
+import sys
+import time
+from collections import Counter
+from datetime import datetime, timezone
+from typing import Any, Callable, List, Optional, Tuple
+from urllib.parse import urlencode, urlsplit
+
+from benchmarks.common import setup_django, summarise, teardown_django
+
+# A request: method, path and JSON or raw body with its content type
+Request = Tuple[str, str, Any, Optional[str]]
+
+
+class ClientTransport:
+    """
+    Sends requests through the Django test client.
+    """
+
+    def __init__(self):
+        from django.test import Client
+        self.client = Client()
+
+    def send(self, method, path, body=None, content_type=None):
+        if content_type is None and body is not None:
+            body, content_type = json.dumps(body), 'application/json'
+        response = self.client.generic(
+            method, path, body or '', content_type or 'application/json')
+        if response.streaming:
+            content = b''.join(response.streaming_content)
+        else:
+            content = response.content
+        return (
+            response.status_code, response.headers.get('X-Query-Count'),
+            content)
+
+
+class HttpTransport:
+    """
+    Sends requests to a running server over one keep-alive connection.
+    """
+
+    def __init__(self, url: str):
+        parts = urlsplit(url)
+        connection_class = (
+            http.client.HTTPSConnection if parts.scheme == 'https'
+            else http.client.HTTPConnection)
+        self.connection = connection_class(parts.netloc)
+
+    def send(self, method, path, body=None, content_type=None):
+        if content_type is None and body is not None:
+            body, content_type = json.dumps(body), 'application/json'
+        headers = {'Content-Type': content_type} if content_type else {}
+        self.connection.request(method, path, body, headers)
+        response = self.connection.getresponse()
+        content = response.read()
+        return (
+            response.status, response.getheader('X-Query-Count'), content)
+
+
+class Fixture:
+    """
+    The IDs the requests refer to, read through the API so both
+    transports work the same.
+    """
+
+    def __init__(self, transport, count: int):
+        from django.urls import reverse
+
+        self.transport = transport
+        self.items = self.ids(reverse('view_items'), count)
+        self.suppliers = self.ids(reverse('view_suppliers'), count)
+        if not self.items or not self.suppliers:
+            raise SystemExit('Seed items and suppliers first')
+
+    def ids(self, path: str, count: int) -> List[str]:
+        query = urlencode({'page_size': count, 'fields': 'id'})
+        status, _, content = self.transport.send('GET', f'{path}?{query}')
+        if status != 200:
+            raise SystemExit(f'GET {path} returned {status}')
+        return [row['id'] for row in json.loads(content)]
+
+    def item(self, n: int) -> str:
+        return self.items[n % len(self.items)]
+
+    def supplier(self, n: int) -> str:
+        return self.suppliers[n % len(self.suppliers)]
+
+    def create(self, route: str, count: int) -> List[str]:
+        """
+        Creates count items or suppliers to be deleted, untimed.
+        """
+        from django.urls import reverse
+
+        created = []
+        for n in range(count):
+            body = (
+                item_body(self, n) if route == 'add_item'
+                else supplier_body(self, n))
+            status, _, content = self.transport.send(
+                'POST', reverse(route), body)
+            if status != 201:
+                raise SystemExit(f'POST {route} returned {status}: {content}')
+            data = json.loads(content)
+            created.append(data.get('id') or data['Item_id'][0])
+        return created
+
+
+def item_body(fixture: Fixture, n: int) -> dict:
+    return {
+        'name': f'Benchmark item {n}', 'description': 'Created by the bench',
+        'price': n % 1000 + 1,
+        'suppliers': [fixture.supplier(n), fixture.supplier(n + 1)]}
+
+
+def supplier_body(fixture: Fixture, n: int) -> dict:
+    return {
+        'name': f'Benchmark supplier {n}', 'phone_number': '0700000000',
+        'items': [fixture.item(n), fixture.item(n + 1)]}
+
+
+class Case:
+    """
+    A benchmarked request of a route.
+
+    Args:
+        name (str): The name of the case in the report.
+        route (str): The URL name of the route.
+        build (Callable): Returns the request of the nth run, given the
+            fixture, n and what prepare returned.
+        prepare (Callable): Creates what the requests consume, such as
+            rows to delete, untimed.
+        limit (int): The most requests, for slow routes.
+    """
+
+    def __init__(
+            self, name: str, route: str,
+            build: Callable[[Fixture, int, Any], Request],
+            prepare: Callable[[Fixture, int], Any] = None,
+            limit: int = None):
+        self.name = name
+        self.route = route
+        self.build = build
+        self.prepare = prepare
+        self.limit = limit
+
+
+def url(route: str, *args, **params) -> str:
+    from django.urls import reverse
+    path = reverse(route, args=args)
+    return f'{path}?{urlencode(params)}' if params else path
+
+
+def ndjson(fixture: Fixture, n: int, rows: int = 100) -> bytes:
+    return ''.join(
+        json.dumps({**item_body(fixture, n * rows + row),
+                    'name': f'Imported item {n}-{row}'}) + '\n'
+        for row in range(rows)).encode()
+
+
+CASES = [
+    Case('view_items', 'view_items', lambda f, n, _: (
+        'GET', url('view_items'), None, None)),
+    Case('view_items:expand', 'view_items', lambda f, n, _: (
+        'GET', url('view_items', expand='suppliers'), None, None)),
+    Case('view_items:details', 'view_items', lambda f, n, _: (
+        'GET', url('view_items', item_id=f.item(n)), None, None)),
+    Case('view_items_batch', 'view_items_batch', lambda f, n, _: (
+        'GET', url('view_items_batch', ids=','.join(f.items[:100])),
+        None, None)),
+    Case('add_item', 'add_item', lambda f, n, _: (
+        'POST', url('add_item'), item_body(f, n), None)),
+    Case('update_item', 'update_item', lambda f, n, _: (
+        'PUT', url('update_item', f.item(n)), {'price': n % 1000 + 1},
+        None)),
+    Case('delete_item', 'delete_item', lambda f, n, ids: (
+        'DELETE', url('delete_item', ids[n]), None, None),
+        prepare=lambda f, count: f.create('add_item', count)),
+    Case('delete_items', 'delete_items', lambda f, n, ids: (
+        'DELETE', url('delete_items'), ids[n * 10:n * 10 + 10], None),
+        prepare=lambda f, count: f.create('add_item', count * 10)),
+    Case('update_items', 'update_items', lambda f, n, _: (
+        'PATCH', url('update_items'),
+        [{'id': f.item(n * 10 + k), 'price': k + 1} for k in range(10)],
+        None)),
+    Case('import_items', 'import_items', lambda f, n, _: (
+        'POST', url('import_items'), ndjson(f, n), 'application/x-ndjson'),
+        limit=100),
+    Case('export_items', 'export_items', lambda f, n, _: (
+        'GET', url('export_items'), None, None), limit=3),
+    Case('search_items', 'search_items', lambda f, n, _: (
+        'GET', url('search_items', q='steel drill'), None, None)),
+    Case('view_suppliers', 'view_suppliers', lambda f, n, _: (
+        'GET', url('view_suppliers'), None, None)),
+    Case('view_suppliers:expand', 'view_suppliers', lambda f, n, _: (
+        'GET', url('view_suppliers', expand='items'), None, None)),
+    Case('view_suppliers:details', 'view_suppliers', lambda f, n, _: (
+        'GET', url('view_suppliers', supplier_id=f.supplier(n)),
+        None, None)),
+    Case('view_suppliers_batch', 'view_suppliers_batch', lambda f, n, _: (
+        'GET', url('view_suppliers_batch', ids=','.join(f.suppliers[:100])),
+        None, None)),
+    Case('add_supplier', 'add_supplier', lambda f, n, _: (
+        'POST', url('add_supplier'), supplier_body(f, n), None)),
+    Case('update_supplier', 'update_supplier', lambda f, n, _: (
+        'PUT', url('update_supplier', f.supplier(n)),
+        {'name': f'Renamed supplier {n}'}, None)),
+    Case('delete_supplier', 'delete_supplier', lambda f, n, ids: (
+        'DELETE', url('delete_supplier', ids[n]), None, None),
+        prepare=lambda f, count: f.create('add_supplier', count)),
+    Case('delete_suppliers', 'delete_suppliers', lambda f, n, ids: (
+        'DELETE', url('delete_suppliers'), ids[n * 10:n * 10 + 10], None),
+        prepare=lambda f, count: f.create('add_supplier', count * 10)),
+    Case('cache_stats', 'cache_stats', lambda f, n, _: (
+        'GET', url('cache_stats'), None, None)),
+    Case('metrics', 'metrics', lambda f, n, _: (
+        'GET', url('metrics'), None, None)),
+    Case('async_view_items', 'async_view_items', lambda f, n, _: (
+        'GET', url('async_view_items'), None, None)),
+    Case('async_view_suppliers', 'async_view_suppliers', lambda f, n, _: (
+        'GET', url('async_view_suppliers'), None, None)),
+]
+
+
+def check_coverage() -> None:
+    """
+    Fails when a route has no case, so new routes get benchmarked.
+    """
+    from supplier_inventory.urls import urlpatterns
+
+    missing = {pattern.name for pattern in urlpatterns} - {
+        case.route for case in CASES}
+    if missing:
+        raise SystemExit(f"No benchmark case for {', '.join(sorted(missing))}")
+
+
+def run_case(transport, fixture: Fixture, case: Case, requests: int,
+             warmup: int) -> dict:
+    """
+    Sends the requests of a case one after the other.
+
+    Returns:
+        dict: The latency summary, the statements per request and the
+        status codes.
+    """
+    requests = min(requests, case.limit or requests)
+    warmup = min(warmup, requests)
+    state = case.prepare(fixture, warmup + requests) if case.prepare else None
+    for n in range(warmup):
+        transport.send(*case.build(fixture, n, state))
+
+    latencies, queries, statuses = [], [], Counter()
+    start = time.perf_counter()
+    for n in range(warmup, warmup + requests):
+        request = case.build(fixture, n, state)
+        began = time.perf_counter()
+        status, query_count, _ = transport.send(*request)
+        latencies.append(time.perf_counter() - began)
+        statuses[str(status)] += 1
+        if query_count is not None:
+            queries.append(int(query_count))
+    summary = summarise(latencies, time.perf_counter() - start)
+    summary['queries_mean'] = (
+        round(sum(queries) / len(queries), 1) if queries else None)
+    summary['queries_max'] = max(queries) if queries else None
+    summary['statuses'] = dict(sorted(statuses.items()))
+    return summary
+
+
+def commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True,
+            text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(results: dict, baseline: dict) -> None:
+    """
+    Prints the p50 and p99 latencies of every case next to a previous
+    run.
+    """
+    print(f"{'case':<26}{'p50 ms':>16}{'p99 ms':>18}", file=sys.stderr)
+    for name, summary in results['cases'].items():
+        before = baseline['cases'].get(name)
+        if before is None:
+            continue
+        columns = ''.join(
+            f"{before[key]:>8} -> {summary[key]:<7}"
+            for key in ('p50_ms', 'p99_ms'))
+        print(f'{name:<26}{columns}', file=sys.stderr)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--warmup', type=int, default=5)
+    parser.add_argument('--items', type=int, default=10000)
+    parser.add_argument('--suppliers', type=int, default=1000)
+    parser.add_argument('--density', type=float, default=2.0)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument(
+        '--url', help='Benchmark a running server instead of the test '
+        'client, its data is left as the benchmark leaves it')
+    parser.add_argument(
+        '--cases', nargs='*', help='Run only these cases')
+    parser.add_argument('--output', '-o', help='JSON file to write to')
+    parser.add_argument('--baseline', help='JSON file of a previous run')
+    args = parser.parse_args()
+
+    path = None
+    if args.url:
+        import django
+        django.setup()
+    else:
+        path = setup_django()
+    try:
+        from django.conf import settings
+
+        check_coverage()
+        results = {
+            'commit': commit(),
+            'created': datetime.now(timezone.utc).isoformat(
+                timespec='seconds'),
+            'python': platform.python_version(),
+            'target': args.url or 'test client',
+            'requests': args.requests,
+            'dataset': None,
+            'cases': {},
+        }
+        if args.url:
+            transport = HttpTransport(args.url)
+        else:
+            from supplier_inventory.generator import generate_inventory
+
+            start = time.perf_counter()
+            created = generate_inventory(
+                args.items, args.suppliers, args.density, args.seed)
+            results['dataset'] = {
+                **created, 'density': args.density, 'seed': args.seed,
+                'seed_s': round(time.perf_counter() - start, 1)}
+            # Statements are read from X-Query-Count, without logging
+            # the requests over budget
+            settings.INVENTORY_QUERY_TIMING = True
+            settings.INVENTORY_QUERY_BUDGET = 0
+            settings.INVENTORY_LATENCY_BUDGET_MS = 0
+            logging.getLogger('django.request').setLevel(logging.ERROR)
+            transport = ClientTransport()
+
+        fixture = Fixture(transport, 1000)
+        for case in CASES:
+            if args.cases and case.name not in args.cases:
+                continue
+            results['cases'][case.name] = run_case(
+                transport, fixture, case, args.requests, args.warmup)
+            print(f'{case.name}: {results["cases"][case.name]}',
+                  file=sys.stderr)
+
+        report = json.dumps(results, indent=2)
+        if args.output:
+            with open(args.output, 'w') as output:
+                output.write(report + '\n')
+        else:
+            print(report)
+        if args.baseline:
+            with open(args.baseline) as baseline:
+                compare(results, json.load(baseline))
+    finally:
+        if path:
+            teardown_django(path)
+
+
+if __name__ == '__main__':
+    main()
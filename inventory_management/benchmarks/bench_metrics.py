@@ -0,0 +1,109 @@
+"""
+Measures the cost of recording request metrics: the registry calls of
+one request, the whole MetricsMiddleware around a view doing nothing,
+the same from several threads at once, and a scrape.
+
+    python -m benchmarks.bench_metrics --requests 200000 --threads 4
+"""
+import argparse
+import json
+import threading
+import time
+
+from benchmarks.common import setup_django, teardown_django
+
+
+def per_request(function, requests: int, clock=time.perf_counter) -> float:
+    """
+    Returns the mean time of function in microseconds.
+    """
+    start = clock()
+    for _ in range(requests):
+        function()
+    return (clock() - start) / requests * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--requests', type=int, default=200000)
+    parser.add_argument('--threads', type=int, default=4)
+    args = parser.parse_args()
+
+    path = setup_django()
+    try:
+        from django.http import HttpResponse
+        from django.test import RequestFactory
+        from django.urls import resolve
+        from supplier_inventory.metrics import (
+            MetricsMiddleware, MetricsRegistry)
+
+        registry = MetricsRegistry()
+        request = RequestFactory().get('/api/view-items/')
+        request.resolver_match = resolve('/api/view-items/')
+        response = HttpResponse()
+
+        def view(request):
+            return response
+
+        middleware = MetricsMiddleware(view, registry)
+
+        def record():
+            registry.track('view_items', 'GET', 1)
+            registry.observe('view_items', 'GET', 200, 0.003, in_flight=-1)
+
+        def serve():
+            # The handler calls process_view inside the middleware, the
+            # order makes no difference to the cost
+            middleware.process_view(request, view, (), {})
+            return middleware(request)
+
+        def bare():
+            return view(request)
+
+        bare_us = per_request(bare, args.requests, time.thread_time)
+        middleware_us = per_request(serve, args.requests, time.thread_time)
+
+        threaded = []
+
+        def worker():
+            # CPU time of the thread, the wall time includes waiting for
+            # the GIL held by the other threads
+            threaded.append(
+                per_request(serve, args.requests, time.thread_time))
+
+        threads = [
+            threading.Thread(target=worker) for _ in range(args.threads)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        total = args.requests * args.threads
+
+        # A realistic number of series before scraping
+        for name in ('view_items', 'add_item', 'update_item', 'search_items',
+                     'view_suppliers', 'add_supplier', 'metrics'):
+            for status in (200, 201, 304, 400, 404):
+                registry.observe(name, 'GET', status, 0.01)
+        scrape_start = time.perf_counter()
+        text = registry.render()
+        scrape_ms = (time.perf_counter() - scrape_start) * 1000
+
+        print(json.dumps({
+            'record_us': round(per_request(record, args.requests), 3),
+            'middleware_overhead_us': round(middleware_us - bare_us, 3),
+            'threads': args.threads,
+            'threaded_requests_per_s': round(total / elapsed),
+            'threaded_overhead_us': round(
+                sum(threaded) / len(threaded) - bare_us, 3),
+            'shards': len(registry.shards),
+            'scrape_ms': round(scrape_ms, 3),
+            'scrape_lines': text.count('\n'),
+        }, indent=2))
+    finally:
+        teardown_django(path)
+
+
+if __name__ == '__main__':
+    main()
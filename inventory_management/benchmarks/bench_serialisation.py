@@ -0,0 +1,85 @@
+"""
+Compares serialising and rendering the item list with ItemSerialiser and
+JSONRenderer against the values() projection and FastJSONRenderer used
+by the GETs, over the whole table at several sizes.
+
+    python -m benchmarks.bench_serialisation --sizes 10000 100000 1000000
+"""
+import argparse
+import json
+import time
+
+from benchmarks.common import setup_django, teardown_django
+
+
+def seed_items(count: int) -> None:
+    """
+    Inserts items with the bulk import helpers, much faster than
+    bulk_create at a million rows.
+    """
+    from django.db import connection, transaction
+    from supplier_inventory.importer import insert_rows
+    from supplier_inventory.models import Item
+    from supplier_inventory.utils import chunked
+
+    rows = ({'id': Item._meta.pk.get_default(), 'name': f'Item {n}',
+             'description': f'Description of item {n} ' * 4,
+             'price': n % 100000 / 100}
+            for n in range(count))
+    for chunk in chunked(rows, 10000):
+        with transaction.atomic():
+            insert_rows(connection, Item, chunk)
+
+
+def serialiser_path():
+    from rest_framework.renderers import JSONRenderer
+    from supplier_inventory.models import Item
+    from supplier_inventory.serialiser import ItemSerialiser
+
+    items = Item.objects.order_by('created_at', 'id')
+    return JSONRenderer().render(ItemSerialiser(items, many=True).data)
+
+
+def projection_path():
+    from supplier_inventory.models import Item
+    from supplier_inventory.renderers import FastJSONRenderer
+    from supplier_inventory.views import ITEM_FIELDS
+
+    rows = ITEM_FIELDS.values(Item.objects.order_by('created_at', 'id'))
+    return FastJSONRenderer().render(ITEM_FIELDS.rows(rows))
+
+
+def timed(function):
+    start = time.perf_counter()
+    output = function()
+    return time.perf_counter() - start, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        '--sizes', type=int, nargs='+', default=[10000, 100000, 1000000])
+    args = parser.parse_args()
+
+    path = setup_django()
+    try:
+        results, seeded = [], 0
+        for size in sorted(args.sizes):
+            seed_items(size - seeded)
+            seeded = size
+            serialiser_seconds, expected = timed(serialiser_path)
+            projection_seconds, output = timed(projection_path)
+            assert output == expected, 'outputs differ'
+            results.append({
+                'rows': size,
+                'serialiser_s': round(serialiser_seconds, 3),
+                'projection_s': round(projection_seconds, 3),
+                'speed_up': round(serialiser_seconds / projection_seconds, 1),
+            })
+        print(json.dumps(results, indent=2))
+    finally:
+        teardown_django(path)
+
+
+if __name__ == '__main__':
+    main()
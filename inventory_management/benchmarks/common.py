@@ -0,0 +1,91 @@
+"""
+Shared helpers of the benchmark scripts.
+
+The scripts run against a throwaway SQLite file database, never the
+development database, and are started from the project directory:
+
+    python -m benchmarks.bench_async
+"""
+import os
+import statistics
+import tempfile
+from typing import Dict, List
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'inventory_management.settings')
+
+
+def setup_django(path: str = None) -> str:
+    """
+    Configures Django and creates a migrated benchmark database.
+
+    Args:
+        path (str): The database file, a temporary file by default.
+
+    Returns:
+        str: The path of the database file.
+    """
+    import django
+    from django.db import connection
+    from django.test.utils import setup_test_environment
+
+    django.setup()
+    setup_test_environment()
+    path = path or os.path.join(tempfile.gettempdir(), 'inventory_bench.db')
+    connection.settings_dict['TEST']['NAME'] = path
+    connection.creation.create_test_db(
+        verbosity=0, serialize=False, autoclobber=True)
+    return path
+
+
+def teardown_django(path: str) -> None:
+    """
+    Removes the benchmark database.
+    """
+    from django.db import connections
+    connections.close_all()
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def seed(items: int, suppliers: int, links_per_item: int = 2) -> None:
+    """
+    Fills the benchmark database with items linked to suppliers.
+    """
+    from supplier_inventory.models import Item, Supplier
+
+    supplier_rows = Supplier.objects.bulk_create(
+        Supplier(name=f'Supplier {n}', phone_number=f'07{n:08d}')
+        for n in range(suppliers))
+    item_rows = Item.objects.bulk_create(
+        Item(name=f'Item {n}', description=f'Description of item {n}',
+             price=n % 1000 + 1)
+        for n in range(items))
+    Link = Supplier.items.through
+    Link.objects.bulk_create(
+        Link(item_id=item.id,
+             supplier_id=supplier_rows[(n + k) % suppliers].id)
+        for n, item in enumerate(item_rows)
+        for k in range(min(links_per_item, suppliers)))
+
+
+def summarise(latencies: List[float], elapsed: float) -> Dict[str, float]:
+    """
+    Summarises request latencies in seconds.
+
+    Returns:
+        dict: Requests per second and p50/p95/p99 latencies in
+        milliseconds.
+    """
+    ordered = sorted(latencies)
+
+    def percentile(p):
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p))] * 1000
+
+    return {
+        'requests': len(ordered),
+        'rps': round(len(ordered) / elapsed, 1),
+        'mean_ms': round(statistics.fmean(ordered) * 1000, 2),
+        'p50_ms': round(percentile(0.50), 2),
+        'p95_ms': round(percentile(0.95), 2),
+        'p99_ms': round(percentile(0.99), 2),
+    }
@@ -13,4 +13,12 @@ from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'inventory_management.settings')
 
-application = get_asgi_application()
+django_application = get_asgi_application()
+
+from django.urls import reverse  # noqa: E402
+from supplier_inventory.events import StreamDisconnectMiddleware  # noqa: E402
+
+# Django 4.2 does not notice clients leaving a streaming response, the
+# change stream is told by this middleware
+application = StreamDisconnectMiddleware(
+    django_application, paths=[reverse('stream_changes')])
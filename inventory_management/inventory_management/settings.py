@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/4.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -42,7 +43,10 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'supplier_inventory.metrics.MetricsMiddleware',
+    'supplier_inventory.instrumentation.QueryTimingMiddleware',
     'django.middleware.security.SecurityMiddleware',
+    'supplier_inventory.routing.ReplicaRoutingMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -82,6 +86,58 @@ DATABASES = {
     }
 }
 
+# SQLite tuning, picked with the INVENTORY_DB_PROFILE environment variable.
+# The production profile keeps connections open across requests, switches the
+# database to WAL so readers and the writer do not block each other, waits on
+# locks rather than failing and starts atomic blocks with BEGIN IMMEDIATE.
+# The pragmas are applied to every new connection by
+# supplier_inventory.database.
+
+INVENTORY_DB_PROFILE = os.environ.get('INVENTORY_DB_PROFILE', 'development')
+
+INVENTORY_SQLITE_PRAGMAS = {}
+
+INVENTORY_SQLITE_IMMEDIATE = False
+
+if INVENTORY_DB_PROFILE == 'production':
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': 600,
+        'CONN_HEALTH_CHECKS': True,
+    })
+    INVENTORY_SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': 5000,
+        'mmap_size': 256 * 1024 * 1024,
+        'cache_size': -64 * 1024,
+        'temp_store': 'MEMORY',
+    }
+    INVENTORY_SQLITE_IMMEDIATE = True
+elif INVENTORY_DB_PROFILE != 'development':
+    raise ValueError(
+        f"Unknown INVENTORY_DB_PROFILE '{INVENTORY_DB_PROFILE}', "
+        "use development or production")
+
+# Read replicas. Reads are spread over INVENTORY_READ_REPLICAS and writes go to
+# default; a client that writes keeps reading from default for
+# INVENTORY_REPLICA_STICKY_SECONDS so that it sees its own changes.
+# INVENTORY_REPLICA_DB=<path> adds a SQLite copy of the database as a replica,
+# kept up to date with `manage.py sync_replica --interval 1`.
+
+DATABASE_ROUTERS = ['supplier_inventory.routing.ReplicaRouter']
+
+INVENTORY_READ_REPLICAS = []
+
+INVENTORY_REPLICA_STICKY_SECONDS = 10
+
+if INVENTORY_REPLICA_DB := os.environ.get('INVENTORY_REPLICA_DB'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': INVENTORY_REPLICA_DB,
+        'TEST': {'MIRROR': 'default'},
+    }
+    INVENTORY_READ_REPLICAS = ['replica']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
@@ -123,3 +179,91 @@ STATIC_URL = 'static/'
 # https://docs.djangoproject.com/en/4.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+# Django REST framework
+# JSON is rendered with orjson, byte for byte like the default JSONRenderer
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': [
+        'supplier_inventory.renderers.FastJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ],
+}
+
+# Inventory API
+# Keyset pagination of the item and supplier list endpoints
+
+INVENTORY_PAGE_SIZE = 100
+
+INVENTORY_MAX_PAGE_SIZE = 1000
+
+# Rows validated and inserted per transaction by the bulk item import
+
+INVENTORY_IMPORT_CHUNK_SIZE = 2000
+
+# Most IDs accepted by the item and supplier batch lookups
+
+INVENTORY_BATCH_MAX_IDS = 1000
+
+# Largest list of item changes accepted by the bulk item update
+
+INVENTORY_BULK_UPDATE_MAX_ITEMS = 10000
+
+# Most IDs accepted by the item and supplier bulk deletes
+
+INVENTORY_BULK_DELETE_MAX_IDS = 10000
+
+# Items read per database round trip by the catalogue export
+
+INVENTORY_EXPORT_CHUNK_SIZE = 2000
+
+# Change feed at /api/changes/. Changes younger than
+# INVENTORY_CHANGES_LAG_SECONDS are held back until transactions that started
+# before them have committed, and tombstones of deleted objects are kept
+# INVENTORY_TOMBSTONE_DAYS, older cursors must sync again from the start
+
+INVENTORY_CHANGES_LAG_SECONDS = 5
+
+INVENTORY_TOMBSTONE_DAYS = 30
+
+# Live change stream at /api/async/stream-changes/, served under ASGI. Each
+# client keeps up to INVENTORY_STREAM_BUFFER unread events, dropping the
+# oldest, and idle streams send a heartbeat every
+# INVENTORY_STREAM_HEARTBEAT_SECONDS
+
+INVENTORY_STREAM_BUFFER = 1000
+
+INVENTORY_STREAM_HEARTBEAT_SECONDS = 15
+
+# Read-through cache of the item and supplier detail payloads, an in-process
+# LRU in front of the Django cache named by INVENTORY_CACHE_ALIAS. Writes drop
+# the entries of the shared cache and of the LRU of their own worker, the LRUs
+# of the other workers keep theirs for INVENTORY_CACHE_LOCAL_TTL seconds. With
+# several workers the alias must name a cache they share, such as Redis or
+# Memcached, the default local memory cache is per process.
+
+INVENTORY_CACHE_ALIAS = 'default'
+
+INVENTORY_CACHE_TTL = 60
+
+INVENTORY_CACHE_LOCAL_TTL = 2
+
+INVENTORY_CACHE_MAX_ENTRIES = 1024
+
+# Per request SQL accounting, turned on with INVENTORY_QUERY_TIMING=1. Responses
+# get X-Query-Count and Server-Timing headers, and requests over either budget
+# are logged with their INVENTORY_SLOW_QUERIES_LOGGED slowest statements
+
+INVENTORY_QUERY_TIMING = os.environ.get('INVENTORY_QUERY_TIMING') == '1'
+
+INVENTORY_QUERY_BUDGET = 50
+
+INVENTORY_LATENCY_BUDGET_MS = 500
+
+INVENTORY_SLOW_QUERIES_LOGGED = 5
+
+# Request latency histograms, status code counters and in-flight gauges per
+# view, exposed to Prometheus at /api/metrics/
+
+INVENTORY_METRICS = True
@@ -0,0 +1,117 @@
+from typing import Any, Dict, Iterable, List
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from .models import Item, Supplier
+from .utils import chunked, query_chunk_size
+
+# Item.supplier_count and the item count and price range of Supplier
+# are stored on the rows, so the lists sort and filter on them through
+# an index instead of counting the Supplier.items join per request.
+#
+# They are recomputed with correlated subqueries in the UPDATE bumping
+# the updated_at of the rows whose related rows changed, see
+# signals.touch, so keeping them costs no extra statement. The
+# subqueries join the table on the other side rather than reading the
+# links alone, rows deleted earlier in the transaction are not counted.
+#
+# The subqueries are written in SQL from the model metadata, like the
+# INSERT statements of the importer. Built with Subquery() and
+# OuterRef() the ORM spends longer compiling the four of Supplier than
+# the database spends running them, on every link written.
+
+
+def subquery(through, model, other, select: str) -> str:
+    """
+    Returns a correlated subquery aggregating the rows of other linked
+    to the outer row of model.
+
+    Args:
+        through (Model): The Supplier.items through model.
+        model (Model): The model of the outer rows, Item or Supplier.
+        other (Model): The model on the other side of the links.
+        select (str): The aggregate to select, the columns of other
+            qualified with its table.
+    """
+    quote = connection.ops.quote_name
+    link = quote(through._meta.db_table)
+    columns = {
+        field.related_model._meta.db_table: f'{link}.{quote(field.column)}'
+        for field in through._meta.get_fields() if field.many_to_one}
+    table, other_table = (
+        quote(model._meta.db_table), quote(other._meta.db_table))
+    return (
+        f'(SELECT {select} FROM {link} INNER JOIN {other_table} '
+        f'ON {other_table}.{quote(other._meta.pk.column)} = '
+        f'{columns[other._meta.db_table]} '
+        f'WHERE {columns[model._meta.db_table]} = '
+        f'{table}.{quote(model._meta.pk.column)})')
+
+
+def item_aggregates() -> Dict[str, Any]:
+    """
+    Returns the expressions computing the aggregates of an item.
+    """
+    return {'supplier_count': RawSQL(
+        subquery(Supplier.items.through, Item, Supplier, 'COUNT(*)'),
+        (), output_field=Item._meta.get_field('supplier_count'))}
+
+
+def supplier_aggregates() -> Dict[str, Any]:
+    """
+    Returns the expressions computing the aggregates of a supplier.
+    """
+    quote = connection.ops.quote_name
+    price = '{}.{}'.format(
+        quote(Item._meta.db_table),
+        quote(Item._meta.get_field('price').column))
+    return {
+        name: RawSQL(
+            subquery(Supplier.items.through, Supplier, Item, select), (),
+            output_field=Supplier._meta.get_field(name))
+        for name, select in (
+            ('item_count', 'COUNT(*)'),
+            ('min_item_price', f'MIN({price})'),
+            ('max_item_price', f'MAX({price})'),
+            ('avg_item_price', f'ROUND(AVG({price}), 2)'))}
+
+
+def aggregates(model) -> Dict[str, Any]:
+    """
+    Returns the expressions computing the stored aggregates of the
+    rows of an Item or Supplier queryset, to pass to update().
+    """
+    return item_aggregates() if model is Item else supplier_aggregates()
+
+
+def refresh_aggregates(model, ids: Iterable) -> int:
+    """
+    Recomputes the stored aggregates of items or suppliers with one
+    UPDATE per chunk of IDs.
+
+    Args:
+        model (Model): Item or Supplier.
+        ids (Iterable): The IDs of the rows to recompute.
+
+    Returns:
+        int: The number of updated rows.
+    """
+    return sum(
+        model.objects.filter(pk__in=chunk).update(**aggregates(model))
+        for chunk in chunked(ids, query_chunk_size()))
+
+
+def drifted_ids(model) -> List:
+    """
+    Returns the IDs of the items or suppliers whose stored aggregates
+    differ from the ones computed from their links, reading the table
+    once.
+    """
+    expressions = aggregates(model)
+    computed = {f'computed_{name}': value
+                for name, value in expressions.items()}
+    rows = model.objects.annotate(**computed).values_list(
+        'pk', *expressions, *computed)
+    size = len(expressions)
+    return [
+        row[0] for row in rows.iterator(chunk_size=10000)
+        if row[1:1 + size] != row[1 + size:]]
@@ -4,3 +4,6 @@ from django.apps import AppConfig
 class SupplierInventoryConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'supplier_inventory'
+
+    def ready(self):
+        from . import database, instrumentation, signals  # noqa: F401
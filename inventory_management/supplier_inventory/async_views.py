@@ -0,0 +1,217 @@
+import asyncio
+from django.conf import settings
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Model
+from django.http import (
+    Http404, HttpRequest, HttpResponseNotAllowed, JsonResponse,
+    StreamingHttpResponse)
+from typing import Optional, Sequence, Set, Type
+from .decorator import handle_exceptions
+from .events import DISCONNECTED, Subscription, event_stream
+from .importer import split_ids
+from .models import Item, Supplier
+from .pagination import (
+    apaginate, get_filters, get_ordering, set_next_cursor)
+from .signals import CREATED, DELETED, UPDATED
+from .projection import anest, get_projection, serialiser_fields
+from .serialiser import ItemSerialiser, SupplierSummarySerialiser
+from .versioning import is_conditional, not_modified, set_validators
+from .views import ApiMethodMixin, ItemView, SupplierView
+
+# Native coroutine versions of the read paths of ItemView and
+# SupplierView. Under an ASGI server they wait on the ORM without
+# holding a worker thread for the whole request. They return the same
+# payloads, but read straight from the database as the shared tier of
+# the response cache only has a blocking API.
+
+
+async def aget_or_404(model: Type[Model], **kwargs) -> Model:
+    """
+    Async counterpart of get_object_or_404.
+    """
+    try:
+        return await model.objects.aget(**kwargs)
+    except model.DoesNotExist:
+        raise Http404
+
+
+async def check_not_modified(request: HttpRequest, model: Type[Model], pk):
+    """
+    Answers a conditional request with 304 after a primary key lookup
+    of updated_at, returns None if the full object must be sent.
+    """
+    if not is_conditional(request):
+        return None
+    updated_at = await model.objects.filter(
+        pk=pk).values_list('updated_at', flat=True).afirst()
+    if updated_at is None:
+        raise Http404
+    return not_modified(request, pk, updated_at)
+
+
+def expand_of(request: HttpRequest, related_name: str) -> bool:
+    """
+    Reads the expand query parameter of a list request.
+    """
+    expand = request.GET.get('expand')
+    if expand and expand != related_name:
+        raise ValueError(f"Invalid expand '{expand}', use '{related_name}'")
+    return bool(expand)
+
+
+async def get_page(request: HttpRequest, view: ApiMethodMixin
+                   ) -> JsonResponse:
+    """
+    Async counterpart of ApiMethodMixin.get_page, reading only the
+    requested fields of a page of the objects of the view.
+    """
+    expand = expand_of(request, view.related_name)
+    ordering = get_ordering(request, view.orderings)
+    queryset = view.model.objects.filter(
+        get_filters(request, view.model, view.filters))
+    serialiser_class = (
+        view.expanded_serialiser_class if expand else view.serialiser_class)
+    fields = view.get_fields(request, serialiser_class)
+    if fields is None:
+        fields = serialiser_fields(serialiser_class)
+    projection = get_projection(
+        view.serialiser_class,
+        tuple(field for field in fields if field != view.related_name))
+    # The cursor needs the ordering fields and nest needs the id
+    extra = [
+        field.lstrip('-') for field in ordering
+        if field.lstrip('-') not in projection.columns]
+
+    rows, next_cursor = await apaginate(
+        projection.values(queryset, *extra), request, ordering)
+    if view.related_name in fields:
+        await anest(rows, view.related_name, view.related_fields,
+                    view.related_model.objects.all(), view.related_link)
+    for row in rows:
+        for field in extra:
+            del row[field]
+    return set_next_cursor(
+        JsonResponse(projection.rows(rows), safe=False), next_cursor)
+
+
+@handle_exceptions
+async def view_items(request: HttpRequest) -> JsonResponse:
+    """
+    Handles GET requests to retrieve item details and associated
+    suppliers, or a page of items if no specific item ID is provided.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+
+    Returns:
+        JsonResponse: The same payload as ItemView.get.
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    view = ItemView()
+    if not (item_id := request.GET.get('item_id')):
+        return await get_page(request, view)
+
+    fields = view.get_fields(request, view.details_serialiser_class)
+    item_id = Item._meta.pk.to_python(item_id)
+    if response := await check_not_modified(request, Item, item_id):
+        return response
+    item = await aget_or_404(Item, id=item_id)
+    suppliers = [
+        supplier async for supplier in item.suppliers.values(
+            'id', 'name', 'phone_number')]
+    item_json = {'item': ItemSerialiser(item).data, 'suppliers': suppliers}
+    if fields is not None:
+        item_json = view.narrow_details(item_json, fields)
+    return set_validators(
+        JsonResponse(item_json), item.pk, item.updated_at)
+
+
+@handle_exceptions
+async def view_suppliers(request: HttpRequest) -> JsonResponse:
+    """
+    Handles GET requests to retrieve supplier details and associated
+    items, or a page of suppliers if no specific supplier ID is provided.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+
+    Returns:
+        JsonResponse: The same payload as SupplierView.get.
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+
+    view = SupplierView()
+    if not (supplier_id := request.GET.get('supplier_id')):
+        return await get_page(request, view)
+
+    fields = view.get_fields(request, view.details_serialiser_class)
+    supplier_id = Supplier._meta.pk.to_python(supplier_id)
+    if response := await check_not_modified(request, Supplier, supplier_id):
+        return response
+    supplier = await aget_or_404(Supplier, id=supplier_id)
+    items = [item async for item in supplier.items.all()]
+    supplier_json = SupplierSummarySerialiser(supplier).data
+    supplier_json['items'] = ItemSerialiser(items, many=True).data
+    if fields is not None:
+        supplier_json = view.narrow_details(supplier_json, fields)
+    return set_validators(
+        JsonResponse(supplier_json), supplier.pk, supplier.updated_at)
+
+
+def choices_of(request: HttpRequest, name: str, choices: Sequence[str]
+               ) -> Optional[Set[str]]:
+    """
+    Reads a query parameter listing some of the given choices,
+    separated by commas.
+    """
+    values = split_ids(request.GET.get(name) or [])
+    invalid = set(values) - set(choices)
+    if invalid:
+        raise ValueError(
+            f"Invalid {name} '{', '.join(sorted(invalid))}', "
+            f"use {', '.join(choices)}")
+    return set(values) or None
+
+
+@handle_exceptions
+async def stream_changes(request: HttpRequest) -> StreamingHttpResponse:
+    """
+    Handles GET requests streaming the item and supplier changes of
+    this worker as server-sent events while the client stays connected.
+
+    Every change is a 'change' event with the model, action and ID.
+    ?models=, ?actions= and ?ids= narrow the stream, each a list
+    separated by commas. A client reading slower than the changes come
+    gets an 'overflow' event with the number of events dropped.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+
+    Returns:
+        StreamingHttpResponse: The text/event-stream of changes.
+        Raises:
+            Exception: If a filter is invalid or the server is not an
+                ASGI one.
+    """
+    if request.method != 'GET':
+        return HttpResponseNotAllowed(['GET'])
+    if not isinstance(request, ASGIRequest):
+        raise ValueError('The change stream is served by an ASGI server')
+
+    ids = split_ids(request.GET.get('ids') or [])
+    subscription = Subscription(
+        asyncio.get_running_loop(),
+        models=choices_of(request, 'models', ('item', 'supplier')),
+        actions=choices_of(request, 'actions', (CREATED, UPDATED, DELETED)),
+        ids={str(Item._meta.pk.to_python(object_id)) for object_id in ids},
+        size=getattr(settings, 'INVENTORY_STREAM_BUFFER', 1000))
+    response = StreamingHttpResponse(
+        event_stream(subscription, request.scope.get(DISCONNECTED)),
+        content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    # Keeps nginx from buffering the events
+    response['X-Accel-Buffering'] = 'no'
+    return response
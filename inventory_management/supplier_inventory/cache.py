@@ -0,0 +1,167 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable
+from django.conf import settings
+from django.core.cache import caches
+
+_MISSING = object()
+
+
+class ResponseCache:
+    """
+    A two tier read-through cache for serialised API payloads.
+
+    The first tier is a bounded in-process LRU whose entries expire after
+    a TTL, the second is the configured Django cache which is shared by
+    all workers. Keys are (kind, id) tuples so that signal handlers can
+    drop exactly the entries of the rows that changed.
+
+    A write drops the keys from the shared tier and from the LRU of its
+    own worker only. The LRU entries of the other workers are kept for
+    local_ttl seconds, at most ttl, which bounds how long they serve a
+    payload older than the shared tier.
+    """
+
+    def __init__(
+            self,
+            max_entries: int = None,
+            ttl: float = None,
+            local_ttl: float = None,
+            alias: str = None,
+            clock: Callable[[], float] = time.monotonic):
+        self.max_entries = max_entries if max_entries is not None else (
+            getattr(settings, 'INVENTORY_CACHE_MAX_ENTRIES', 1024))
+        self.ttl = ttl if ttl is not None else (
+            getattr(settings, 'INVENTORY_CACHE_TTL', 60))
+        if local_ttl is None:
+            local_ttl = getattr(settings, 'INVENTORY_CACHE_LOCAL_TTL', 2)
+        self.local_ttl = min(self.ttl, local_ttl)
+        self.alias = alias or getattr(
+            settings, 'INVENTORY_CACHE_ALIAS', 'default')
+        self.clock = clock
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = self.misses = self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.max_entries > 0
+
+    @property
+    def shared(self):
+        return caches[self.alias]
+
+    def make_key(self, key: Hashable) -> str:
+        return 'inventory:' + ':'.join(str(part) for part in key)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Returns the cached value of the key, looking at the local tier
+        first and then at the shared one.
+        """
+        if not self.enabled:
+            return default
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at > self.clock():
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self.entries[key]
+
+        value = self.shared.get(self.make_key(key), _MISSING)
+        if value is _MISSING:
+            with self.lock:
+                self.misses += 1
+            return default
+        self.set_local(key, value)
+        with self.lock:
+            self.hits += 1
+        return value
+
+    def set_local(self, key: Hashable, value: Any) -> None:
+        if self.local_ttl <= 0:
+            return
+        with self.lock:
+            self.entries[key] = (self.clock() + self.local_ttl, value)
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Stores the value in both tiers.
+        """
+        if not self.enabled:
+            return
+        self.set_local(key, value)
+        self.shared.set(self.make_key(key), value, self.ttl)
+
+    def get_or_set(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """
+        Returns the cached value of the key, building and storing it
+        on a miss. Exceptions raised by build are not cached.
+
+        Args:
+            key (Hashable): The (kind, id) key of the entry.
+            build (Callable): Computes the value on a miss.
+
+        Returns:
+            The cached or freshly built value.
+        """
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = build()
+            self.set(key, value)
+        return value
+
+    def delete_many(self, keys: Iterable[Hashable]) -> None:
+        """
+        Drops the given keys from both tiers.
+        """
+        keys = list(keys)
+        if not keys:
+            return
+        with self.lock:
+            for key in keys:
+                self.entries.pop(key, None)
+        self.shared.delete_many([self.make_key(key) for key in keys])
+
+    def clear(self) -> None:
+        """
+        Drops every local entry and resets the counters. The shared tier
+        is left alone as it may hold other data.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Returns the counters used to size the cache.
+        """
+        with self.lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'local_ttl': self.local_ttl,
+            }
+
+
+response_cache = ResponseCache()
+
+
+def item_key(item_id) -> tuple:
+    return ('item', item_id)
+
+
+def supplier_key(supplier_id) -> tuple:
+    return ('supplier', supplier_id)
@@ -0,0 +1,177 @@
+from datetime import datetime, timedelta
+from typing import Any, Iterable, List, NamedTuple, Optional, Tuple
+from django.conf import settings
+from django.db import connections
+from django.db.models import (
+    BooleanField, CharField, DateTimeField, F, QuerySet, Value)
+from django.db.models.expressions import RawSQL
+from django.utils import timezone
+from .models import Item, Supplier, Tombstone
+from .pagination import decode_cursor, encode_cursor
+
+# The change feed lists the items and suppliers created, updated and
+# deleted after a cursor, the (timestamp, id) of the last change read.
+# Items and suppliers are read by their updated_at, which every write
+# of the app bumps, link changes included (see signals.touch), and
+# deletions from the tombstones written by the deleter and the delete
+# signals. The three are read with one UNION ALL merging (timestamp, id)
+# index range scans, so a sync that finds nothing new costs one
+# statement reading no rows.
+#
+# Timestamps are taken before their transaction commits, so a slow
+# transaction can commit changes older than ones already read. Changes
+# younger than INVENTORY_CHANGES_LAG_SECONDS are left for the next sync.
+# The lag only covers commits of the database read, the feed is read
+# from the primary rather than from a replica that may be further behind.
+
+
+class Change(NamedTuple):
+    changed_at: datetime
+    # The ID of the row the change was read from, the tombstone of a
+    # deletion, which breaks ties of changed_at in the cursor
+    change_id: Any
+    model: str
+    object_id: Any
+    created_at: Optional[datetime]
+    deleted: bool
+
+
+def record_deletions(
+        model, object_ids: Iterable, deleted_at: datetime = None) -> None:
+    """
+    Writes the tombstones of deleted items or suppliers.
+
+    Args:
+        model (Model): Item or Supplier.
+        object_ids (Iterable): The IDs of the deleted rows.
+        deleted_at (datetime): The time of the deletion, now by default.
+    """
+    deleted_at = deleted_at or timezone.now()
+    Tombstone.objects.bulk_create(
+        Tombstone(model=model._meta.model_name, object_id=object_id,
+                  deleted_at=deleted_at)
+        for object_id in object_ids)
+
+
+def get_since(token: Optional[str]) -> Optional[Tuple[datetime, Any]]:
+    """
+    Decodes the cursor of the change feed.
+
+    Returns:
+        tuple: The timestamp and the ID of the last change read, None
+        without a cursor.
+
+    Raises:
+        ValueError: If the cursor is malformed or older than the
+            tombstones are kept.
+        ValidationError: If a value of the cursor is invalid.
+    """
+    if not token:
+        return None
+    values = decode_cursor(token)
+    if len(values) != 2:
+        raise ValueError('Invalid cursor')
+    changed_at = Tombstone._meta.get_field('deleted_at').to_python(values[0])
+    change_id = Tombstone._meta.pk.to_python(values[1])
+    if changed_at is None or change_id is None:
+        raise ValueError('Invalid cursor')
+    days = getattr(settings, 'INVENTORY_TOMBSTONE_DAYS', 30)
+    if changed_at < timezone.now() - timedelta(days=days):
+        raise ValueError(
+            f'The cursor is older than {days} days, deletions may be '
+            'missing: sync again from the start')
+    return changed_at, change_id
+
+
+def changes_after(
+        queryset: QuerySet,
+        timestamp: str,
+        since: Optional[Tuple[datetime, Any]],
+        until: datetime,
+        **columns) -> QuerySet:
+    """
+    Returns the changes of one table after the cursor, as Change fields.
+
+    The cursor condition is the row value comparison (t, id) > (x, y),
+    which the database resolves with a seek into the (timestamp, id)
+    index. Expanded to t > x OR (t = x AND id > y) it is read as two
+    ranges and sorted, and as t >= x AND (t > x OR id > y) it reads
+    every row sharing the timestamp of the cursor, the thousands of rows
+    a bulk write stamps with the same time.
+    """
+    rows = queryset.filter(**{f'{timestamp}__lte': until})
+    if since is not None:
+        model = queryset.model
+        connection = connections[queryset.db]
+        quote = connection.ops.quote_name
+        table = quote(model._meta.db_table)
+        field, pk = model._meta.get_field(timestamp), model._meta.pk
+        rows = rows.filter(RawSQL(
+            f'({table}.{quote(field.column)}, {table}.{quote(pk.column)})'
+            f' > (%s, %s)',
+            (field.get_db_prep_value(since[0], connection),
+             pk.get_db_prep_value(since[1], connection)),
+            output_field=BooleanField()))
+    # Annotated in the same order on every table, the UNION ALL matches
+    # the columns by position
+    return rows.annotate(
+        change_at=F(timestamp), change_id=F('id'), **columns).values_list(
+            'change_at', 'change_id', *columns)
+
+
+def read_changes(
+        since: Optional[Tuple[datetime, Any]],
+        limit: int) -> Tuple[List[Change], bool]:
+    """
+    Reads the changes after the cursor, oldest first.
+
+    Args:
+        since (tuple): The timestamp and ID of the last change read,
+            None to read every change kept.
+        limit (int): The most changes to return.
+
+    Returns:
+        tuple: The changes and whether more follow.
+    """
+    lag = getattr(settings, 'INVENTORY_CHANGES_LAG_SECONDS', 5)
+    until = timezone.now() - timedelta(seconds=lag)
+    live = {'change_deleted': Value(False, output_field=BooleanField())}
+    items = changes_after(
+        Item.objects.all(), 'updated_at', since, until,
+        change_model=Value(Tombstone.ITEM, output_field=CharField()),
+        change_object=F('id'), change_created=F('created_at'), **live)
+    suppliers = changes_after(
+        Supplier.objects.all(), 'updated_at', since, until,
+        change_model=Value(Tombstone.SUPPLIER, output_field=CharField()),
+        change_object=F('id'), change_created=F('created_at'), **live)
+    deletions = changes_after(
+        Tombstone.objects.all(), 'deleted_at', since, until,
+        change_model=F('model'), change_object=F('object_id'),
+        change_created=Value(None, output_field=DateTimeField()),
+        change_deleted=Value(True, output_field=BooleanField()))
+    rows = list(items.union(suppliers, deletions, all=True).order_by(
+        'change_at', 'change_id')[:limit + 1])
+    return [Change(*row) for row in rows[:limit]], len(rows) > limit
+
+
+def next_cursor(
+        changes: List[Change], since_token: Optional[str]) -> Optional[str]:
+    """
+    Returns the cursor to read the changes after the given ones, the
+    given cursor when there are none.
+    """
+    if not changes:
+        return since_token or None
+    return encode_cursor([changes[-1].changed_at, changes[-1].change_id])
+
+
+def purge_tombstones(days: int) -> int:
+    """
+    Deletes the tombstones older than the given number of days.
+
+    Returns:
+        int: The number of deleted tombstones.
+    """
+    deleted, _ = Tombstone.objects.filter(
+        deleted_at__lt=timezone.now() - timedelta(days=days)).delete()
+    return deleted
@@ -0,0 +1,125 @@
+from typing import Any, Dict, Iterable, Tuple
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from .aggregates import refresh_aggregates
+from .importer import ITEM_FIELDS, insert_links, insert_rows
+from .models import Item, Supplier
+from .signals import CREATED, items_changed, suppliers_changed
+
+# The fields given when creating an object
+ITEM_COLUMNS = ITEM_FIELDS
+SUPPLIER_COLUMNS = ('name', 'phone_number', 'email')
+
+# Creating an object costs one INSERT of the row, one INSERT of all its
+# links and one UPDATE bumping the version and aggregates of the linked
+# objects, in a single transaction. The related IDs are expected to be
+# checked beforehand, so nothing else is read, except for a supplier
+# with items: its aggregates are computed with one UPDATE and read back
+# with one SELECT, which keeps them the same as the database computes
+# them elsewhere.
+
+
+def clean_fields(
+        model, data: Dict[str, Any], names: Tuple[str]) -> Dict[str, Any]:
+    """
+    Validates the given fields of a new object against the model fields.
+
+    Args:
+        model (Model): The model class of the object.
+        data (dict): The request data.
+        names (tuple): The fields to read from the data.
+
+    Returns:
+        dict: The cleaned values keyed by field name.
+
+    Raises:
+        ValidationError: If a value is invalid, naming the field.
+    """
+    values = {}
+    for name in names:
+        field, value = model._meta.get_field(name), data.get(name)
+        if value is None and field.null:
+            # Nullable fields such as the supplier email are optional
+            values[name] = None
+            continue
+        try:
+            values[name] = field.clean(value, None)
+        except ValidationError as error:
+            raise ValidationError(f"{name}: {' '.join(error.messages)}")
+    return values
+
+
+def create(
+        model,
+        values: Dict[str, Any],
+        links: Iterable[Tuple[Any, Any]]) -> Dict[str, Any]:
+    """
+    Inserts a row and its Supplier.items links, call it inside a
+    transaction.
+
+    Args:
+        model (Model): The model class of the row.
+        values (dict): The cleaned field values, completed in place with
+            the id and timestamps of the new row.
+        links (Iterable): (supplier_id, item_id) pairs, None standing
+            for the new row.
+
+    Returns:
+        dict: The values of the new row.
+    """
+    connection = connections[DEFAULT_DB_ALIAS]
+    prepare = model._meta.pk.get_db_prep_save
+    values['id'] = model._meta.pk.get_default()
+    row_id = prepare(values['id'], connection)
+    links = [
+        (row_id if supplier_id is None else prepare(supplier_id, connection),
+         row_id if item_id is None else prepare(item_id, connection))
+        for supplier_id, item_id in links]
+    insert_rows(connection, model, [values])
+    if links:
+        insert_links(connection, links)
+    return values
+
+
+def create_item(
+        values: Dict[str, Any], supplier_ids: Iterable) -> Dict[str, Any]:
+    """
+    Creates an item linked to existing suppliers.
+
+    Args:
+        values (dict): The cleaned item fields.
+        supplier_ids (Iterable): The normalised IDs of the suppliers.
+
+    Returns:
+        dict: The values of the new item.
+    """
+    supplier_ids = set(supplier_ids)
+    values['supplier_count'] = len(supplier_ids)
+    with transaction.atomic():
+        values = create(Item, values, ((pk, None) for pk in supplier_ids))
+        items_changed([values['id']], supplier_ids, CREATED)
+    return values
+
+
+def create_supplier(
+        values: Dict[str, Any], item_ids: Iterable) -> Dict[str, Any]:
+    """
+    Creates a supplier linked to existing items.
+
+    Args:
+        values (dict): The cleaned supplier fields.
+        item_ids (Iterable): The normalised IDs of the items.
+
+    Returns:
+        dict: The values of the new supplier.
+    """
+    item_ids = set(item_ids)
+    with transaction.atomic():
+        values = create(Supplier, values, ((None, pk) for pk in item_ids))
+        suppliers_changed([values['id']], item_ids, CREATED)
+        if item_ids:
+            refresh_aggregates(Supplier, [values['id']])
+            values.update(Supplier.objects.filter(pk=values['id']).values(
+                *Supplier.maintained_fields).get())
+    return values
+
@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Tuning of the SQLite connections, set by the database profile in the
+# settings. The pragmas are applied to every new connection, the
+# journal mode is stored in the database file itself.
+
+
+def immediate_begin(execute, sql, params, many, context):
+    """
+    Starts the transactions of atomic blocks with BEGIN IMMEDIATE.
+
+    A deferred transaction that reads then writes fails at once with
+    "database is locked" when another connection wrote in between,
+    whatever the busy timeout. Taking the write lock at BEGIN makes
+    writers queue on the busy timeout instead.
+    """
+    if sql == 'BEGIN':
+        sql = 'BEGIN IMMEDIATE'
+    return execute(sql, params, many, context)
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """
+    Applies INVENTORY_SQLITE_PRAGMAS to a new SQLite connection and
+    installs immediate_begin when INVENTORY_SQLITE_IMMEDIATE is set.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'INVENTORY_SQLITE_PRAGMAS', {})
+    for name, value in pragmas.items():
+        # Run on the driver connection, outside the query log
+        connection.connection.execute(f'PRAGMA {name} = {value}')
+    if (getattr(settings, 'INVENTORY_SQLITE_IMMEDIATE', False)
+            and immediate_begin not in connection.execute_wrappers):
+        connection.execute_wrappers.append(immediate_begin)
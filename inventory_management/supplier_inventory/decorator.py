@@ -1,5 +1,6 @@
+from asyncio import iscoroutinefunction
 from functools import wraps
-from django.http import Http404
+from django.http import Http404, JsonResponse
 from rest_framework.response import Response
 from rest_framework import status
 
@@ -9,6 +10,9 @@ def handle_exceptions(view_func):
     Handles exceptions that may occur in the decorated 
     view function.
 
+    Coroutine views are wrapped with a coroutine and get a JsonResponse,
+    as they are plain Django views rather than DRF ones.
+
     Args:
         view_func: The view function to be wrapped.
 
@@ -20,6 +24,20 @@ def handle_exceptions(view_func):
         None
     """
 
+    if iscoroutinefunction(view_func):
+        @wraps(view_func)
+        async def _wrapped_async_view(*args, **kwargs):
+            try:
+                return await view_func(*args, **kwargs)
+            except Http404:
+                return JsonResponse(
+                    {'error': 'Item not found'},
+                    status=status.HTTP_404_NOT_FOUND)
+            except Exception as error:
+                return JsonResponse(
+                    {'error': str(error)}, status=status.HTTP_400_BAD_REQUEST)
+        return _wrapped_async_view
+
     @wraps(view_func)
     def _wrapped_view(*args, **kwargs):
         try:
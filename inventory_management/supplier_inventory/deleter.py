@@ -0,0 +1,108 @@
+from typing import Any, List, Tuple
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from .aggregates import aggregates
+from .changes import record_deletions
+from .cache import item_key, supplier_key
+from .importer import split_ids
+from .models import Item, Supplier
+from .signals import DELETED, UPDATED, Link, drop_cached, send_changed
+from .utils import chunked, query_chunk_size
+
+# How a deletion reaches the other side of Supplier.items: the link
+# column of the deleted rows, the link column of the rows on the other
+# side, their model and the cache keys of both.
+SIDES = {
+    Item: ('item_id', 'supplier_id', Supplier, item_key, supplier_key),
+    Supplier: ('supplier_id', 'item_id', Item, supplier_key, item_key),
+}
+
+
+def delete_objects(model, object_ids: Any) -> Tuple[List, List]:
+    """
+    Deletes items or suppliers by ID with their Supplier.items links, in
+    one transaction.
+
+    Nothing is loaded into model instances and no delete signal is
+    sent. Per chunk of IDs the existing rows are looked up, the rows
+    linked to them get a new updated_at and aggregates with one UPDATE
+    ... WHERE id IN (SELECT ...) and the links and rows are removed with
+    one DELETE ... WHERE id IN each, so the statements do not grow with
+    the number of links. The change feed gets a tombstone per deleted
+    row. The cached payloads of the deleted rows and of the rows linked
+    to them are dropped, again once the transaction commits, which
+    needs the linked IDs read once.
+
+    Args:
+        model (Model): Item or Supplier.
+        object_ids: A list of IDs or a string of IDs separated by
+            commas, semicolons or spaces.
+
+    Returns:
+        tuple: The deleted IDs and the IDs as given that are invalid or
+        do not exist, in the order they were first given.
+
+    Raises:
+        ValidationError: If object_ids is not a list or a string.
+    """
+    column, target, other, key, other_key = SIDES[model]
+    pk = model._meta.pk
+    # normalised ID -> ID as given, invalid IDs are keyed as given
+    given, invalid = {}, set()
+    for object_id in split_ids(object_ids):
+        try:
+            normalised = pk.to_python(object_id)
+        except ValidationError:
+            normalised = object_id
+            invalid.add(normalised)
+        given.setdefault(normalised, object_id)
+
+    now = timezone.now()
+    deleted, linked = set(), set()
+    # The UPDATE binds the chunk and updated_at
+    size = query_chunk_size() - 1
+    with transaction.atomic():
+        for chunk in chunked(given.keys() - invalid, size):
+            found = list(model.objects.filter(
+                pk__in=chunk).values_list('pk', flat=True))
+            if not found:
+                continue
+            deleted.update(found)
+            links = Link.objects.filter(**{f'{column}__in': found})
+            linked.update(links.values_list(target, flat=True))
+            # The rows go first, so that the aggregates of the rows
+            # linked to them no longer count them, while the links
+            # still find those rows. The foreign keys of the links are
+            # checked at commit.
+            rows = model.objects.filter(pk__in=found)
+            rows._raw_delete(rows.db)
+            record_deletions(model, found, now)
+            other.objects.filter(pk__in=links.values(target)).update(
+                updated_at=now, **aggregates(other))
+            links._raw_delete(links.db)
+        drop_cached(
+            [key(object_id) for object_id in deleted]
+            + [other_key(object_id) for object_id in linked])
+        send_changed(model, DELETED, deleted)
+        send_changed(other, UPDATED, linked)
+
+    return (
+        [object_id for object_id in given if object_id in deleted],
+        [object_id for normalised, object_id in given.items()
+         if normalised not in deleted])
+
+
+def delete_object(model, object_id: str) -> bool:
+    """
+    Deletes one item or supplier like delete_objects.
+
+    Returns:
+        bool: True if it existed.
+
+    Raises:
+        ValidationError: If object_id is not a valid ID.
+    """
+    object_id = model._meta.pk.to_python(object_id)
+    deleted, _ = delete_objects(model, [object_id])
+    return bool(deleted)
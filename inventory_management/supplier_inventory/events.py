@@ -0,0 +1,262 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict, deque
+from typing import (
+    AsyncIterator, Collection, Dict, Iterable, List, Optional, Tuple)
+from django.conf import settings
+from .signals import objects_changed
+
+# Live change stream. The write paths send objects_changed once their
+# transaction commits, see signals.send_changed, and the broker of the
+# worker hands the events to every subscribed stream whose filters
+# match. A stream is a coroutine waiting on its own bounded buffer, so
+# an idle client costs a few objects and no thread.
+#
+# Writes never wait for readers: when a client reads slower than the
+# changes come, its oldest events are dropped and the stream tells it
+# how many, to catch up through the change feed.
+#
+# The broker is in-process, a stream sees the writes of its own worker.
+
+# The scope key of the asyncio.Event set when the client of a stream
+# disconnects, see StreamDisconnectMiddleware
+DISCONNECTED = 'inventory.disconnected'
+
+# How long EventSource clients wait before reconnecting
+RETRY_MS = 3000
+
+
+class Subscription:
+    """
+    The buffer of one stream client with its filters. The buffer is
+    only touched from the event loop of the client.
+    """
+
+    def __init__(
+            self,
+            loop: asyncio.AbstractEventLoop,
+            models: Optional[Collection[str]] = None,
+            actions: Optional[Collection[str]] = None,
+            ids: Optional[Collection[str]] = None,
+            size: int = 1000):
+        """
+        Args:
+            loop: The event loop of the client.
+            models (Collection): The model names to stream, all if None.
+            actions (Collection): The actions to stream, all if None.
+            ids (Collection): The object IDs as strings to stream, all
+                if None.
+            size (int): The most events kept for the client.
+        """
+        self.loop = loop
+        self.models = set(models) if models else None
+        self.actions = set(actions) if actions else None
+        self.ids = set(ids) if ids else None
+        self.events = deque(maxlen=size)
+        self.dropped = 0
+        self.closed = False
+        self.ready = asyncio.Event()
+
+    def matching(self, model: str, action: str, ids: List[str]) -> List[str]:
+        """
+        Returns the IDs of a change the client asked for.
+        """
+        if ((self.models and model not in self.models)
+                or (self.actions and action not in self.actions)):
+            return []
+        if self.ids is None:
+            return ids
+        return [object_id for object_id in ids if object_id in self.ids]
+
+    def put(self, events: List[Dict[str, str]]) -> None:
+        """
+        Buffers events, dropping the oldest ones past the size.
+        """
+        overflow = len(self.events) + len(events) - self.events.maxlen
+        if overflow > 0:
+            self.dropped += overflow
+        self.events.extend(events)
+        self.ready.set()
+
+    def close(self) -> None:
+        """
+        Ends the stream of the client.
+        """
+        self.closed = True
+        self.ready.set()
+
+    async def get(self, timeout: float) -> Tuple[List[Dict[str, str]], int]:
+        """
+        Waits up to timeout seconds for events.
+
+        Returns:
+            tuple: The buffered events and the number of events dropped
+            before them, both emptied.
+        """
+        if not self.events and not self.closed:
+            try:
+                await asyncio.wait_for(self.ready.wait(), timeout)
+            except asyncio.TimeoutError:
+                pass
+        self.ready.clear()
+        events, dropped = list(self.events), self.dropped
+        self.events.clear()
+        self.dropped = 0
+        return events, dropped
+
+
+class Broker:
+    """
+    Fans objects_changed out to the subscriptions of the worker. It
+    listens to the signal only while it has subscriptions, the write
+    paths skip sending it otherwise.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.subscriptions = set()
+
+    def subscribe(self, subscription: Subscription) -> None:
+        with self.lock:
+            if not self.subscriptions:
+                objects_changed.connect(
+                    self.receive, dispatch_uid='inventory_event_stream')
+            self.subscriptions.add(subscription)
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self.lock:
+            self.subscriptions.discard(subscription)
+            if not self.subscriptions:
+                objects_changed.disconnect(
+                    dispatch_uid='inventory_event_stream')
+
+    def receive(self, sender, action: str, ids: List, **kwargs) -> None:
+        self.publish(sender._meta.model_name, action, ids)
+
+    def publish(self, model: str, action: str, ids: Iterable) -> None:
+        """
+        Hands a change to the matching subscriptions, from any thread.
+
+        Args:
+            model (str): 'item' or 'supplier'.
+            action (str): 'created', 'updated' or 'deleted'.
+            ids (Iterable): The IDs of the changed objects.
+        """
+        ids = [str(object_id) for object_id in ids]
+        with self.lock:
+            subscriptions = list(self.subscriptions)
+        # One wake-up per event loop rather than per client, the writer
+        # calling this is not held up by thousands of streams
+        deliveries = defaultdict(list)
+        for subscription in subscriptions:
+            matched = subscription.matching(model, action, ids)
+            if matched:
+                deliveries[subscription.loop].append((subscription, [
+                    {'model': model, 'action': action, 'id': object_id}
+                    for object_id in matched]))
+        for loop, batch in deliveries.items():
+            try:
+                loop.call_soon_threadsafe(deliver, batch)
+            except RuntimeError:
+                # The loop of the clients is closed
+                pass
+
+
+def deliver(batch: List[Tuple[Subscription, List[Dict[str, str]]]]) -> None:
+    for subscription, events in batch:
+        subscription.put(events)
+
+
+broker = Broker()
+
+
+def format_events(events: List[Dict[str, str]], dropped: int) -> str:
+    """
+    Formats events as server-sent events, preceded by an overflow
+    event with the number of events dropped before them.
+    """
+    messages = []
+    if dropped:
+        messages.append(
+            f'event: overflow\ndata: {json.dumps({"dropped": dropped})}\n\n')
+    messages.extend(
+        f'event: change\ndata: {json.dumps(event)}\n\n' for event in events)
+    return ''.join(messages)
+
+
+async def event_stream(
+        subscription: Subscription,
+        disconnected: Optional[asyncio.Event] = None) -> AsyncIterator[str]:
+    """
+    Streams the changes of a subscription as server-sent events, with
+    a comment every INVENTORY_STREAM_HEARTBEAT_SECONDS while nothing
+    changes, which keeps proxies from closing the connection.
+
+    Args:
+        subscription (Subscription): The subscription of the client.
+        disconnected (asyncio.Event): Set when the client disconnects,
+            which ends the stream.
+    """
+    heartbeat = getattr(settings, 'INVENTORY_STREAM_HEARTBEAT_SECONDS', 15)
+    watcher = None
+    if disconnected is not None:
+        async def watch():
+            await disconnected.wait()
+            subscription.close()
+        watcher = asyncio.ensure_future(watch())
+    broker.subscribe(subscription)
+    try:
+        yield f'retry: {RETRY_MS}\n\n'
+        while True:
+            events, dropped = await subscription.get(heartbeat)
+            if subscription.closed:
+                return
+            yield format_events(events, dropped) or ': ping\n\n'
+    finally:
+        broker.unsubscribe(subscription)
+        if watcher is not None:
+            watcher.cancel()
+
+
+class StreamDisconnectMiddleware:
+    """
+    ASGI middleware telling the event streams their client is gone.
+
+    Django 4.2 stops reading the receive channel once the request body
+    is read, so it never sees the http.disconnect of a client that
+    leaves in the middle of a streaming response, which would stream
+    into the void. For the given paths the channel is read on after the
+    body and the asyncio.Event at scope[DISCONNECTED] is set on
+    disconnect.
+    """
+
+    def __init__(self, app, paths: Collection[str]):
+        self.app = app
+        self.paths = paths
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http' or scope['path'] not in self.paths:
+            return await self.app(scope, receive, send)
+        disconnected = scope[DISCONNECTED] = asyncio.Event()
+        watcher = None
+
+        async def watch():
+            while (await receive())['type'] != 'http.disconnect':
+                pass
+            disconnected.set()
+
+        async def receive_body():
+            nonlocal watcher
+            message = await receive()
+            if message['type'] == 'http.disconnect':
+                disconnected.set()
+            elif not message.get('more_body') and watcher is None:
+                watcher = asyncio.ensure_future(watch())
+            return message
+
+        try:
+            await self.app(scope, receive_body, send)
+        finally:
+            if watcher is not None:
+                watcher.cancel()
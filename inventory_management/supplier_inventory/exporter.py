@@ -0,0 +1,112 @@
+import csv
+import io
+import json
+from collections import defaultdict
+from typing import Iterator, List, Tuple
+from django.conf import settings
+from .models import Item, Supplier
+from .utils import chunked, query_chunk_size
+
+EXPORT_FIELDS = ('id', 'created_at', 'name', 'description', 'price')
+EXPORT_CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+}
+
+
+def get_chunk_size(chunk_size: int = None) -> int:
+    """
+    Returns the number of items read from the database at a time.
+    """
+    return chunk_size or getattr(settings, 'INVENTORY_EXPORT_CHUNK_SIZE', 2000)
+
+
+def iter_item_chunks(chunk_size: int = None) -> Iterator[List[Tuple]]:
+    """
+    Reads every item in (created_at, id) order, one chunk at a time.
+
+    Items are streamed from a single cursor and the supplier IDs of each
+    chunk are joined in with batched lookups of the through table, so
+    memory use only depends on the chunk size.
+
+    Args:
+        chunk_size (int): The number of items per chunk.
+
+    Returns:
+        Iterator: Lists of item rows, each row holding the values of
+        EXPORT_FIELDS followed by the list of supplier IDs.
+    """
+    chunk_size = get_chunk_size(chunk_size)
+    through = Supplier.items.through.objects
+    rows = Item.objects.order_by('created_at', 'id').values_list(
+        *EXPORT_FIELDS).iterator(chunk_size=chunk_size)
+
+    for chunk in chunked(rows, chunk_size):
+        suppliers = defaultdict(list)
+        for ids in chunked([row[0] for row in chunk], query_chunk_size()):
+            for item_id, supplier_id in through.filter(
+                    item_id__in=ids).values_list('item_id', 'supplier_id'):
+                suppliers[item_id].append(supplier_id)
+        yield [(*row, suppliers[row[0]]) for row in chunk]
+
+
+def export_ndjson(chunks: Iterator[List[Tuple]]) -> Iterator[str]:
+    """
+    Renders item chunks as NDJSON, one string per chunk.
+    """
+    for chunk in chunks:
+        yield ''.join(
+            json.dumps({
+                'id': str(item_id),
+                'created_at': created_at.isoformat(),
+                'name': name,
+                'description': description,
+                'price': str(price),
+                'suppliers': [str(supplier) for supplier in suppliers],
+            }) + '\n'
+            for item_id, created_at, name, description, price, suppliers
+            in chunk)
+
+
+def export_csv(chunks: Iterator[List[Tuple]]) -> Iterator[str]:
+    """
+    Renders item chunks as CSV, one string per chunk after the header.
+    The suppliers column holds the comma separated supplier IDs.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow((*EXPORT_FIELDS, 'suppliers'))
+    yield buffer.getvalue()
+
+    for chunk in chunks:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(
+            (item_id, created_at.isoformat(), name, description, price,
+             ','.join(str(supplier) for supplier in suppliers))
+            for item_id, created_at, name, description, price, suppliers
+            in chunk)
+        yield buffer.getvalue()
+
+
+def export_items(
+        export_format: str = 'ndjson',
+        chunk_size: int = None) -> Iterator[str]:
+    """
+    Streams every item with its supplier IDs.
+
+    Args:
+        export_format (str): Either 'ndjson' or 'csv'.
+        chunk_size (int): The number of items read at a time.
+
+    Returns:
+        Iterator: The exported document in pieces.
+
+    Raises:
+        ValueError: If the format is not supported.
+    """
+    if export_format not in EXPORT_CONTENT_TYPES:
+        raise ValueError(
+            f"Unsupported export type '{export_format}', use ndjson or csv")
+    render = export_csv if export_format == 'csv' else export_ndjson
+    return render(iter_item_chunks(chunk_size))
@@ -0,0 +1,200 @@
+import random
+import uuid
+from decimal import Decimal
+from typing import Any, Dict, Iterable, Iterator, List
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.db.models import CharField, TextField
+from django.utils import timezone
+from .aggregates import refresh_aggregates
+from .importer import insert_links, insert_prepared
+from .models import Item, Supplier
+from .search import DROP_TRIGGERS_SQL, rebuild_search_index
+from .utils import chunked
+
+# Synthetic inventories for measuring the app at scale.
+#
+# The rows are written with executemany in batches inside one
+# transaction, without model instances or signals. The primary keys are
+# generated in ascending order so the indexes on them are appended to
+# instead of split at random, and on SQLite the full-text search
+# triggers are dropped during the load and the index is rebuilt once at
+# the end, several times faster than indexing row by row.
+
+ADJECTIVES = (
+    'Red', 'Blue', 'Steel', 'Wooden', 'Compact', 'Heavy', 'Portable',
+    'Electric', 'Cordless', 'Stainless', 'Classic', 'Industrial')
+NOUNS = (
+    'bike', 'hammer', 'drill', 'ladder', 'kettle', 'lamp', 'chair',
+    'cable', 'bucket', 'wrench', 'saw', 'table', 'pump', 'helmet')
+NAMES = tuple(
+    f'{adjective} {noun}' for adjective in ADJECTIVES for noun in NOUNS)
+DESCRIPTIONS = tuple(f'{name} for home and trade use' for name in NAMES)
+
+
+def sorted_ids(rng: random.Random, count: int) -> List[uuid.UUID]:
+    """
+    Returns count random version 4 UUIDs in ascending order.
+    """
+    # The version and variant bits of uuid4, set before sorting
+    clear = ~(0xf000 << 64 | 0xc000 << 48)
+    version = 0x4000 << 64 | 0x8000 << 48
+    return [
+        uuid.UUID(int=number) for number in sorted(
+            rng.getrandbits(128) & clear | version for _ in range(count))]
+
+
+def link_counts(
+        rng: random.Random, items: int, suppliers: int,
+        density: float) -> Iterator[int]:
+    """
+    Yields the number of suppliers of every item, density on average
+    and never more than the number of suppliers.
+    """
+    whole, fraction = int(density), density - int(density)
+    for _ in range(items):
+        yield min(whole + (rng.random() < fraction), suppliers)
+
+
+class Preparer:
+    """
+    Converts field values to their database format, remembering the
+    conversions of the fields whose values repeat. Strings are already
+    in the format of character fields.
+
+    Args:
+        connection: The database connection.
+        model (Model): The model of the rows.
+        repeated (Iterable): The names of the fields to remember.
+    """
+
+    def __init__(self, connection, model, repeated: Iterable[str]):
+        self.connection = connection
+        self.fields = [
+            (field, {} if field.name in repeated else None,
+             isinstance(field, (CharField, TextField)))
+            for field in model._meta.concrete_fields]
+
+    def __call__(self, values: Dict[str, Any]) -> List[Any]:
+        connection = self.connection
+        row = []
+        for field, cache, text in self.fields:
+            value = values[field.name]
+            if text and isinstance(value, str):
+                prepared = value
+            elif cache is None:
+                prepared = field.get_db_prep_save(value, connection)
+            else:
+                prepared = cache.get(value)
+                if prepared is None:
+                    prepared = cache[value] = field.get_db_prep_save(
+                        value, connection)
+            row.append(prepared)
+        return row
+
+
+def generate_inventory(
+        items: int,
+        suppliers: int,
+        density: float = 2.0,
+        seed: int = None,
+        batch_size: int = 50000) -> Dict[str, int]:
+    """
+    Adds random items and suppliers to the default database, every item
+    carried by density suppliers on average.
+
+    Existing rows are left alone and new rows have no cached payloads,
+    so the response cache is not touched.
+
+    Args:
+        items (int): The number of items to create.
+        suppliers (int): The number of suppliers to create.
+        density (float): The average number of suppliers per item.
+        seed (int): Seeds the random generator, the same seed gives the
+            same inventory.
+        batch_size (int): The rows inserted per statement.
+
+    Returns:
+        dict: The number of items, suppliers and links created.
+
+    Raises:
+        ValueError: If a number is negative, or items should have
+        suppliers but none are created.
+    """
+    if min(items, suppliers, density) < 0 or batch_size < 1:
+        raise ValueError(
+            'items, suppliers and density can not be negative and '
+            'batch_size must be positive')
+    if items and density and not suppliers:
+        raise ValueError('Items can not have suppliers without suppliers')
+    # The connection itself, every attribute lookup through the
+    # django.db.connection proxy goes through a thread local
+    connection = connections[DEFAULT_DB_ALIAS]
+    rng = random.Random(seed)
+    now = timezone.now()
+    item_ids = sorted_ids(rng, items)
+    supplier_ids = sorted_ids(rng, suppliers)
+    links = 0
+
+    with transaction.atomic():
+        if connection.vendor == 'sqlite':
+            with connection.cursor() as cursor:
+                for sql in DROP_TRIGGERS_SQL:
+                    cursor.execute(sql)
+
+        # The aggregates of the suppliers are computed once their links
+        # are in, those of the items are known beforehand
+        prepare = Preparer(connection, Supplier, (
+            'email', 'created_at', 'updated_at', 'item_count',
+            'min_item_price', 'max_item_price', 'avg_item_price'))
+        for chunk in chunked(enumerate(supplier_ids), batch_size):
+            insert_prepared(connection, Supplier, [prepare({
+                'id': supplier_id,
+                'name': f'Supplier {number}',
+                'phone_number': f'07{number % 10 ** 8:08d}',
+                'email': None,
+                'created_at': now,
+                'updated_at': now,
+                'item_count': 0,
+                'min_item_price': None,
+                'max_item_price': None,
+                'avg_item_price': None,
+            }) for number, supplier_id in chunk])
+
+        counts = list(link_counts(rng, items, suppliers, density))
+        prepare = Preparer(connection, Item, (
+            'price', 'created_at', 'updated_at', 'supplier_count'))
+        prices = [Decimal(cents).scaleb(-2) for cents in range(100, 100001)]
+        for chunk in chunked(zip(range(items), item_ids, counts), batch_size):
+            names = rng.choices(range(len(NAMES)), k=len(chunk))
+            insert_prepared(connection, Item, [prepare({
+                'id': item_id,
+                'name': f'{NAMES[name]} {number}',
+                'description': DESCRIPTIONS[name],
+                'price': price,
+                'created_at': now,
+                'updated_at': now,
+                'supplier_count': count,
+            }) for (number, item_id, count), name, price in zip(
+                chunk, names, rng.choices(prices, k=len(chunk)))])
+
+        # Consecutive suppliers from a random one, distinct for every
+        # item, in item order like the index on item_id
+        prepare_pk = Item._meta.pk.get_db_prep_save
+        supplier_keys = [
+            prepare_pk(supplier_id, connection)
+            for supplier_id in supplier_ids]
+        pairs = (
+            (supplier_keys[(start + offset) % suppliers], item_key)
+            for item_key, count, start in (
+                (prepare_pk(item_id, connection), count,
+                 rng.randrange(suppliers) if count else 0)
+                for item_id, count in zip(item_ids, counts))
+            for offset in range(count))
+        for chunk in chunked(pairs, batch_size):
+            insert_links(connection, chunk)
+            links += len(chunk)
+        refresh_aggregates(Supplier, supplier_ids)
+
+        if connection.vendor == 'sqlite':
+            rebuild_search_index()
+    return {'items': items, 'suppliers': suppliers, 'links': links}
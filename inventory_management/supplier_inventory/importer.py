@@ -0,0 +1,262 @@
+import codecs
+import csv
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import DEFAULT_DB_ALIAS, connections, transaction
+from django.utils import timezone
+from .models import Item, Supplier
+from .signals import CREATED, items_changed
+from .utils import chunked, query_chunk_size
+
+NDJSON_CONTENT_TYPES = (
+    'application/x-ndjson', 'application/ndjson', 'application/jsonl')
+CSV_CONTENT_TYPES = ('text/csv', 'application/csv')
+ITEM_FIELDS = ('name', 'description', 'price')
+
+
+def iter_ndjson(lines: Iterable[str]) -> Iterator[Tuple[int, Any]]:
+    """
+    Yields the row number and the decoded object of every non blank
+    line of an NDJSON document. Undecodable lines yield the error.
+    """
+    for row, line in enumerate(lines, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield row, json.loads(line)
+        except ValueError as error:
+            yield row, ValidationError(f'Invalid JSON: {error}')
+
+
+def iter_csv(lines: Iterable[str]) -> Iterator[Tuple[int, Any]]:
+    """
+    Yields the row number and a dict of every data row of a CSV document
+    whose first row holds the column names.
+    """
+    for row, record in enumerate(csv.DictReader(lines), start=2):
+        yield row, record
+
+
+def parse_upload(stream, content_type: str) -> Iterator[Tuple[int, Any]]:
+    """
+    Decodes an uploaded NDJSON or CSV body line by line without
+    reading it into memory.
+
+    Args:
+        stream: A binary file like object yielding lines.
+        content_type (str): The media type of the upload.
+
+    Returns:
+        Iterator: Row numbers and decoded rows.
+
+    Raises:
+        ValueError: If the media type is not supported.
+    """
+    media_type = content_type.split(';')[0].strip().lower()
+    lines = codecs.iterdecode(stream or [], 'utf-8-sig')
+    if media_type in NDJSON_CONTENT_TYPES:
+        return iter_ndjson(lines)
+    if media_type in CSV_CONTENT_TYPES:
+        return iter_csv(lines)
+    raise ValueError(
+        f"Unsupported content type '{media_type}', "
+        "upload application/x-ndjson or text/csv")
+
+
+def split_ids(value: Any) -> List:
+    """
+    Returns the supplier IDs of a row, given as a list or as a string
+    separated by commas, semicolons or spaces.
+    """
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [part for part in re.split(r'[\s,;]+', value) if part]
+    if isinstance(value, (list, tuple)):
+        return list(value)
+    raise ValidationError('suppliers must be a list of IDs')
+
+
+class ItemImporter:
+    """
+    Validates and inserts items in chunks.
+
+    Every chunk costs one query to check the supplier IDs, one
+    executemany inserting the items, one inserting the Item.suppliers
+    through-table rows and one bumping the version and aggregates of the
+    linked suppliers, the writes sharing a single transaction.
+    """
+
+    def __init__(self, chunk_size: int = None):
+        self.chunk_size = chunk_size or getattr(
+            settings, 'INVENTORY_IMPORT_CHUNK_SIZE', 2000)
+        self.item_fields = {
+            name: Item._meta.get_field(name) for name in ITEM_FIELDS}
+        self.supplier_pk = Supplier._meta.pk
+        self.created = 0
+        self.errors = []
+
+    def run(self, rows: Iterable[Tuple[int, Any]]) -> Dict[str, Any]:
+        """
+        Imports all rows and returns the report.
+
+        Args:
+            rows (Iterable): Row numbers and decoded rows.
+
+        Returns:
+            dict: The number of created items and the per-row errors.
+        """
+        for chunk in chunked(rows, self.chunk_size):
+            self.import_chunk(chunk)
+        return {'created': self.created, 'errors': self.errors}
+
+    def clean_row(self, record: Any) -> Tuple[Dict[str, Any], set]:
+        """
+        Validates a decoded row.
+
+        Returns:
+            tuple: The cleaned item values and the supplier IDs.
+
+        Raises:
+            ValidationError: If the row is invalid.
+        """
+        if isinstance(record, ValidationError):
+            raise record
+        if not isinstance(record, dict):
+            raise ValidationError('Row must be an object')
+
+        values = {'id': Item._meta.pk.get_default()}
+        for name, field in self.item_fields.items():
+            try:
+                values[name] = field.clean(record.get(name), None)
+            except ValidationError as error:
+                raise ValidationError(f"{name}: {' '.join(error.messages)}")
+
+        supplier_ids = split_ids(record.get('suppliers'))
+        if not supplier_ids:
+            raise ValidationError('Please add the supplier')
+        try:
+            supplier_ids = {
+                self.supplier_pk.to_python(value) for value in supplier_ids}
+        except ValidationError:
+            raise ValidationError('Some Supplier IDs do not exist')
+        return values, supplier_ids
+
+    def existing_suppliers(self, supplier_ids: set) -> set:
+        """
+        Returns the subset of supplier IDs present in the database.
+        """
+        existing = set()
+        for chunk in chunked(supplier_ids, query_chunk_size()):
+            existing.update(
+                Supplier.objects.filter(
+                    id__in=chunk).values_list('id', flat=True))
+        return existing
+
+    def import_chunk(self, chunk: List[Tuple[int, Any]]) -> None:
+        """
+        Validates a chunk of rows and inserts the valid ones.
+        """
+        cleaned, errors = [], []
+        for row, record in chunk:
+            try:
+                cleaned.append((row, *self.clean_row(record)))
+            except ValidationError as error:
+                errors.append({'row': row, 'error': ' '.join(error.messages)})
+
+        existing = self.existing_suppliers(
+            set().union(*(ids for _, _, ids in cleaned)))
+        connection = connections[DEFAULT_DB_ALIAS]
+        items, links, linked = [], [], set()
+        prepare_pk = Item._meta.pk.get_db_prep_save
+        for row, values, supplier_ids in cleaned:
+            if not supplier_ids <= existing:
+                errors.append(
+                    {'row': row, 'error': 'Some Supplier IDs do not exist'})
+                continue
+            values['supplier_count'] = len(supplier_ids)
+            items.append(values)
+            linked |= supplier_ids
+            item_id = prepare_pk(values['id'], connection)
+            links.extend(
+                (prepare_pk(supplier_id, connection), item_id)
+                for supplier_id in supplier_ids)
+        self.errors.extend(sorted(errors, key=lambda error: error['row']))
+
+        if not items:
+            return
+        with transaction.atomic():
+            insert_rows(connection, Item, items)
+            insert_links(connection, links)
+            items_changed(
+                [values['id'] for values in items], linked, CREATED)
+        self.created += len(items)
+
+
+def insert_rows(connection, model, rows: List[Dict[str, Any]]) -> None:
+    """
+    Inserts rows of cleaned field values with a single executemany.
+
+    Unlike bulk_create no model instance is built per row. Fields missing
+    from a row take their default and auto_now fields take the time of
+    the insert, the filled in values are written back into the row.
+
+    Args:
+        connection: The database connection.
+        model (Model): The model class of the rows.
+        rows (list): Dicts of cleaned values keyed by field name.
+    """
+    now = timezone.now()
+    fields = model._meta.concrete_fields
+    for row in rows:
+        for field in fields:
+            if field.name not in row:
+                auto = getattr(field, 'auto_now', False) or getattr(
+                    field, 'auto_now_add', False)
+                row[field.name] = now if auto else field.get_default()
+
+    insert_prepared(connection, model, [
+        [field.get_db_prep_save(row[field.name], connection)
+         for field in fields]
+        for row in rows])
+
+
+def insert_prepared(connection, model, rows: List[List[Any]]) -> None:
+    """
+    Inserts rows already in database format with a single executemany.
+
+    Args:
+        connection: The database connection.
+        model (Model): The model class of the rows.
+        rows (list): The values of every concrete field, in field order.
+    """
+    fields = model._meta.concrete_fields
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}) VALUES ({})'.format(
+        quote(model._meta.db_table),
+        ', '.join(quote(field.column) for field in fields),
+        ', '.join(['%s'] * len(fields)))
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, rows)
+
+
+def insert_links(connection, links: List[Tuple[Any, Any]]) -> None:
+    """
+    Inserts (supplier_id, item_id) rows into the Supplier.items through
+    table with a single executemany.
+
+    Args:
+        connection: The database connection.
+        links (list): Pairs of supplier and item IDs in database format.
+    """
+    through = Supplier.items.through._meta
+    quote = connection.ops.quote_name
+    sql = 'INSERT INTO {} ({}, {}) VALUES (%s, %s)'.format(
+        quote(through.db_table),
+        quote(through.get_field('supplier').column),
+        quote(through.get_field('item').column))
+    with connection.cursor() as cursor:
+        cursor.executemany(sql, links)
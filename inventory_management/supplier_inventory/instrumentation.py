@@ -0,0 +1,142 @@
+import logging
+import time
+from contextvars import ContextVar
+from typing import List, Optional, Tuple
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+# Per request SQL accounting. record_query is an execute wrapper
+# installed on every connection, it times the statements while a
+# QueryLog is active in the current context and costs a context variable
+# lookup otherwise. Async views run their queries on other threads
+# through sync_to_async, which copies the context, so their statements
+# are counted too.
+
+logger = logging.getLogger(__name__)
+
+_query_log = ContextVar('inventory_query_log', default=None)
+
+
+class QueryLog:
+    """
+    The statements run during a request, with their duration in
+    seconds.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.duration = 0.0
+        self.statements: List[Tuple[float, str]] = []
+
+    def add(self, sql: str, duration: float) -> None:
+        self.count += 1
+        self.duration += duration
+        self.statements.append((duration, sql))
+
+    def slowest(self, limit: int) -> List[Tuple[float, str]]:
+        return sorted(self.statements, reverse=True)[:limit]
+
+
+def record_query(execute, sql, params, many, context):
+    """
+    Execute wrapper timing the statement into the active QueryLog.
+    """
+    log = _query_log.get()
+    if log is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        log.add(sql, time.perf_counter() - start)
+
+
+@receiver(connection_created)
+def install_recorder(sender, connection, **kwargs):
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+class QueryTimingMiddleware:
+    """
+    Adds the number of SQL statements and the time spent in the database
+    and in the whole request to every response, as X-Query-Count and
+    Server-Timing headers. Requests over INVENTORY_QUERY_BUDGET
+    statements or INVENTORY_LATENCY_BUDGET_MS milliseconds are logged
+    with their slowest statements.
+
+    Enabled by INVENTORY_QUERY_TIMING.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'INVENTORY_QUERY_TIMING', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.query_budget = getattr(settings, 'INVENTORY_QUERY_BUDGET', 50)
+        self.latency_budget = getattr(
+            settings, 'INVENTORY_LATENCY_BUDGET_MS', 500)
+        self.slow_queries = getattr(
+            settings, 'INVENTORY_SLOW_QUERIES_LOGGED', 5)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        log, token, start = self.start()
+        try:
+            response = self.get_response(request)
+        finally:
+            _query_log.reset(token)
+        return self.finish(request, response, log, start)
+
+    async def __acall__(self, request):
+        log, token, start = self.start()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _query_log.reset(token)
+        return self.finish(request, response, log, start)
+
+    def start(self):
+        log = QueryLog()
+        return log, _query_log.set(log), time.perf_counter()
+
+    def finish(self, request, response, log: QueryLog, start: float):
+        elapsed = (time.perf_counter() - start) * 1000
+        database = log.duration * 1000
+        response['X-Query-Count'] = str(log.count)
+        response['Server-Timing'] = (
+            f'db;dur={database:.2f};desc="{log.count} queries", '
+            f'total;dur={elapsed:.2f}')
+        if over_budget := self.over_budget(log, elapsed):
+            self.log_request(request, log, elapsed, over_budget)
+        return response
+
+    def over_budget(self, log: QueryLog, elapsed: float) -> Optional[str]:
+        """
+        Returns the exceeded budgets, None if the request kept to them.
+        """
+        exceeded = []
+        if self.query_budget and log.count > self.query_budget:
+            exceeded.append(f'{self.query_budget} queries')
+        if self.latency_budget and elapsed > self.latency_budget:
+            exceeded.append(f'{self.latency_budget} ms')
+        return ' and '.join(exceeded) or None
+
+    def log_request(
+            self, request, log: QueryLog, elapsed: float,
+            over_budget: str) -> None:
+        slowest = ''.join(
+            f'\n  {duration * 1000:.2f} ms  {sql}'
+            for duration, sql in log.slowest(self.slow_queries))
+        logger.warning(
+            '%s %s took %.2f ms with %d queries (%.2f ms in the database), '
+            'over the budget of %s. Slowest statements:%s',
+            request.method, request.get_full_path(), elapsed, log.count,
+            log.duration * 1000, over_budget, slowest)
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+from supplier_inventory.exporter import EXPORT_CONTENT_TYPES, export_items
+
+
+class Command(BaseCommand):
+    help = 'Streams every item with its supplier IDs as NDJSON or CSV.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--format', dest='export_format', default='ndjson',
+            choices=sorted(EXPORT_CONTENT_TYPES))
+        parser.add_argument(
+            '--output', '-o', default='-',
+            help="File to write to, '-' for standard output.")
+        parser.add_argument(
+            '--chunk-size', type=int, default=None,
+            help='Items read from the database at a time.')
+
+    def handle(self, *args, **options):
+        chunks = export_items(options['export_format'], options['chunk_size'])
+        if options['output'] == '-':
+            for chunk in chunks:
+                self.stdout.write(chunk, ending='')
+            return
+        try:
+            with open(options['output'], 'w', newline='') as output:
+                output.writelines(chunks)
+        except OSError as error:
+            raise CommandError(error)
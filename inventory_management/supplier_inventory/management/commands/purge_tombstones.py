@@ -0,0 +1,19 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from supplier_inventory.changes import purge_tombstones
+
+
+class Command(BaseCommand):
+    help = ('Deletes the tombstones of the change feed older than --days, '
+            'INVENTORY_TOMBSTONE_DAYS by default. The feed refuses cursors '
+            'older than INVENTORY_TOMBSTONE_DAYS, a shorter --days loses '
+            'deletions of cursors it still accepts.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days', type=int,
+            default=getattr(settings, 'INVENTORY_TOMBSTONE_DAYS', 30))
+
+    def handle(self, *args, **options):
+        deleted = purge_tombstones(options['days'])
+        self.stdout.write(f'Deleted {deleted} tombstones')
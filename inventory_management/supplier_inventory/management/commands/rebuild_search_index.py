@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from supplier_inventory.search import rebuild_search_index
+
+
+class Command(BaseCommand):
+    help = ('Recreates the item full-text search triggers and reindexes '
+            'every item. Run it after VACUUM.')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('The search index only exists on SQLite')
+        rebuild_search_index()
+        self.stdout.write('Search index rebuilt')
@@ -0,0 +1,17 @@
+import time
+from django.core.management.base import BaseCommand
+from supplier_inventory.signals import repair_aggregates
+
+
+class Command(BaseCommand):
+    help = ('Recomputes the supplier counts of the items and the item counts '
+            'and prices of the suppliers that are wrong. Run it after '
+            'writing to the tables outside the app.')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        repaired = repair_aggregates()
+        self.stdout.write(
+            f"Repaired {repaired['items']} items and "
+            f"{repaired['suppliers']} suppliers in "
+            f"{time.perf_counter() - start:.1f} s")
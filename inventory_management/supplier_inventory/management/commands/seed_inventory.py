@@ -0,0 +1,34 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from supplier_inventory.generator import generate_inventory
+
+
+class Command(BaseCommand):
+    help = ('Adds random items and suppliers linked with the given density, '
+            'with bulk inserts.')
+
+    def add_arguments(self, parser):
+        parser.add_argument('--items', type=int, default=10000)
+        parser.add_argument('--suppliers', type=int, default=1000)
+        parser.add_argument(
+            '--density', type=float, default=2.0,
+            help='Average number of suppliers per item.')
+        parser.add_argument(
+            '--seed', type=int, default=None,
+            help='Seed of the random generator, for repeatable data.')
+        parser.add_argument(
+            '--batch-size', type=int, default=50000,
+            help='Rows inserted per statement.')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        try:
+            created = generate_inventory(
+                options['items'], options['suppliers'], options['density'],
+                options['seed'], options['batch_size'])
+        except ValueError as error:
+            raise CommandError(str(error))
+        self.stdout.write(
+            f"Created {created['items']} items, {created['suppliers']} "
+            f"suppliers and {created['links']} links in "
+            f"{time.perf_counter() - start:.1f} s")
@@ -0,0 +1,29 @@
+import time
+from django.core.management.base import BaseCommand, CommandError
+from supplier_inventory.routing import read_replicas, sync_replica
+
+
+class Command(BaseCommand):
+    help = ('Copies the default database into every read replica of '
+            'INVENTORY_READ_REPLICAS, once or every --interval seconds.')
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--interval', type=float, default=0,
+            help='Seconds between copies, copy once when 0')
+
+    def handle(self, *args, **options):
+        replicas = read_replicas()
+        if not replicas:
+            raise CommandError(
+                'No read replica configured, set INVENTORY_REPLICA_DB')
+        while True:
+            for alias in replicas:
+                try:
+                    pages = sync_replica(alias)
+                except ValueError as error:
+                    raise CommandError(str(error))
+                self.stdout.write(f'Synced {alias}: {pages} pages')
+            if options['interval'] <= 0:
+                return
+            time.sleep(options['interval'])
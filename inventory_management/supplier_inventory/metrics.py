@@ -0,0 +1,246 @@
+import threading
+import time
+from bisect import bisect_left
+from typing import Dict, Iterable, List, Tuple
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+# Request metrics of this process in Prometheus text format.
+#
+# Every thread records into its own shard, so recording takes no lock:
+# only the owning thread writes to a shard and the GIL makes each dict
+# and list update atomic. A scrape adds the shards up. Shards of threads
+# that ended are kept, counters must never go backwards.
+
+DEFAULT_BUCKETS = (
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0,
+    10.0)
+METHODS = frozenset(
+    ('GET', 'HEAD', 'OPTIONS', 'POST', 'PUT', 'PATCH', 'DELETE'))
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Shard:
+    """
+    The metrics recorded by one thread.
+
+    A histogram is a list holding the count of every bucket, +Inf
+    included, followed by the sum of the observations.
+    """
+    __slots__ = ('histograms', 'statuses', 'in_flight')
+
+    def __init__(self):
+        self.histograms: Dict[Tuple[str, str], list] = {}
+        self.statuses: Dict[Tuple[str, str, int], int] = {}
+        self.in_flight: Dict[Tuple[str, str], int] = {}
+
+
+class MetricsRegistry:
+    """
+    Per view and method request latency histograms, status code
+    counters and in-flight gauges.
+
+    Args:
+        buckets (Iterable): The upper bounds of the latency buckets, in
+            seconds.
+    """
+
+    def __init__(self, buckets: Iterable[float] = DEFAULT_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self.local = threading.local()
+        self.shards: List[Shard] = []
+        self.lock = threading.Lock()
+
+    def shard(self) -> Shard:
+        """
+        Returns the shard of the current thread.
+        """
+        try:
+            return self.local.shard
+        except AttributeError:
+            shard = self.local.shard = Shard()
+            with self.lock:
+                self.shards.append(shard)
+            return shard
+
+    def observe(
+            self, view: str, method: str, status: int, seconds: float,
+            in_flight: int = 0) -> None:
+        """
+        Records a finished request, moving the in-flight gauge by
+        in_flight in the same call.
+        """
+        shard = self.shard()
+        key = (view, method)
+        if in_flight:
+            shard.in_flight[key] = shard.in_flight.get(key, 0) + in_flight
+        histogram = shard.histograms.get(key)
+        if histogram is None:
+            histogram = shard.histograms[key] = [0] * (
+                len(self.buckets) + 1) + [0.0]
+        histogram[bisect_left(self.buckets, seconds)] += 1
+        histogram[-1] += seconds
+        status_key = (view, method, status)
+        shard.statuses[status_key] = shard.statuses.get(status_key, 0) + 1
+
+    def track(self, view: str, method: str, delta: int) -> None:
+        """
+        Moves the in-flight gauge of a view and method by delta.
+        """
+        in_flight = self.shard().in_flight
+        key = (view, method)
+        in_flight[key] = in_flight.get(key, 0) + delta
+
+    def collect(self) -> Tuple[dict, dict, dict]:
+        """
+        Returns the histograms, status counters and in-flight gauges of
+        all threads added up.
+        """
+        histograms, statuses, in_flight = {}, {}, {}
+        with self.lock:
+            shards = list(self.shards)
+        for shard in shards:
+            # dict.copy and list slicing are atomic under the GIL
+            for key, histogram in shard.histograms.copy().items():
+                total = histograms.setdefault(key, [0] * len(histogram))
+                for index, value in enumerate(histogram[:]):
+                    total[index] += value
+            for key, count in shard.statuses.copy().items():
+                statuses[key] = statuses.get(key, 0) + count
+            for key, count in shard.in_flight.copy().items():
+                in_flight[key] = in_flight.get(key, 0) + count
+        return histograms, statuses, in_flight
+
+    def render(self) -> str:
+        """
+        Returns the metrics in the Prometheus text exposition format.
+        """
+        histograms, statuses, in_flight = self.collect()
+        lines = [
+            '# HELP inventory_request_duration_seconds Request latency '
+            'by view and method.',
+            '# TYPE inventory_request_duration_seconds histogram',
+        ]
+        bounds = [format_value(bound) for bound in self.buckets] + ['+Inf']
+        for (view, method), histogram in sorted(histograms.items()):
+            labels = f'view="{escape(view)}",method="{method}"'
+            cumulative = 0
+            for bound, count in zip(bounds, histogram):
+                cumulative += count
+                lines.append(
+                    'inventory_request_duration_seconds_bucket'
+                    f'{{{labels},le="{bound}"}} {cumulative}')
+            lines.append(
+                f'inventory_request_duration_seconds_sum{{{labels}}} '
+                f'{format_value(histogram[-1])}')
+            lines.append(
+                f'inventory_request_duration_seconds_count{{{labels}}} '
+                f'{cumulative}')
+
+        lines += [
+            '# HELP inventory_requests_total Finished requests by view, '
+            'method and status code.',
+            '# TYPE inventory_requests_total counter',
+        ]
+        for (view, method, status), count in sorted(statuses.items()):
+            lines.append(
+                f'inventory_requests_total{{view="{escape(view)}",'
+                f'method="{method}",status="{status}"}} {count}')
+
+        lines += [
+            '# HELP inventory_requests_in_flight Requests being served by '
+            'view and method.',
+            '# TYPE inventory_requests_in_flight gauge',
+        ]
+        for (view, method), count in sorted(in_flight.items()):
+            lines.append(
+                f'inventory_requests_in_flight{{view="{escape(view)}",'
+                f'method="{method}"}} {count}')
+        return '\n'.join(lines) + '\n'
+
+    def clear(self) -> None:
+        with self.lock:
+            for shard in self.shards:
+                shard.__init__()
+
+
+def escape(value: str) -> str:
+    """
+    Escapes a Prometheus label value.
+    """
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace(
+        '\n', '\\n')
+
+
+def format_value(value: float) -> str:
+    return repr(float(value))
+
+
+metrics = MetricsRegistry()
+
+
+class MetricsMiddleware:
+    """
+    Records the latency, status code and in-flight count of every
+    request in the metrics registry, labelled with the URL name of the
+    view and the method. Requests matching no URL are labelled
+    "unmatched" and unknown methods "other", to bound the number of
+    series.
+
+    Disabled by setting INVENTORY_METRICS to False.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response, registry: MetricsRegistry = None):
+        if not getattr(settings, 'INVENTORY_METRICS', True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.registry = registry or metrics
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+            # Django calls a sync process_view of an async chain through
+            # sync_to_async, a thread hop on every request
+            self.process_view = self.aprocess_view
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        start = time.perf_counter()
+        response = self.get_response(request)
+        self.finish(request, response, start)
+        return response
+
+    async def __acall__(self, request):
+        start = time.perf_counter()
+        response = await self.get_response(request)
+        self.finish(request, response, start)
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        self.start_view(request)
+
+    async def aprocess_view(self, request, view_func, view_args, view_kwargs):
+        self.start_view(request)
+
+    def start_view(self, request) -> None:
+        # The view is only known once the URL is resolved
+        request._metrics_key = key = (
+            request.resolver_match.view_name, self.method(request))
+        self.registry.track(*key, 1)
+
+    def finish(self, request, response, start: float) -> None:
+        seconds = time.perf_counter() - start
+        key = getattr(request, '_metrics_key', None)
+        if key is None:
+            self.registry.observe(
+                'unmatched', self.method(request), response.status_code,
+                seconds)
+        else:
+            self.registry.observe(
+                *key, response.status_code, seconds, in_flight=-1)
+
+    def method(self, request) -> str:
+        return request.method if request.method in METHODS else 'other'
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.10 on 2026-10-18 04:16
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supplier_inventory', '0002_alter_supplier_items'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='supplier',
+            name='created_at',
+            field=models.DateTimeField(auto_now_add=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['created_at', 'id'], name='item_created_at_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplier',
+            index=models.Index(fields=['created_at', 'id'], name='supplier_created_at_id_idx'),
+        ),
+    ]
@@ -0,0 +1,69 @@
+from django.db import migrations
+
+# The SQL of the search index as of this migration, copied rather than
+# imported from supplier_inventory.search so that later changes to the
+# app do not change what the migration does.
+
+DROP_TRIGGERS_SQL = [
+    "DROP TRIGGER IF EXISTS supplier_inventory_item_fts_ai",
+    "DROP TRIGGER IF EXISTS supplier_inventory_item_fts_ad",
+    "DROP TRIGGER IF EXISTS supplier_inventory_item_fts_au",
+]
+
+INSTALL_SQL = DROP_TRIGGERS_SQL + [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS supplier_inventory_item_fts USING fts5(
+        name, description,
+        content='supplier_inventory_item',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3')""",
+    """CREATE TRIGGER supplier_inventory_item_fts_ai
+    AFTER INSERT ON supplier_inventory_item BEGIN
+        INSERT INTO supplier_inventory_item_fts(rowid, name, description)
+        VALUES (new.rowid, new.name, new.description);
+    END""",
+    """CREATE TRIGGER supplier_inventory_item_fts_ad
+    AFTER DELETE ON supplier_inventory_item BEGIN
+        INSERT INTO supplier_inventory_item_fts(
+            supplier_inventory_item_fts, rowid, name, description)
+        VALUES ('delete', old.rowid, old.name, old.description);
+    END""",
+    """CREATE TRIGGER supplier_inventory_item_fts_au
+    AFTER UPDATE OF name, description ON supplier_inventory_item BEGIN
+        INSERT INTO supplier_inventory_item_fts(
+            supplier_inventory_item_fts, rowid, name, description)
+        VALUES ('delete', old.rowid, old.name, old.description);
+        INSERT INTO supplier_inventory_item_fts(rowid, name, description)
+        VALUES (new.rowid, new.name, new.description);
+    END""",
+    "INSERT INTO supplier_inventory_item_fts(supplier_inventory_item_fts) "
+    "VALUES ('rebuild')",
+]
+
+UNINSTALL_SQL = DROP_TRIGGERS_SQL + [
+    "DROP TABLE IF EXISTS supplier_inventory_item_fts",
+]
+
+
+def install_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in INSTALL_SQL:
+        schema_editor.execute(sql)
+
+
+def uninstall_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in UNINSTALL_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supplier_inventory', '0004_updated_at'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.10 on 2026-10-18 04:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supplier_inventory', '0005_item_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['price', 'id'], name='item_price_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['name', 'id'], name='item_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplier',
+            index=models.Index(fields=['name', 'id'], name='supplier_name_id_idx'),
+        ),
+        # The unique (supplier_id, item_id) index of the Supplier.items
+        # through table covers reads from the supplier side, this one
+        # covers reads from the item side without touching the table.
+        migrations.RunSQL(
+            'CREATE INDEX supplier_items_item_supplier_idx '
+            'ON supplier_inventory_supplier_items (item_id, supplier_id)',
+            'DROP INDEX supplier_items_item_supplier_idx',
+        ),
+    ]
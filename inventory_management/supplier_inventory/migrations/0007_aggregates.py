@@ -0,0 +1,136 @@
+# Generated by Django 4.2.10 on 2026-10-18 05:30
+
+from django.db import migrations, models
+
+# The SQL of the search index and of the aggregates as of this
+# migration, copied rather than imported from the app so that later
+# changes to it do not change what the migration does.
+
+INSTALL_SEARCH_INDEX_SQL = [
+    "DROP TRIGGER IF EXISTS supplier_inventory_item_fts_ai",
+    "DROP TRIGGER IF EXISTS supplier_inventory_item_fts_ad",
+    "DROP TRIGGER IF EXISTS supplier_inventory_item_fts_au",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS supplier_inventory_item_fts USING fts5(
+        name, description,
+        content='supplier_inventory_item',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3')""",
+    """CREATE TRIGGER supplier_inventory_item_fts_ai
+    AFTER INSERT ON supplier_inventory_item BEGIN
+        INSERT INTO supplier_inventory_item_fts(rowid, name, description)
+        VALUES (new.rowid, new.name, new.description);
+    END""",
+    """CREATE TRIGGER supplier_inventory_item_fts_ad
+    AFTER DELETE ON supplier_inventory_item BEGIN
+        INSERT INTO supplier_inventory_item_fts(
+            supplier_inventory_item_fts, rowid, name, description)
+        VALUES ('delete', old.rowid, old.name, old.description);
+    END""",
+    """CREATE TRIGGER supplier_inventory_item_fts_au
+    AFTER UPDATE OF name, description ON supplier_inventory_item BEGIN
+        INSERT INTO supplier_inventory_item_fts(
+            supplier_inventory_item_fts, rowid, name, description)
+        VALUES ('delete', old.rowid, old.name, old.description);
+        INSERT INTO supplier_inventory_item_fts(rowid, name, description)
+        VALUES (new.rowid, new.name, new.description);
+    END""",
+    "INSERT INTO supplier_inventory_item_fts(supplier_inventory_item_fts) "
+    "VALUES ('rebuild')",
+]
+
+# The subqueries join the other table like aggregates.subquery
+ITEMS_OF_SUPPLIER = (
+    'FROM supplier_inventory_supplier_items '
+    'INNER JOIN supplier_inventory_item '
+    'ON supplier_inventory_item.id = supplier_inventory_supplier_items.item_id '
+    'WHERE supplier_inventory_supplier_items.supplier_id = '
+    'supplier_inventory_supplier.id')
+
+FILL_AGGREGATES_SQL = [
+    'UPDATE supplier_inventory_item SET supplier_count = ('
+    'SELECT COUNT(*) FROM supplier_inventory_supplier_items '
+    'INNER JOIN supplier_inventory_supplier '
+    'ON supplier_inventory_supplier.id = '
+    'supplier_inventory_supplier_items.supplier_id '
+    'WHERE supplier_inventory_supplier_items.item_id = '
+    'supplier_inventory_item.id)',
+    'UPDATE supplier_inventory_supplier SET '
+    f'item_count = (SELECT COUNT(*) {ITEMS_OF_SUPPLIER}), '
+    'min_item_price = (SELECT MIN(supplier_inventory_item.price) '
+    f'{ITEMS_OF_SUPPLIER}), '
+    'max_item_price = (SELECT MAX(supplier_inventory_item.price) '
+    f'{ITEMS_OF_SUPPLIER}), '
+    'avg_item_price = (SELECT ROUND(AVG(supplier_inventory_item.price), 2) '
+    f'{ITEMS_OF_SUPPLIER})',
+]
+
+
+def install_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor != 'sqlite':
+        return
+    for sql in INSTALL_SEARCH_INDEX_SQL:
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('supplier_inventory', '0006_hot_column_indexes'),
+    ]
+
+    operations = [
+        # SQLite adds the column by rebuilding the item table, which
+        # drops the search triggers and renumbers the rowids the index
+        # refers to. The index is reinstalled after the rebuild, either
+        # way.
+        migrations.RunPython(
+            migrations.RunPython.noop, install_search_index),
+        migrations.AddField(
+            model_name='item',
+            name='supplier_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(
+            install_search_index, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='supplier',
+            name='item_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='supplier',
+            name='min_item_price',
+            field=models.DecimalField(decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='supplier',
+            name='max_item_price',
+            field=models.DecimalField(decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.AddField(
+            model_name='supplier',
+            name='avg_item_price',
+            field=models.DecimalField(decimal_places=2, editable=False, max_digits=10, null=True),
+        ),
+        migrations.RunSQL(FILL_AGGREGATES_SQL, migrations.RunSQL.noop),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['supplier_count', 'id'], name='item_supplier_count_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplier',
+            index=models.Index(fields=['item_count', 'id'], name='supplier_item_count_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplier',
+            index=models.Index(fields=['min_item_price', 'id'], name='supplier_min_price_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplier',
+            index=models.Index(fields=['max_item_price', 'id'], name='supplier_max_price_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='supplier',
+            index=models.Index(fields=['avg_item_price', 'id'], name='supplier_avg_price_id_idx'),
+        ),
+    ]
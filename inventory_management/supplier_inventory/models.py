@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 import uuid
 
 # Create your models here.
@@ -14,9 +15,29 @@ class BaseModel(models.Model):
         primary_key=True, default=uuid.uuid4, editable=False)
     name = models.CharField(max_length=70)
 
+    # Fields computed by the database, never written back from an
+    # instance which may hold stale values
+    maintained_fields = ()
+
     class Meta:
         abstract = True
 
+    def save(self, *args, **kwargs):
+        """
+        Saves the instance, leaving out the maintained fields when an
+        existing row is updated.
+        """
+        if (self.maintained_fields and not self._state.adding
+                and kwargs.get('update_fields') is None
+                and not kwargs.get('force_insert')):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.attname for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.name not in self.maintained_fields
+                and field.attname not in deferred]
+        super().save(*args, **kwargs)
+
 
 class Item(BaseModel):
     """
@@ -25,6 +46,24 @@ class Item(BaseModel):
     description = models.TextField()
     price = models.DecimalField(max_digits=10, decimal_places=2)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by the app, see aggregates.py
+    supplier_count = models.PositiveIntegerField(default=0, editable=False)
+
+    maintained_fields = ('supplier_count',)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['created_at', 'id'], name='item_created_at_id_idx'),
+            models.Index(fields=['price', 'id'], name='item_price_id_idx'),
+            models.Index(fields=['name', 'id'], name='item_name_id_idx'),
+            models.Index(
+                fields=['supplier_count', 'id'],
+                name='item_supplier_count_id_idx'),
+            models.Index(
+                fields=['updated_at', 'id'], name='item_updated_at_id_idx'),
+        ]
 
     def __str__(self) -> str:
         return f'{self.name} at {self.price} '
@@ -37,6 +76,69 @@ class Supplier(BaseModel):
     phone_number = models.CharField(max_length=12)
     email = models.EmailField(null=True)
     items = models.ManyToManyField(Item, related_name='suppliers')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    # Maintained by the app, see aggregates.py. The prices are null
+    # while the supplier has no items.
+    item_count = models.PositiveIntegerField(default=0, editable=False)
+    min_item_price = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, editable=False)
+    max_item_price = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, editable=False)
+    avg_item_price = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, editable=False)
+
+    maintained_fields = (
+        'item_count', 'min_item_price', 'max_item_price', 'avg_item_price')
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['created_at', 'id'],
+                name='supplier_created_at_id_idx'),
+            models.Index(
+                fields=['name', 'id'], name='supplier_name_id_idx'),
+            models.Index(
+                fields=['item_count', 'id'],
+                name='supplier_item_count_id_idx'),
+            models.Index(
+                fields=['min_item_price', 'id'],
+                name='supplier_min_price_id_idx'),
+            models.Index(
+                fields=['max_item_price', 'id'],
+                name='supplier_max_price_id_idx'),
+            models.Index(
+                fields=['avg_item_price', 'id'],
+                name='supplier_avg_price_id_idx'),
+            models.Index(
+                fields=['updated_at', 'id'],
+                name='supplier_updated_at_id_idx'),
+        ]
 
     def __str__(self) -> str:
         return f'{self.name} - {self.phone_number}'
+
+
+class Tombstone(models.Model):
+    """
+    A deleted item or supplier, kept for the change feed.
+    """
+    ITEM = 'item'
+    SUPPLIER = 'supplier'
+
+    id = models.UUIDField(
+        primary_key=True, default=uuid.uuid4, editable=False)
+    model = models.CharField(
+        max_length=8, choices=[(ITEM, 'Item'), (SUPPLIER, 'Supplier')])
+    object_id = models.UUIDField()
+    deleted_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=['deleted_at', 'id'],
+                name='tombstone_deleted_at_id_idx'),
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.model} {self.object_id} deleted at {self.deleted_at}'
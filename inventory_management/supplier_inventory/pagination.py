@@ -0,0 +1,298 @@
+import base64
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from django.conf import settings
+from django.db.models import F, Q, QuerySet
+from django.http import HttpRequest
+
+DEFAULT_ORDERING = ('created_at', 'id')
+
+
+def get_page_size(request: HttpRequest) -> int:
+    """
+    Reads the requested page size, falling back to the configured
+    default and capping it at the configured maximum.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+
+    Returns:
+        int: The number of rows to return on a page.
+
+    Raises:
+        ValueError: If page_size is not a positive integer.
+    """
+    default = getattr(settings, 'INVENTORY_PAGE_SIZE', 100)
+    maximum = getattr(settings, 'INVENTORY_MAX_PAGE_SIZE', 1000)
+    page_size = request.GET.get('page_size')
+    if page_size is None:
+        return min(default, maximum)
+    page_size = int(page_size)
+    if page_size < 1:
+        raise ValueError('page_size must be a positive integer')
+    return min(page_size, maximum)
+
+
+def get_ordering(
+        request: HttpRequest, fields: Sequence[str]) -> Tuple[str, str]:
+    """
+    Reads the ordering query parameter, one of the given fields with a
+    leading '-' for descending order. The id breaks ties in the same
+    direction, so the rows are read from a (field, id) index either way.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+        fields (Sequence): The fields the rows can be ordered by.
+
+    Returns:
+        tuple: The ordering, DEFAULT_ORDERING if none is requested.
+
+    Raises:
+        ValueError: If the field can not be ordered by.
+    """
+    ordering = request.GET.get('ordering')
+    if not ordering:
+        return DEFAULT_ORDERING
+    descending = ordering.startswith('-')
+    name = ordering[1:] if descending else ordering
+    if name not in fields:
+        raise ValueError(
+            f"Invalid ordering '{ordering}', use {', '.join(fields)}")
+    prefix = '-' if descending else ''
+    return prefix + name, prefix + 'id'
+
+
+def get_filters(
+        request: HttpRequest, model, filters: Dict[str, str]) -> Q:
+    """
+    Reads the range filters of a list request.
+
+    Args:
+        request (HttpRequest): The HTTP request object.
+        model (Model): The model of the rows.
+        filters (dict): The lookups of the query parameters, such as
+            {'min_items': 'item_count__gte'}.
+
+    Returns:
+        Q: The filter of the given parameters.
+
+    Raises:
+        ValidationError: If a value is invalid for its field.
+    """
+    condition = Q()
+    for param, lookup in filters.items():
+        value = request.GET.get(param)
+        if value:
+            field = model._meta.get_field(lookup.split('__')[0])
+            condition &= Q(**{lookup: field.to_python(value)})
+    return condition
+
+
+def order_expressions(queryset: QuerySet, ordering: Sequence[str]) -> list:
+    """
+    Returns the order_by arguments of an ordering. NULL sorts before any
+    value, as keyset_filter expects, whatever the database default.
+    """
+    opts = queryset.model._meta
+    expressions = []
+    for name in ordering:
+        field = name.lstrip('-')
+        if not opts.get_field(field).null:
+            expressions.append(name)
+        elif name.startswith('-'):
+            expressions.append(F(field).desc(nulls_last=True))
+        else:
+            expressions.append(F(field).asc(nulls_first=True))
+    return expressions
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """
+    Encodes the sort key of the last row of a page into an opaque token.
+
+    Args:
+        values (Sequence): The values of the ordering fields.
+
+    Returns:
+        str: A url safe token.
+    """
+    payload = json.dumps(
+        [value if value is None
+         else value.isoformat() if hasattr(value, 'isoformat')
+         else str(value)
+         for value in values],
+        separators=(',', ':'))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: str) -> List[str]:
+    """
+    Decodes a token produced by encode_cursor.
+
+    Args:
+        token (str): The opaque cursor token.
+
+    Returns:
+        list: The raw values of the ordering fields.
+
+    Raises:
+        ValueError: If the token is malformed.
+    """
+    try:
+        padded = token + '=' * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValueError('Invalid cursor')
+    if not isinstance(values, list):
+        raise ValueError('Invalid cursor')
+    return values
+
+
+def keyset_filter(
+        queryset: QuerySet,
+        ordering: Sequence[str],
+        values: Sequence[Any]) -> Q:
+    """
+    Builds the filter selecting the rows that sort after the given key,
+    i.e. (a, b) > (x, y) expanded to a > x OR (a = x AND b > y). NULL
+    sorts before any value, see order_expressions.
+
+    Args:
+        queryset (QuerySet): The queryset being paginated.
+        ordering (Sequence): The ordering fields, '-' marks descending.
+        values (Sequence): The raw cursor values for the ordering fields.
+
+    Returns:
+        Q: The filter to apply to the queryset.
+
+    Raises:
+        ValueError: If the values do not match the ordering.
+    """
+    if len(values) != len(ordering):
+        raise ValueError('Invalid cursor')
+
+    opts = queryset.model._meta
+    fields = [name.lstrip('-') for name in ordering]
+    values = [
+        opts.get_field(name).to_python(value)
+        for name, value in zip(fields, values)]
+
+    condition = Q()
+    for position in range(len(ordering) - 1, -1, -1):
+        name, value = fields[position], values[position]
+        descending = ordering[position].startswith('-')
+        if value is None:
+            # Nothing sorts before NULL, everything else after it
+            step = Q(pk__in=[]) if descending else Q(
+                **{f'{name}__isnull': False})
+            equal = Q(**{f'{name}__isnull': True})
+        else:
+            lookup = 'lt' if descending else 'gt'
+            step = Q(**{f'{name}__{lookup}': value})
+            if descending and opts.get_field(name).null:
+                step |= Q(**{f'{name}__isnull': True})
+            equal = Q(**{name: value})
+        if position < len(ordering) - 1:
+            step |= equal & condition
+        condition = step
+    return condition
+
+
+def row_key(row: Any, ordering: Sequence[str]) -> List[Any]:
+    """
+    Returns the values of the ordering fields of a model instance or
+    of a dict produced by QuerySet.values().
+    """
+    fields = [name.lstrip('-') for name in ordering]
+    if isinstance(row, dict):
+        return [row[name] for name in fields]
+    return [getattr(row, name) for name in fields]
+
+
+def page_queryset(
+        queryset: QuerySet,
+        request: HttpRequest,
+        ordering: Sequence[str] = DEFAULT_ORDERING) -> Tuple[QuerySet, int]:
+    """
+    Narrows the queryset to the rows of the requested page plus one,
+    which tells whether another page follows.
+
+    Returns:
+        tuple: The sliced queryset and the page size.
+
+    Raises:
+        ValueError: If the cursor or the page size is invalid.
+    """
+    page_size = get_page_size(request)
+    queryset = queryset.order_by(*order_expressions(queryset, ordering))
+    if cursor := request.GET.get('cursor'):
+        queryset = queryset.filter(
+            keyset_filter(queryset, ordering, decode_cursor(cursor)))
+    return queryset[:page_size + 1], page_size
+
+
+def finish_page(
+        rows: list,
+        page_size: int,
+        ordering: Sequence[str] = DEFAULT_ORDERING
+) -> Tuple[list, Optional[str]]:
+    """
+    Trims the extra row fetched by page_queryset.
+
+    Returns:
+        tuple: The rows of the page and the cursor of the next page,
+        which is None on the last page.
+    """
+    if len(rows) <= page_size:
+        return rows, None
+    rows = rows[:page_size]
+    return rows, encode_cursor(row_key(rows[-1], ordering))
+
+
+def paginate(
+        queryset: QuerySet,
+        request: HttpRequest,
+        ordering: Sequence[str] = DEFAULT_ORDERING
+) -> Tuple[list, Optional[str]]:
+    """
+    Returns one page of the queryset using keyset pagination.
+
+    Rows are ordered by the given fields and the page starts right after
+    the key carried by the cursor query parameter, so every page costs an
+    index seek no matter how deep the client reads.
+
+    Args:
+        queryset (QuerySet): The queryset to paginate.
+        request (HttpRequest): The HTTP request object.
+        ordering (Sequence): Unique ordering, the last field must be the pk.
+
+    Returns:
+        tuple: The rows of the page and the cursor of the next page,
+        which is None on the last page.
+
+    Raises:
+        ValueError: If the cursor or the page size is invalid.
+    """
+    page, page_size = page_queryset(queryset, request, ordering)
+    return finish_page(list(page), page_size, ordering)
+
+
+async def apaginate(
+        queryset: QuerySet,
+        request: HttpRequest,
+        ordering: Sequence[str] = DEFAULT_ORDERING
+) -> Tuple[list, Optional[str]]:
+    """
+    Same as paginate, reading the page with the async ORM.
+    """
+    page, page_size = page_queryset(queryset, request, ordering)
+    return finish_page([row async for row in page], page_size, ordering)
+
+
+def set_next_cursor(response, next_cursor: Optional[str]):
+    """
+    Exposes the cursor of the next page in the X-Next-Cursor header.
+    """
+    if next_cursor:
+        response['X-Next-Cursor'] = next_cursor
+    return response
@@ -0,0 +1,231 @@
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+from django.db.models import F
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.settings import api_settings
+from .utils import chunked, query_chunk_size
+
+# Read-only serialisation of rows fetched with QuerySet.values(). The
+# converters are picked once per serialiser field instead of running the
+# DRF field machinery for every value, and produce the same output as
+# the serialiser for the values the database hands back.
+#
+# A converter factory is called once per batch of rows and returns the
+# function applied to each value, so that per request settings such as
+# the active timezone are looked up once rather than once per row.
+
+FAST_DATETIME_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+
+def datetime_converter(field: serializers.DateTimeField) -> Callable:
+    """
+    Returns a converter factory formatting datetimes like
+    field.to_representation.
+    """
+    output_format = getattr(field, 'format', api_settings.DATETIME_FORMAT)
+    if output_format != FAST_DATETIME_FORMAT or hasattr(field, 'timezone'):
+        return lambda: field.to_representation
+    enforce_timezone = field.enforce_timezone
+
+    def factory():
+        current = field.default_timezone()
+
+        def convert(value):
+            if current is not None and timezone.is_aware(value):
+                value = value.astimezone(current)
+            else:
+                value = enforce_timezone(value)
+            if value.year < 1000:
+                return value.strftime(output_format)
+            # isoformat is several times faster than strftime
+            return value.isoformat(' ', 'seconds')[:19]
+        return convert
+    return factory
+
+
+def decimal_converter(field: serializers.DecimalField) -> Callable:
+    """
+    Returns a converter factory formatting decimals like
+    field.to_representation.
+
+    Decimals read from a DecimalField are already quantized to its
+    decimal places, those only need formatting.
+    """
+    coerce_to_string = getattr(
+        field, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+    if not coerce_to_string or field.localize:
+        return lambda: field.to_representation
+    exponent = -field.decimal_places
+    to_representation = field.to_representation
+
+    def convert(value):
+        if value.as_tuple().exponent == exponent:
+            return format(value, 'f')
+        return to_representation(value)
+    return lambda: convert
+
+
+def field_converter(field: serializers.Field) -> Optional[Callable]:
+    """
+    Returns the converter factory of a serialiser field, None if values
+    are rendered as they are.
+    """
+    if isinstance(field, serializers.UUIDField):
+        if field.uuid_format == 'hex_verbose':
+            return lambda: str
+        return lambda: field.to_representation
+    if isinstance(field, serializers.DateTimeField):
+        return datetime_converter(field)
+    if isinstance(field, serializers.DecimalField):
+        return decimal_converter(field)
+    if type(field) in (serializers.CharField, serializers.EmailField):
+        return None
+    return lambda: field.to_representation
+
+
+def skip_none(factory: Callable) -> Callable:
+    """
+    Wraps the converter factory of a nullable column, None is rendered
+    as null.
+    """
+    def none_factory():
+        convert = factory()
+        return lambda value: None if value is None else convert(value)
+    return none_factory
+
+
+class Projection:
+    """
+    Serialises rows of QuerySet.values() like a read-only serialiser.
+
+    Nested serialisers are left out, the caller adds related objects.
+
+    Args:
+        serialiser_class: The ModelSerializer the output must match.
+        fields (Iterable): The fields to output, all flat fields of the
+            serialiser by default.
+    """
+
+    def __init__(self, serialiser_class, fields: Iterable[str] = None):
+        declared = serialiser_class().fields
+        names = fields if fields is not None else [
+            name for name, field in declared.items()
+            if not isinstance(field, serializers.BaseSerializer)]
+        self.names = list(names)
+        self.columns = [declared[name].source for name in self.names]
+        model = serialiser_class.Meta.model
+        self.factories = []
+        for name, column in zip(self.names, self.columns):
+            factory = field_converter(declared[name])
+            if factory is None:
+                continue
+            if model._meta.get_field(column).null:
+                factory = skip_none(factory)
+            self.factories.append((name, factory))
+        self.renamed = self.names != self.columns
+
+    def values(self, queryset, *extra: str, **expressions):
+        """
+        Returns the queryset reading only the projected columns, plus
+        the extra columns and expressions, as dicts.
+        """
+        return queryset.values(*self.columns, *extra, **expressions)
+
+    def converters(self) -> List[Tuple[str, Callable]]:
+        """
+        Returns the converters to apply to a batch of rows.
+        """
+        return [(name, factory()) for name, factory in self.factories]
+
+    def row(self, row: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Converts one row of values() into the serialised dict.
+        """
+        return self.rows([row])[0]
+
+    def rows(self, rows: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Converts rows of values() into serialised dicts, in place when
+        the output names are the column names.
+        """
+        if self.renamed:
+            rows = [
+                {name: row[column]
+                 for name, column in zip(self.names, self.columns)}
+                for row in rows]
+        else:
+            rows = list(rows)
+        for name, convert in self.converters():
+            for row in rows:
+                row[name] = convert(row[name])
+        return rows
+
+
+@lru_cache(maxsize=None)
+def get_projection(
+        serialiser_class, fields: Tuple[str] = None) -> Projection:
+    """
+    Returns the projection of the given flat fields of a serialiser,
+    built once per combination of fields.
+    """
+    return Projection(serialiser_class, fields)
+
+
+@lru_cache(maxsize=None)
+def serialiser_fields(serialiser_class) -> Tuple[str]:
+    """
+    Returns the names of the fields of a serialiser, in output order.
+    """
+    return tuple(serialiser_class().fields)
+
+
+def nest(
+        rows: List[Dict[str, Any]],
+        name: str,
+        projection: Projection,
+        queryset,
+        link: str) -> None:
+    """
+    Adds to every row of values() the serialised list of its related
+    objects, read with one query per chunk of rows. Call it before the
+    rows themselves are converted, it matches them on their raw id.
+
+    Args:
+        rows (list): The parent rows, holding their id.
+        name (str): The key of the related list in each row.
+        projection (Projection): The projection of the related objects.
+        queryset (QuerySet): The related objects.
+        link (str): The relation from the related model to the parents.
+    """
+    children = {}
+    for row in rows:
+        row[name] = children[row['id']] = []
+    for chunk in chunked(list(children), query_chunk_size()):
+        related = projection.values(
+            queryset.filter(**{f'{link}__in': chunk}), _parent=F(link))
+        for child in related:
+            children[child.pop('_parent')].append(child)
+    for row in rows:
+        row[name] = projection.rows(row[name])
+
+
+async def anest(
+        rows: List[Dict[str, Any]],
+        name: str,
+        projection: Projection,
+        queryset,
+        link: str) -> None:
+    """
+    Same as nest, reading the related objects with the async ORM.
+    """
+    children = {}
+    for row in rows:
+        row[name] = children[row['id']] = []
+    for chunk in chunked(list(children), query_chunk_size()):
+        related = projection.values(
+            queryset.filter(**{f'{link}__in': chunk}), _parent=F(link))
+        async for child in related:
+            children[child.pop('_parent')].append(child)
+    for row in rows:
+        row[name] = projection.rows(row[name])
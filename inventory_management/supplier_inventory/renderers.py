@@ -0,0 +1,38 @@
+from rest_framework.renderers import JSONRenderer
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    Renders JSON with orjson, producing the same bytes as JSONRenderer.
+
+    Dates and times are handed to the DRF encoder so they keep its
+    format. Anything orjson refuses, pretty printed output and non
+    default JSON settings go through JSONRenderer. Without orjson
+    installed this is JSONRenderer.
+    """
+    options = 0 if orjson is None else (
+        orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS)
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """
+        Render `data` into JSON, returning a bytestring.
+        """
+        if (orjson is None or data is None or self.ensure_ascii
+                or not self.compact or not self.strict
+                or self.get_indent(accepted_media_type,
+                                   renderer_context or {}) is not None):
+            return super().render(data, accepted_media_type, renderer_context)
+        try:
+            ret = orjson.dumps(
+                data, default=self.encoder_class().default,
+                option=self.options)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+        # Escape U+2028 and U+2029 like JSONRenderer
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(
+            b'\xe2\x80\xa9', b'\\u2029')
@@ -0,0 +1,192 @@
+import random
+import sqlite3
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import List
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+# Reads go to a random replica of INVENTORY_READ_REPLICAS and writes to
+# the default database. A request that writes, and the requests of the
+# same client for INVENTORY_REPLICA_STICKY_SECONDS after it, read from
+# the default database too so that the client sees its own writes.
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+STICKY_COOKIE = 'inventory_primary'
+
+_read_primary = ContextVar('inventory_read_primary', default=False)
+
+
+def read_replicas() -> List[str]:
+    """
+    Returns the aliases of the databases serving reads.
+    """
+    return getattr(settings, 'INVENTORY_READ_REPLICAS', [])
+
+
+@contextmanager
+def reads_from_primary():
+    """
+    Sends the reads made inside the block to the default database.
+    """
+    token = _read_primary.set(True)
+    try:
+        yield
+    finally:
+        _read_primary.reset(token)
+
+
+def reading_from_primary() -> bool:
+    """
+    Returns whether the reads of the current context go to the default
+    database through reads_from_primary, as during the requests of a
+    client that recently wrote.
+    """
+    return _read_primary.get()
+
+
+class ReplicaRouter:
+    """
+    Routes reads to the read replicas and everything else to the
+    default database.
+
+    Reads stay on the default database inside reads_from_primary and
+    inside a transaction of the default database, which must see its
+    own uncommitted writes.
+    """
+
+    def db_for_read(self, model, **hints):
+        replicas = read_replicas()
+        if (not replicas or _read_primary.get()
+                or connections[DEFAULT_DB_ALIAS].in_atomic_block):
+            return DEFAULT_DB_ALIAS
+        return random.choice(replicas)
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replicas hold copies of the same rows
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        # The replicas get the schema with the data from sync_replica
+        return False if db in read_replicas() else None
+
+
+class ReplicaRoutingMiddleware:
+    """
+    Reads from the default database during requests that write and
+    during the following INVENTORY_REPLICA_STICKY_SECONDS of the same
+    client, tracked with a cookie holding the end of the window.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        if not read_replicas():
+            return self.get_response(request)
+        with self.routing(request):
+            response = self.get_response(request)
+        return self.stick(request, response)
+
+    async def __acall__(self, request):
+        if not read_replicas():
+            return await self.get_response(request)
+        with self.routing(request):
+            response = await self.get_response(request)
+        return self.stick(request, response)
+
+    @property
+    def sticky_seconds(self) -> int:
+        return getattr(settings, 'INVENTORY_REPLICA_STICKY_SECONDS', 10)
+
+    def pinned(self, request) -> bool:
+        """
+        Returns whether the request must read from the default database.
+        """
+        if request.method not in SAFE_METHODS:
+            return True
+        try:
+            until = float(request.COOKIES.get(STICKY_COOKIE, 0))
+        except ValueError:
+            return False
+        # A window longer than the setting was not set by stick()
+        now = time.time()
+        return now < until <= now + self.sticky_seconds + 1
+
+    @contextmanager
+    def routing(self, request):
+        if self.pinned(request):
+            with reads_from_primary():
+                yield
+        else:
+            yield
+
+    def stick(self, request, response):
+        """
+        Starts the window of a client after a request that writes.
+        """
+        if request.method not in SAFE_METHODS:
+            response.set_cookie(
+                STICKY_COOKIE, f'{time.time() + self.sticky_seconds:.3f}',
+                max_age=self.sticky_seconds, httponly=True, samesite='Lax')
+        return response
+
+
+def copy_database(source, path: str, timeout: float = 5) -> int:
+    """
+    Copies the SQLite database of a connection into a file with the
+    online backup API, in one step so that readers of the file never
+    see a partial copy.
+
+    Args:
+        source: The Django connection to copy.
+        path (str): The file receiving the copy.
+        timeout (float): Seconds to wait for readers of the file.
+
+    Returns:
+        int: The number of copied pages.
+    """
+    source.ensure_connection()
+    destination = sqlite3.connect(path, timeout=timeout)
+    try:
+        source.connection.backup(destination)
+        return destination.execute('PRAGMA page_count').fetchone()[0]
+    finally:
+        destination.close()
+
+
+def sync_replica(alias: str) -> int:
+    """
+    Copies the default database into a read replica.
+
+    Args:
+        alias (str): The alias of the replica.
+
+    Returns:
+        int: The number of copied pages.
+
+    Raises:
+        ValueError: If the databases are not SQLite files.
+    """
+    source, target = connections[DEFAULT_DB_ALIAS], connections[alias]
+    if source.vendor != 'sqlite' or target.vendor != 'sqlite':
+        raise ValueError('Replicas can only be synced between SQLite files')
+    if target.settings_dict['NAME'] == source.settings_dict['NAME']:
+        # A test mirror, the replica is the default database itself
+        return 0
+    if target.is_in_memory_db():
+        raise ValueError(f"The replica '{alias}' is an in-memory database")
+    return copy_database(
+        source, target.settings_dict['NAME'],
+        target.settings_dict.get('OPTIONS', {}).get('timeout', 5))
@@ -0,0 +1,144 @@
+from decimal import Decimal
+from typing import List, Optional
+from django.db import connection
+from django.db.models import Q
+from .models import Item, Supplier
+
+FTS_TABLE = 'supplier_inventory_item_fts'
+ITEM_TABLE = Item._meta.db_table
+
+DROP_TRIGGERS_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+]
+
+INSTALL_SQL = DROP_TRIGGERS_SQL + [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description,
+        content='{ITEM_TABLE}',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3')""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ai AFTER INSERT ON {ITEM_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.rowid, new.name, new.description);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_ad AFTER DELETE ON {ITEM_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.rowid, old.name, old.description);
+    END""",
+    f"""CREATE TRIGGER {FTS_TABLE}_au
+    AFTER UPDATE OF name, description ON {ITEM_TABLE} BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.rowid, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.rowid, new.name, new.description);
+    END""",
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+
+def rebuild_search_index() -> None:
+    """
+    Recreates the FTS5 triggers and reindexes every item.
+
+    The index refers to items by rowid, which SQLite may renumber when
+    the item table is rebuilt by a migration or by VACUUM. Such
+    migrations must reinstall the index with a copy of INSTALL_SQL, or
+    this must run afterwards.
+    """
+    with connection.cursor() as cursor:
+        for sql in INSTALL_SQL:
+            cursor.execute(sql)
+
+
+def build_match_query(text: str) -> str:
+    """
+    Turns free text into an FTS5 query matching all words, the last one
+    as a prefix so that partially typed words match.
+
+    Args:
+        text (str): The search text.
+
+    Returns:
+        str: The FTS5 MATCH expression.
+
+    Raises:
+        ValueError: If the text holds no words.
+    """
+    words = text.split()
+    if not words:
+        raise ValueError('Please add a search query')
+    terms = ['"{}"'.format(word.replace('"', '""')) for word in words]
+    terms[-1] += '*'
+    return ' '.join(terms)
+
+
+def search_items(
+        text: str,
+        offset: int = 0,
+        limit: int = 100,
+        min_price: Optional[Decimal] = None,
+        max_price: Optional[Decimal] = None,
+        supplier_id=None) -> List[Item]:
+    """
+    Returns items matching the text, best matches first.
+
+    Args:
+        text (str): The search text, matched against name and description.
+        offset (int): The number of results to skip.
+        limit (int): The maximum number of results.
+        min_price (Decimal): Only items costing at least this much.
+        max_price (Decimal): Only items costing at most this much.
+        supplier_id: Only items supplied by this supplier.
+
+    Returns:
+        list: The matching items.
+
+    Raises:
+        ValueError: If the text holds no words.
+    """
+    match = build_match_query(text)
+    if connection.vendor != 'sqlite':
+        return fallback_search(
+            text, offset, limit, min_price, max_price, supplier_id)
+
+    where, params = [f'{FTS_TABLE} MATCH %s'], [match]
+    if min_price is not None:
+        where.append('item.price >= %s')
+        params.append(min_price)
+    if max_price is not None:
+        where.append('item.price <= %s')
+        params.append(max_price)
+    if supplier_id is not None:
+        through = Supplier.items.through._meta.db_table
+        where.append(
+            f'item.id IN (SELECT item_id FROM {through} '
+            'WHERE supplier_id = %s)')
+        params.append(supplier_id.hex)
+
+    columns = ', '.join(
+        f'item.{field.column}' for field in Item._meta.concrete_fields)
+    sql = (
+        f'SELECT {columns} FROM {FTS_TABLE} '
+        f'JOIN {ITEM_TABLE} AS item ON item.rowid = {FTS_TABLE}.rowid '
+        f'WHERE {" AND ".join(where)} '
+        f'ORDER BY {FTS_TABLE}.rank LIMIT %s OFFSET %s')
+    return list(Item.objects.raw(sql, params + [limit, offset]))
+
+
+def fallback_search(text, offset, limit, min_price, max_price, supplier_id):
+    """
+    Substring search used on databases without FTS5.
+    """
+    items = Item.objects.all()
+    for word in text.split():
+        items = items.filter(
+            Q(name__icontains=word) | Q(description__icontains=word))
+    if min_price is not None:
+        items = items.filter(price__gte=min_price)
+    if max_price is not None:
+        items = items.filter(price__lte=max_price)
+    if supplier_id is not None:
+        items = items.filter(suppliers=supplier_id)
+    return list(items.order_by('name', 'id')[offset:offset + limit])
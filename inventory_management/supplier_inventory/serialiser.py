@@ -9,7 +9,9 @@ class ItemSerialiser(serializers.ModelSerializer):
 
     class Meta:
         model = Item
-        fields = '__all__'
+        fields = [
+            'id', 'created_at', 'name', 'description', 'price',
+            'supplier_count']
 
 
 class SupplierSerialiser(serializers.ModelSerializer):
@@ -18,4 +20,34 @@ class SupplierSerialiser(serializers.ModelSerializer):
 
     class Meta:
         model = Supplier
-        fields = ['id', 'name', 'phone_number', 'email', 'items']
+        fields = [
+            'id', 'name', 'phone_number', 'email', 'item_count',
+            'min_item_price', 'max_item_price', 'avg_item_price', 'items']
+
+
+class SupplierSummarySerialiser(serializers.ModelSerializer):
+    id = serializers.UUIDField(read_only=True)
+
+    class Meta:
+        model = Supplier
+        fields = [
+            'id', 'name', 'phone_number', 'email', 'item_count',
+            'min_item_price', 'max_item_price', 'avg_item_price']
+
+
+class ItemSupplierSerialiser(serializers.ModelSerializer):
+    id = serializers.UUIDField(read_only=True)
+
+    class Meta:
+        model = Supplier
+        fields = ['id', 'name', 'phone_number']
+
+
+class ItemWithSuppliersSerialiser(ItemSerialiser):
+    suppliers = ItemSupplierSerialiser(many=True, read_only=True)
+
+    class Meta:
+        model = Item
+        fields = [
+            'id', 'created_at', 'name', 'description', 'price',
+            'supplier_count', 'suppliers']
@@ -0,0 +1,241 @@
+from typing import Dict, Iterable
+from django.db import transaction
+from django.db.models.signals import (
+    m2m_changed, post_delete, post_save, pre_delete)
+from django.dispatch import Signal, receiver
+from django.utils import timezone
+from .aggregates import aggregates, drifted_ids
+from .changes import record_deletions
+from .cache import item_key, response_cache, supplier_key
+from .models import Item, Supplier
+from .utils import chunked, query_chunk_size
+
+Link = Supplier.items.through
+
+# Sent once the transaction commits with the model as sender, an action
+# and the IDs of the items or suppliers it applies to, by every write
+# path including the set based ones that send no model signal. The live
+# change stream listens to it, see events.py.
+objects_changed = Signal()
+
+CREATED, UPDATED, DELETED = 'created', 'updated', 'deleted'
+
+
+def linked_ids(column: str, target: str, ids: Iterable) -> set:
+    """
+    Returns the IDs on the other side of the Supplier.items through table.
+
+    Args:
+        column (str): The column the given IDs belong to.
+        target (str): The column to return.
+        ids (Iterable): The IDs to look up.
+
+    Returns:
+        set: The linked IDs.
+    """
+    linked = set()
+    for chunk in chunked(ids, query_chunk_size()):
+        linked.update(
+            Link.objects.filter(
+                **{f'{column}__in': chunk}).values_list(target, flat=True))
+    return linked
+
+
+def send_changed(model, action: str, ids: Iterable) -> None:
+    """
+    Sends objects_changed for the given rows when the transaction
+    commits, nothing if no one listens.
+
+    Args:
+        model (Model): Item or Supplier.
+        action (str): CREATED, UPDATED or DELETED.
+        ids (Iterable): The IDs of the rows, a collection.
+    """
+    if not objects_changed.has_listeners(model):
+        return
+    ids = list(ids)
+    if ids:
+        transaction.on_commit(lambda: objects_changed.send(
+            sender=model, action=action, ids=ids))
+
+
+def drop_cached(keys: Iterable) -> None:
+    """
+    Drops cached payloads now and again once the transaction commits.
+    Until then a concurrent read still finds the old rows and may cache
+    them again, to be served until they expire. The local tiers of other
+    workers keep their copies up to INVENTORY_CACHE_LOCAL_TTL seconds.
+
+    Args:
+        keys (Iterable): The response cache keys.
+    """
+    keys = list(keys)
+    if not keys:
+        return
+    response_cache.delete_many(keys)
+    if transaction.get_connection().in_atomic_block:
+        transaction.on_commit(lambda: response_cache.delete_many(keys))
+
+
+def touch(model, ids: Iterable) -> None:
+    """
+    Bumps the updated_at of the given rows, which changes their ETag,
+    and recomputes their aggregates in the same UPDATE. Rows are touched
+    when related rows or links change, which is when their aggregates
+    change.
+    """
+    now = timezone.now()
+    for chunk in chunked(ids, query_chunk_size() - 1):
+        model.objects.filter(id__in=chunk).update(
+            updated_at=now, **aggregates(model))
+    send_changed(model, UPDATED, ids)
+
+
+def items_changed(
+        item_ids: Iterable,
+        supplier_ids: Iterable = None,
+        action: str = UPDATED) -> None:
+    """
+    Records that items changed: the suppliers embedding them get a new
+    version and the cached payloads of both are dropped. The items
+    themselves are expected to carry their new updated_at already.
+
+    Args:
+        item_ids (Iterable): The IDs of the changed items.
+        supplier_ids (Iterable): The IDs of their suppliers if already
+            known, otherwise they are looked up.
+        action (str): What happened to the items, for objects_changed.
+    """
+    item_ids = set(item_ids)
+    send_changed(Item, action, item_ids)
+    if supplier_ids is None:
+        supplier_ids = linked_ids('item_id', 'supplier_id', item_ids)
+    supplier_ids = set(supplier_ids)
+    touch(Supplier, supplier_ids)
+    drop_cached(
+        [item_key(pk) for pk in item_ids]
+        + [supplier_key(pk) for pk in supplier_ids])
+
+
+def suppliers_changed(
+        supplier_ids: Iterable,
+        item_ids: Iterable = None,
+        action: str = UPDATED) -> None:
+    """
+    Records that suppliers changed: the items embedding them get a new
+    version and the cached payloads of both are dropped. The suppliers
+    themselves are expected to carry their new updated_at already.
+
+    Args:
+        supplier_ids (Iterable): The IDs of the changed suppliers.
+        item_ids (Iterable): The IDs of their items if already known,
+            otherwise they are looked up.
+        action (str): What happened to the suppliers, for
+            objects_changed.
+    """
+    supplier_ids = set(supplier_ids)
+    send_changed(Supplier, action, supplier_ids)
+    if item_ids is None:
+        item_ids = linked_ids('supplier_id', 'item_id', supplier_ids)
+    item_ids = set(item_ids)
+    touch(Item, item_ids)
+    drop_cached(
+        [supplier_key(pk) for pk in supplier_ids]
+        + [item_key(pk) for pk in item_ids])
+
+
+def links_changed(supplier_ids: Iterable, item_ids: Iterable) -> None:
+    """
+    Records that Supplier.items links were added or removed: both sides
+    get a new version and their cached payloads are dropped.
+    """
+    supplier_ids, item_ids = set(supplier_ids), set(item_ids)
+    touch(Supplier, supplier_ids)
+    touch(Item, item_ids)
+    drop_cached(
+        [supplier_key(pk) for pk in supplier_ids]
+        + [item_key(pk) for pk in item_ids])
+
+
+def repair_aggregates() -> Dict[str, int]:
+    """
+    Recomputes the aggregates of the items and suppliers whose stored
+    values are wrong, such as rows written outside the app. They are
+    recorded as changed like any other change, with the suppliers
+    embedding the repaired items.
+
+    Returns:
+        dict: The number of repaired items and suppliers.
+    """
+    with transaction.atomic():
+        item_ids, supplier_ids = drifted_ids(Item), drifted_ids(Supplier)
+        touch(Item, item_ids)
+        items_changed(item_ids)
+        touch(Supplier, supplier_ids)
+        drop_cached([supplier_key(pk) for pk in supplier_ids])
+    return {'items': len(item_ids), 'suppliers': len(supplier_ids)}
+
+
+@receiver(post_save, sender=Item)
+def item_saved(sender, instance, created, **kwargs):
+    if created:
+        drop_cached([item_key(instance.pk)])
+        send_changed(Item, CREATED, [instance.pk])
+    else:
+        items_changed([instance.pk])
+
+
+@receiver(post_save, sender=Supplier)
+def supplier_saved(sender, instance, created, **kwargs):
+    if created:
+        drop_cached([supplier_key(instance.pk)])
+        send_changed(Supplier, CREATED, [instance.pk])
+    else:
+        suppliers_changed([instance.pk])
+
+
+@receiver(pre_delete, sender=Item)
+def item_deleting(sender, instance, **kwargs):
+    # The links are gone by post_delete, remember them while they exist
+    instance._linked_ids = linked_ids('item_id', 'supplier_id', [instance.pk])
+
+
+@receiver(pre_delete, sender=Supplier)
+def supplier_deleting(sender, instance, **kwargs):
+    instance._linked_ids = linked_ids('supplier_id', 'item_id', [instance.pk])
+
+
+@receiver(post_delete, sender=Item)
+def item_deleted(sender, instance, **kwargs):
+    record_deletions(Item, [instance.pk])
+    items_changed(
+        [instance.pk], getattr(instance, '_linked_ids', None), DELETED)
+
+
+@receiver(post_delete, sender=Supplier)
+def supplier_deleted(sender, instance, **kwargs):
+    record_deletions(Supplier, [instance.pk])
+    suppliers_changed(
+        [instance.pk], getattr(instance, '_linked_ids', None), DELETED)
+
+
+@receiver(m2m_changed, sender=Link)
+def links_updated(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Records changes of Supplier.items links, made from either
+    supplier.items or item.suppliers.
+    """
+    column, target = (
+        ('item_id', 'supplier_id') if reverse else ('supplier_id', 'item_id'))
+    if action == 'pre_clear':
+        instance._cleared_ids = linked_ids(column, target, [instance.pk])
+        return
+    if action == 'post_clear':
+        pk_set = getattr(instance, '_cleared_ids', set())
+    elif action not in ('post_add', 'post_remove'):
+        return
+
+    if reverse:
+        links_changed(pk_set, [instance.pk])
+    else:
+        links_changed([instance.pk], pk_set)
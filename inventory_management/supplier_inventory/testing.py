@@ -0,0 +1,106 @@
+from contextlib import ContextDecorator, ExitStack
+from typing import Any, Dict, List, Optional
+from unittest import mock
+from django.db import DEFAULT_DB_ALIAS, connections
+from django.db.backends.utils import CursorWrapper
+
+# Test helpers declaring how much database work code may do.
+
+
+class QueryBudget(ContextDecorator):
+    """
+    Fails when the code inside runs more SQL statements or fetches more
+    rows than allowed, listing every statement with the rows it
+    returned. Usable as a context manager or a decorator:
+
+        with query_budget(queries=3, rows=101):
+            client.get(url)
+
+    Rows are counted as the cursors of the database hand them to Django,
+    so rows read and thrown away are counted too.
+
+    Args:
+        queries (int): The most statements allowed.
+        rows (int): The most rows fetched allowed, unchecked if None.
+        using (str): The alias of the database to watch.
+    """
+
+    def __init__(
+            self, queries: int, rows: Optional[int] = None,
+            using: str = DEFAULT_DB_ALIAS):
+        self.max_queries = queries
+        self.max_rows = rows
+        self.using = using
+
+    def __enter__(self):
+        self.statements: List[Dict[str, Any]] = []
+        self.cursors: Dict[int, Dict[str, Any]] = {}
+        self.stack = ExitStack()
+        connection = connections[self.using]
+        self.stack.enter_context(connection.execute_wrapper(self.record))
+        for name in ('fetchone', 'fetchmany', 'fetchall'):
+            self.stack.enter_context(mock.patch.object(
+                CursorWrapper, name, self.counting(name), create=True))
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.stack.close()
+        if exc_type is None:
+            self.check()
+        return False
+
+    @property
+    def queries(self) -> int:
+        return len(self.statements)
+
+    @property
+    def rows(self) -> int:
+        return sum(statement['rows'] for statement in self.statements)
+
+    def record(self, execute, sql, params, many, context):
+        cursor = context['cursor']
+        result = execute(sql, params, many, context)
+        statement = {'sql': sql, 'params': params, 'rows': 0}
+        if not many:
+            statement['sql'] = context['connection'].ops.last_executed_query(
+                cursor.cursor, sql, params)
+        self.statements.append(statement)
+        # The rows are fetched later from the same cursor
+        self.cursors[id(cursor.cursor)] = statement
+        return result
+
+    def counting(self, name: str):
+        budget = self
+
+        def fetch(cursor, *args):
+            rows = getattr(cursor.cursor, name)(*args)
+            statement = budget.cursors.get(id(cursor.cursor))
+            if statement is not None:
+                if name == 'fetchone':
+                    statement['rows'] += rows is not None
+                else:
+                    statement['rows'] += len(rows)
+            return rows
+        return fetch
+
+    def check(self) -> None:
+        """
+        Raises AssertionError if a budget was exceeded.
+        """
+        exceeded = []
+        if self.queries > self.max_queries:
+            exceeded.append(
+                f'{self.queries} queries, budget {self.max_queries}')
+        if self.max_rows is not None and self.rows > self.max_rows:
+            exceeded.append(f'{self.rows} rows, budget {self.max_rows}')
+        if exceeded:
+            raise AssertionError(
+                f"Query budget exceeded: {'; '.join(exceeded)}\n"
+                + '\n'.join(
+                    f"{number}. {statement['rows']} rows: "
+                    f"{statement['sql']}"
+                    for number, statement in enumerate(
+                        self.statements, start=1)))
+
+
+query_budget = QueryBudget
@@ -0,0 +1,236 @@
+import io
+from decimal import Decimal
+from django.core.management import call_command
+from django.db.models import Avg, Count, Max, Min
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from supplier_inventory.cache import response_cache, supplier_key
+from supplier_inventory.deleter import delete_objects
+from supplier_inventory.generator import generate_inventory
+from supplier_inventory.models import Item, Supplier
+from supplier_inventory.updater import ItemUpdater
+
+
+class AggregateTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        response_cache.clear()
+        self.supplier1 = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890")
+        self.supplier2 = Supplier.objects.create(
+            name="Supplier2", phone_number="0987654321")
+        self.item1 = Item.objects.create(
+            name="Item1", description="Description1", price=100)
+        self.item2 = Item.objects.create(
+            name="Item2", description="Description2", price=250)
+        self.item1.suppliers.add(self.supplier1, self.supplier2)
+        self.item2.suppliers.add(self.supplier1)
+
+    def assertAggregatesMatch(self):
+        """
+        Compares the stored aggregates with the ones counted over the
+        whole join.
+        """
+        for item in Item.objects.annotate(count=Count('suppliers')):
+            self.assertEqual(item.supplier_count, item.count, item.name)
+        for supplier in Supplier.objects.annotate(
+                count=Count('items'), low=Min('items__price'),
+                high=Max('items__price'), average=Avg('items__price')):
+            average = supplier.average
+            if average is not None:
+                average = Decimal(average).quantize(Decimal('0.01'))
+            self.assertEqual(
+                (supplier.item_count, supplier.min_item_price,
+                 supplier.max_item_price, supplier.avg_item_price),
+                (supplier.count, supplier.low, supplier.high, average),
+                supplier.name)
+
+    def test_links(self):
+        self.assertAggregatesMatch()
+        supplier = Supplier.objects.get(id=self.supplier1.id)
+        self.assertEqual(
+            (supplier.item_count, supplier.min_item_price,
+             supplier.max_item_price, supplier.avg_item_price),
+            (2, Decimal('100.00'), Decimal('250.00'), Decimal('175.00')))
+        self.supplier1.items.remove(self.item1)
+        self.assertAggregatesMatch()
+        self.item1.suppliers.clear()
+        self.assertAggregatesMatch()
+        self.supplier2.items.add(self.item1, self.item2)
+        self.assertAggregatesMatch()
+
+    def test_price_change(self):
+        self.item1.price = 10
+        self.item1.save()
+        self.assertAggregatesMatch()
+        self.assertEqual(
+            Supplier.objects.get(id=self.supplier2.id).max_item_price, 10)
+
+    def test_save_keeps_aggregates(self):
+        stale = Supplier.objects.get(id=self.supplier2.id)
+        self.supplier2.items.add(self.item2)
+        stale.name = 'Renamed'
+        stale.save()
+        self.assertEqual(Supplier.objects.get(id=stale.id).item_count, 2)
+
+    def test_orm_delete(self):
+        self.item2.delete()
+        self.assertAggregatesMatch()
+        self.supplier1.delete()
+        self.assertAggregatesMatch()
+        self.assertEqual(
+            Item.objects.get(id=self.item1.id).supplier_count, 1)
+
+    def test_set_based_delete(self):
+        delete_objects(Item, [self.item1.id])
+        self.assertAggregatesMatch()
+        delete_objects(Supplier, [self.supplier1.id])
+        self.assertAggregatesMatch()
+        self.assertEqual(Item.objects.get(id=self.item2.id).supplier_count, 0)
+
+    def test_api_writes(self):
+        response = self.client.post(reverse('add_item'), {
+            "name": "bike", "description": "bajaj", "price": 40,
+            "suppliers": [str(self.supplier2.id)]}, format='json')
+        self.assertEqual(response.status_code, 201)
+        response = self.client.post(reverse('add_supplier'), {
+            "name": "New Supplier", "phone_number": "1234567890",
+            "items": [str(self.item1.id), str(self.item2.id)]},
+            format='json')
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['item_count'], 2)
+        self.assertEqual(response.data['avg_item_price'], '175.00')
+        self.assertEqual(
+            [item['supplier_count'] for item in response.data['items']],
+            [3, 2])
+        self.assertAggregatesMatch()
+
+        response = self.client.put(
+            reverse('update_supplier', args=[self.supplier2.id]),
+            {'items': [str(self.item2.id)]}, format='json')
+        self.assertEqual(response.data['item_count'], 3)
+        self.assertAggregatesMatch()
+
+        self.client.post(
+            reverse('import_items'),
+            data=f'{{"name": "lamp", "description": "desk", "price": 5, '
+                 f'"suppliers": ["{self.supplier1.id}"]}}\n',
+            content_type='application/x-ndjson')
+        self.assertAggregatesMatch()
+
+    def test_bulk_update(self):
+        ItemUpdater().run([
+            {'id': str(self.item2.id), 'price': 300,
+             'suppliers': [str(self.supplier2.id)]}])
+        self.assertAggregatesMatch()
+        self.assertEqual(Item.objects.get(id=self.item2.id).supplier_count, 2)
+
+    def test_generator(self):
+        generate_inventory(100, 7, density=2.5, seed=1)
+        self.assertAggregatesMatch()
+
+    def test_repair(self):
+        self.client.get(
+            reverse('view_suppliers'), {'supplier_id': self.supplier1.id})
+        updated_at = Supplier.objects.get(id=self.supplier2.id).updated_at
+        Item.objects.filter(id=self.item2.id).update(supplier_count=9)
+        Supplier.objects.filter(id=self.supplier1.id).update(
+            item_count=0, min_item_price=None)
+        out = io.StringIO()
+        call_command('repair_aggregates', stdout=out)
+        self.assertTrue(
+            out.getvalue().startswith('Repaired 1 items and 1 suppliers'))
+        self.assertAggregatesMatch()
+        self.assertIsNone(response_cache.get(supplier_key(self.supplier1.id)))
+        # Supplier2 does not embed the repaired item
+        self.assertEqual(
+            Supplier.objects.get(id=self.supplier2.id).updated_at, updated_at)
+        call_command('repair_aggregates', stdout=out)
+        self.assertIn('Repaired 0 items and 0 suppliers', out.getvalue())
+
+
+class OrderingTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.items = [
+            Item.objects.create(
+                name=f"Item{i}", description="Description", price=10 * i + 10)
+            for i in range(5)]
+        self.suppliers = [
+            Supplier.objects.create(
+                name=f"Supplier{i}", phone_number="1234567890")
+            for i in range(4)]
+        # Supplier0 carries no item, its prices are null
+        for supplier, items in zip(self.suppliers, (
+                [], self.items[:3], [self.items[3]],
+                [self.items[1], self.items[4]])):
+            supplier.items.add(*items)
+
+    def read_all(self, url, **params):
+        rows, cursor = [], None
+        while True:
+            query = dict(params, cursor=cursor) if cursor else params
+            response = self.client.get(url, query)
+            self.assertEqual(response.status_code, 200, response.data)
+            rows.extend(response.data)
+            cursor = response.headers.get('X-Next-Cursor')
+            if not cursor:
+                return rows
+
+    def names(self, url, **params):
+        return [row['name'] for row in self.read_all(url, **params)]
+
+    def test_items_by_supplier_count(self):
+        url = reverse('view_items')
+        for ordering, counts in (
+                ('-supplier_count', [2, 1, 1, 1, 1]),
+                ('supplier_count', [1, 1, 1, 1, 2])):
+            rows = self.read_all(url, ordering=ordering, page_size=2)
+            self.assertEqual([row['supplier_count'] for row in rows], counts)
+            self.assertEqual(len({row['id'] for row in rows}), 5)
+        self.assertEqual(self.names(url, min_suppliers=2), ['Item1'])
+        self.assertEqual(
+            self.names(url, max_suppliers=1),
+            ['Item0', 'Item2', 'Item3', 'Item4'])
+
+    def test_suppliers_by_price_with_nulls(self):
+        url = reverse('view_suppliers')
+        for ordering, expected in (
+                ('min_item_price',
+                 ['Supplier0', 'Supplier1', 'Supplier3', 'Supplier2']),
+                ('-max_item_price',
+                 ['Supplier3', 'Supplier2', 'Supplier1', 'Supplier0']),
+                ('-avg_item_price',
+                 ['Supplier2', 'Supplier3', 'Supplier1', 'Supplier0'])):
+            for page_size in (1, 2, 10):
+                self.assertEqual(
+                    self.names(url, ordering=ordering, page_size=page_size),
+                    expected, (ordering, page_size))
+
+    def test_supplier_filters(self):
+        url = reverse('view_suppliers')
+        self.assertEqual(
+            self.names(url, min_items=2, ordering='-item_count'),
+            ['Supplier1', 'Supplier3'])
+        self.assertEqual(
+            self.names(url, min_price=20, max_price=45), ['Supplier2'])
+        response = self.client.get(
+            reverse('async_view_suppliers'),
+            {'ordering': '-item_count', 'max_items': 2})
+        self.assertEqual(
+            [row['name'] for row in response.json()],
+            ['Supplier3', 'Supplier2', 'Supplier0'])
+
+    def test_invalid(self):
+        response = self.client.get(
+            reverse('view_items'), {'ordering': 'price'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.data['error'],
+            "Invalid ordering 'price', use created_at, supplier_count")
+        response = self.client.get(
+            reverse('view_suppliers'), {'min_items': 'many'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,121 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from supplier_inventory.models import Item, Supplier
+
+
+class AsyncViewTests(TestCase):
+
+    def setUp(self):
+        self.supplier1 = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890")
+        self.item1 = Item.objects.create(
+            name="Item1", description="Description1", price=100)
+        self.item2 = Item.objects.create(
+            name="Item2", description="Description2", price=200)
+        self.item1.suppliers.add(self.supplier1)
+
+    async def test_item_list(self):
+        response = await self.async_client.get(
+            reverse('async_view_items'), {'page_size': 1})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json()[0]['name'], 'Item1')
+        self.assertEqual(response.json()[0]['price'], '100.00')
+        self.assertIn('X-Next-Cursor', response.headers)
+
+    async def test_item_list_expand(self):
+        response = await self.async_client.get(
+            reverse('async_view_items'), {'expand': 'suppliers'})
+        self.assertEqual(
+            response.json()[0]['suppliers'][0]['name'], 'Supplier1')
+
+    async def test_item_detail_matches_sync_view(self):
+        url = reverse('async_view_items')
+        response = await self.async_client.get(
+            url, {'item_id': self.item1.id})
+        sync_response = await self.async_client.get(
+            reverse('view_items'), {'item_id': self.item1.id})
+        self.assertEqual(response.json(), sync_response.json())
+        self.assertEqual(response['ETag'], sync_response['ETag'])
+
+    async def test_item_detail_not_modified(self):
+        url = reverse('async_view_items')
+        response = await self.async_client.get(
+            url, {'item_id': self.item1.id})
+        response = await self.async_client.get(
+            url, {'item_id': self.item1.id},
+            headers={'If-None-Match': response['ETag']})
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    async def test_item_not_found(self):
+        response = await self.async_client.get(
+            reverse('async_view_items'),
+            {'item_id': '8057b527-d7b2-4074-8f9a-65a5bdba0d28'})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    async def test_invalid_item_id(self):
+        response = await self.async_client.get(
+            reverse('async_view_items'), {'item_id': '0000'})
+        self.assertEqual(response.status_code, 400)
+
+    async def test_supplier_detail_matches_sync_view(self):
+        response = await self.async_client.get(
+            reverse('async_view_suppliers'),
+            {'supplier_id': self.supplier1.id})
+        sync_response = await self.async_client.get(
+            reverse('view_suppliers'), {'supplier_id': self.supplier1.id})
+        self.assertEqual(response.json(), sync_response.json())
+
+    async def test_supplier_list_expand(self):
+        response = await self.async_client.get(
+            reverse('async_view_suppliers'), {'expand': 'items'})
+        self.assertEqual(response.json()[0]['items'][0]['name'], 'Item1')
+
+    async def test_only_get(self):
+        response = await self.async_client.post(reverse('async_view_items'))
+        self.assertEqual(
+            response.status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
+
+    async def assert_matches_sync_view(self, name, params):
+        response = await self.async_client.get(
+            reverse(f'async_{name}'), params)
+        sync_response = await self.async_client.get(reverse(name), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), sync_response.json())
+        return response.json()
+
+    async def test_lists_match_sync_views(self):
+        for name, params in (
+                ('view_items', {}),
+                ('view_items',
+                 {'expand': 'suppliers', 'ordering': '-supplier_count'}),
+                ('view_suppliers', {}),
+                ('view_suppliers',
+                 {'expand': 'items', 'ordering': '-avg_item_price'})):
+            with self.subTest(name=name, params=params):
+                await self.assert_matches_sync_view(name, params)
+
+    async def test_fields(self):
+        items = await self.assert_matches_sync_view(
+            'view_items', {'fields': 'id,name'})
+        self.assertEqual(
+            items, [{'id': str(self.item1.id), 'name': 'Item1'},
+                    {'id': str(self.item2.id), 'name': 'Item2'}])
+        items = await self.assert_matches_sync_view(
+            'view_items', {'expand': 'suppliers', 'fields': 'name,suppliers'})
+        self.assertEqual(items[0]['suppliers'][0]['name'], 'Supplier1')
+        item = await self.assert_matches_sync_view(
+            'view_items', {'item_id': self.item1.id, 'fields': 'price'})
+        self.assertEqual(item['item'], {'price': '100.00'})
+        supplier = await self.assert_matches_sync_view(
+            'view_suppliers',
+            {'supplier_id': self.supplier1.id, 'fields': 'name'})
+        self.assertEqual(supplier, {'name': 'Supplier1'})
+
+    async def test_invalid_fields(self):
+        for params in ({'fields': 'id,colour'},
+                       {'fields': ','},
+                       {'item_id': self.item1.id, 'fields': 'suppliers'}):
+            response = await self.async_client.get(
+                reverse('async_view_items'), params)
+            self.assertEqual(response.status_code, 400, params)
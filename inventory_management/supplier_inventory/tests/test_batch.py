@@ -0,0 +1,88 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from supplier_inventory.cache import response_cache
+from supplier_inventory.models import Item, Supplier
+
+MISSING_ID = '8057b527-d7b2-4074-8f9a-65a5bdba0d28'
+
+
+class BatchLookupTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        response_cache.clear()
+        self.supplier1 = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890")
+        self.supplier2 = Supplier.objects.create(
+            name="Supplier2", phone_number="0987654321")
+        self.item1 = Item.objects.create(
+            name="Item1", description="Description1", price=100)
+        self.item2 = Item.objects.create(
+            name="Item2", description="Description2", price=200)
+        self.item1.suppliers.add(self.supplier1, self.supplier2)
+
+    def detail(self, name, **params):
+        return self.client.get(reverse(name), params).data
+
+    def test_items_by_query_string(self):
+        ids = f'{self.item1.id},{self.item2.id},{MISSING_ID},abc'
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                reverse('view_items_batch'), {'ids': ids})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['found'], 2)
+        results = response.data['results']
+        self.assertEqual(
+            list(results),
+            [str(self.item1.id), str(self.item2.id), MISSING_ID, 'abc'])
+        for item in (self.item1, self.item2):
+            detail = self.detail('view_items', item_id=item.id)
+            result = results[str(item.id)]
+            self.assertEqual(result['item'], detail['item'])
+            self.assertCountEqual(result['suppliers'], detail['suppliers'])
+        self.assertEqual(results[MISSING_ID], {'error': 'Item not found'})
+        self.assertEqual(results['abc'], {'error': 'Invalid Item ID'})
+
+    def test_suppliers_by_body(self):
+        response = self.client.post(
+            reverse('view_suppliers_batch'),
+            {'ids': [str(self.supplier1.id), MISSING_ID,
+                     str(self.supplier1.id)]},
+            format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        results = response.data['results']
+        self.assertEqual(len(results), 2)
+        self.assertEqual(
+            results[str(self.supplier1.id)],
+            self.detail('view_suppliers', supplier_id=self.supplier1.id))
+        self.assertEqual(results[MISSING_ID], {'error': 'Supplier not found'})
+
+    def test_body_list_and_fields(self):
+        response = self.client.post(
+            reverse('view_items_batch') + '?fields=name',
+            [str(self.item2.id)], format='json')
+        self.assertEqual(
+            response.data['results'][str(self.item2.id)],
+            {'item': {'name': 'Item2'}, 'suppliers': []})
+
+    def test_chunks_past_parameter_limit(self):
+        items = Item.objects.bulk_create(
+            Item(name=f'Item{n}', description='d', price=n)
+            for n in range(1000))
+        ids = ','.join(str(item.id) for item in items)
+        response = self.client.get(reverse('view_items_batch'), {'ids': ids})
+        self.assertEqual(response.data['found'], 1000)
+
+    def test_without_ids(self):
+        response = self.client.get(reverse('view_items_batch'))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'Please add the IDs')
+
+    def test_too_many_ids(self):
+        with self.settings(INVENTORY_BATCH_MAX_IDS=1):
+            response = self.client.get(
+                reverse('view_items_batch'),
+                {'ids': f'{self.item1.id},{self.item2.id}'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
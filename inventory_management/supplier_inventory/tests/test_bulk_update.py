@@ -0,0 +1,111 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from supplier_inventory.models import Item, Supplier
+
+
+class ItemBulkUpdateTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('update_items')
+        self.supplier1 = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890")
+        self.supplier2 = Supplier.objects.create(
+            name="Supplier2", phone_number="0987654321")
+        self.item1 = Item.objects.create(
+            name="Item1", description="Description1", price=100)
+        self.item2 = Item.objects.create(
+            name="Item2", description="Description2", price=200)
+        self.item1.suppliers.add(self.supplier1)
+
+    def patch(self, changes):
+        return self.client.patch(self.url, data=changes, format='json')
+
+    def test_bulk_update_touched_fields_only(self):
+        response = self.patch([
+            {'id': str(self.item1.id), 'price': '150.50'},
+            {'id': str(self.item2.id), 'name': 'Renamed', 'price': 5},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 2)
+        self.item1.refresh_from_db()
+        self.item2.refresh_from_db()
+        self.assertEqual(str(self.item1.price), '150.50')
+        self.assertEqual(self.item1.name, 'Item1')
+        self.assertEqual(self.item2.name, 'Renamed')
+        self.assertEqual(self.item2.description, 'Description2')
+
+    def test_bulk_update_links_suppliers(self):
+        response = self.patch([
+            {'id': str(self.item1.id),
+             'suppliers': [str(self.supplier1.id), str(self.supplier2.id)]},
+            {'id': str(self.item2.id), 'suppliers': [str(self.supplier2.id)]},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(self.item1.suppliers.count(), 2)
+        self.assertEqual(self.supplier2.items.count(), 2)
+
+    def test_bulk_update_reports_per_id_results(self):
+        missing = '8057b527-d7b2-4074-8f9a-65a5bdba0d28'
+        response = self.patch([
+            {'id': str(self.item1.id), 'price': 1},
+            {'id': missing, 'price': 1},
+            {'id': 'abc', 'price': 1},
+            {'id': str(self.item2.id), 'price': 'abc'},
+            {'id': str(self.item2.id), 'colour': 'red'},
+            {'id': str(self.item2.id), 'suppliers': [missing]},
+            {'id': str(self.item1.id), 'price': 2},
+            {'id': str(self.item2.id)},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['updated'], 1)
+        results = response.data['results']
+        self.assertEqual(
+            results[0], {'id': str(self.item1.id), 'status': 'updated'})
+        self.assertEqual(
+            [result.get('error') for result in results[1:]],
+            ['Item not found', 'Invalid item ID',
+             'price: “abc” value must be a decimal number.',
+             "Unknown field 'colour'", 'Some Supplier IDs do not exist',
+             'Duplicate item ID', 'Nothing to update'])
+        self.item1.refresh_from_db()
+        self.assertEqual(self.item1.price, 1)
+
+    def test_bulk_update_nothing_valid(self):
+        response = self.patch([{'id': str(self.item1.id), 'price': 'x'}])
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['updated'], 0)
+
+    def test_bulk_update_needs_a_list(self):
+        response = self.patch({'id': str(self.item1.id)})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data['error'], 'Please send a list of item changes')
+
+    def test_bulk_update_changes_versions(self):
+        supplier_version = self.supplier1.updated_at
+        item_version = self.item1.updated_at
+        self.patch([{'id': str(self.item1.id), 'price': 7}])
+        self.item1.refresh_from_db()
+        self.supplier1.refresh_from_db()
+        self.assertGreater(self.item1.updated_at, item_version)
+        self.assertGreater(self.supplier1.updated_at, supplier_version)
+
+    def test_bulk_update_query_count(self):
+        items = [
+            Item(name=f'Item{n}', description='d', price=n)
+            for n in range(50)]
+        Item.objects.bulk_create(items)
+        changes = [{'id': str(item.id), 'price': 1} for item in items]
+        changes += [
+            {'id': str(item.id), 'name': 'x', 'suppliers':
+             [str(self.supplier2.id)]} for item in (self.item1, self.item2)]
+        # existing items and suppliers, savepoint, one bulk_update for
+        # each of the two field sets, link insert, supplier counts of
+        # the linked items, linked suppliers, supplier version bump and
+        # savepoint release
+        with self.assertNumQueries(10):
+            response = self.patch(changes)
+        self.assertEqual(response.data['updated'], 52)
@@ -0,0 +1,181 @@
+from django.db import transaction
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from supplier_inventory.cache import (
+    ResponseCache, item_key, response_cache, supplier_key)
+from supplier_inventory.deleter import delete_objects
+from supplier_inventory.models import Item, Supplier
+
+
+class ResponseCacheTests(TestCase):
+
+    def setUp(self):
+        self.now = 0
+        self.cache = ResponseCache(
+            max_entries=2, ttl=10, clock=lambda: self.now)
+
+    def test_get_or_set_counts_hits_and_misses(self):
+        self.assertEqual(self.cache.get_or_set(('item', 1), lambda: 'a'), 'a')
+        self.assertEqual(self.cache.get_or_set(('item', 1), lambda: 'b'), 'a')
+        stats = self.cache.stats()
+        self.assertEqual((stats['hits'], stats['misses']), (1, 1))
+
+    def test_lru_eviction(self):
+        self.cache.set(('item', 1), 'a')
+        self.cache.set(('item', 2), 'b')
+        self.cache.get(('item', 1))
+        self.cache.set(('item', 3), 'c')
+        self.assertEqual(self.cache.stats()['evictions'], 1)
+        self.assertEqual(list(self.cache.entries), [('item', 1), ('item', 3)])
+
+    def test_expired_local_entry_falls_back_to_shared_tier(self):
+        self.cache.set(('item', 4), 'a')
+        self.now = 11
+        self.cache.shared.delete(self.cache.make_key(('item', 4)))
+        self.assertIsNone(self.cache.get(('item', 4)))
+
+    def test_delete_many_drops_both_tiers(self):
+        self.cache.set(('item', 5), 'a')
+        self.cache.delete_many([('item', 5)])
+        self.assertIsNone(self.cache.get(('item', 5)))
+
+    def test_other_workers_drop_local_entries_after_local_ttl(self):
+        other = ResponseCache(
+            max_entries=2, ttl=10, local_ttl=2, clock=lambda: self.now)
+        self.cache.set(('item', 7), 'a')
+        self.assertEqual(other.get(('item', 7)), 'a')
+        self.cache.delete_many([('item', 7)])
+        self.assertIsNone(self.cache.get(('item', 7)))
+        # The other worker still has its local copy
+        self.now = 1
+        self.assertEqual(other.get(('item', 7)), 'a')
+        self.now = 3
+        self.assertIsNone(other.get(('item', 7)))
+
+    def test_local_tier_off(self):
+        cache = ResponseCache(ttl=10, local_ttl=0)
+        cache.set(('item', 8), 'a')
+        self.assertEqual(cache.entries, {})
+        self.assertEqual(cache.get(('item', 8)), 'a')
+
+    def test_disabled(self):
+        cache = ResponseCache(ttl=0)
+        cache.set(('item', 6), 'a')
+        self.assertIsNone(cache.get(('item', 6)))
+
+
+class ViewCacheTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        response_cache.clear()
+        self.supplier1 = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890")
+        self.item1 = Item.objects.create(
+            name="Item1", description="Description1", price=100)
+        self.item1.suppliers.add(self.supplier1)
+
+    def get_item(self):
+        return self.client.get(
+            reverse('view_items'), {'item_id': self.item1.id})
+
+    def get_supplier(self):
+        return self.client.get(
+            reverse('view_suppliers'), {'supplier_id': self.supplier1.id})
+
+    def test_item_detail_served_from_cache(self):
+        self.get_item()
+        with self.assertNumQueries(0):
+            response = self.get_item()
+        self.assertEqual(response.data['item']['name'], 'Item1')
+        self.assertEqual(response_cache.stats()['hits'], 1)
+
+    def test_supplier_detail_served_from_cache(self):
+        self.get_supplier()
+        with self.assertNumQueries(0):
+            response = self.get_supplier()
+        self.assertEqual(len(response.data['items']), 1)
+
+    def test_item_update_invalidates_item_and_supplier(self):
+        self.get_item()
+        self.get_supplier()
+        self.client.put(
+            reverse('update_item', kwargs={'item_id': self.item1.id}),
+            data={'name': 'Renamed'}, format='json')
+        self.assertEqual(self.get_item().data['item']['name'], 'Renamed')
+        self.assertEqual(
+            self.get_supplier().data['items'][0]['name'], 'Renamed')
+
+    def test_supplier_update_invalidates_supplier_and_item(self):
+        self.get_item()
+        self.get_supplier()
+        self.supplier1.name = 'Renamed'
+        self.supplier1.save()
+        self.assertEqual(self.get_supplier().data['name'], 'Renamed')
+        self.assertEqual(
+            self.get_item().data['suppliers'][0]['name'], 'Renamed')
+
+    def test_link_changes_invalidate_both_sides(self):
+        supplier2 = Supplier.objects.create(
+            name="Supplier2", phone_number="0987654321")
+        self.get_item()
+        self.get_supplier()
+        supplier2.items.add(self.item1)
+        self.assertEqual(len(self.get_item().data['suppliers']), 2)
+        self.item1.suppliers.remove(self.supplier1)
+        self.assertEqual(len(self.get_item().data['suppliers']), 1)
+        self.assertEqual(self.get_supplier().data['items'], [])
+        self.item1.suppliers.clear()
+        self.assertEqual(self.get_item().data['suppliers'], [])
+
+    def test_item_delete_invalidates(self):
+        self.get_item()
+        self.get_supplier()
+        self.client.delete(
+            reverse('delete_item', kwargs={'item_id': self.item1.id}))
+        self.assertEqual(self.get_item().status_code, 404)
+        self.assertEqual(self.get_supplier().data['items'], [])
+
+    def write_while_read(self, write):
+        """
+        Runs the write in a transaction during which a concurrent read,
+        which sees the rows as they were before it, fills the cache.
+        """
+        self.get_item()
+        self.get_supplier()
+        keys = [item_key(self.item1.id), supplier_key(self.supplier1.id)]
+        cached = {key: response_cache.get(key) for key in keys}
+        with self.captureOnCommitCallbacks(execute=True):
+            with transaction.atomic():
+                write()
+                for key, entry in cached.items():
+                    response_cache.set(key, entry)
+
+    def test_update_drops_entries_cached_before_commit(self):
+        self.write_while_read(lambda: self.client.put(
+            reverse('update_item', kwargs={'item_id': self.item1.id}),
+            data={'name': 'Renamed'}, format='json'))
+        self.assertEqual(self.get_item().data['item']['name'], 'Renamed')
+        self.assertEqual(
+            self.get_supplier().data['items'][0]['name'], 'Renamed')
+
+    def test_create_drops_entries_cached_before_commit(self):
+        self.write_while_read(lambda: self.client.post(
+            reverse('add_item'), {
+                'name': 'Item2', 'description': 'Description2',
+                'price': 200, 'suppliers': [self.supplier1.id]},
+            format='json'))
+        self.assertEqual(len(self.get_supplier().data['items']), 2)
+
+    def test_bulk_delete_drops_entries_cached_before_commit(self):
+        self.write_while_read(lambda: delete_objects(Item, [self.item1.id]))
+        self.assertEqual(self.get_item().status_code, 404)
+        self.assertEqual(self.get_supplier().data['items'], [])
+
+    def test_cache_stats_endpoint(self):
+        self.get_item()
+        self.get_item()
+        response = self.client.get(reverse('cache_stats'))
+        self.assertEqual(response.data['hits'], 1)
+        self.assertEqual(response.data['misses'], 1)
@@ -0,0 +1,164 @@
+import io
+from datetime import timedelta
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from supplier_inventory.deleter import delete_objects
+from supplier_inventory.models import Item, Supplier, Tombstone
+from supplier_inventory.pagination import encode_cursor
+from supplier_inventory.testing import query_budget
+
+
+@override_settings(INVENTORY_CHANGES_LAG_SECONDS=0)
+class ChangeFeedTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.supplier1 = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890")
+        self.supplier2 = Supplier.objects.create(
+            name="Supplier2", phone_number="0987654321")
+        self.item1 = Item.objects.create(
+            name="Item1", description="Description1", price=100)
+        self.item2 = Item.objects.create(
+            name="Item2", description="Description2", price=200)
+        self.item1.suppliers.add(self.supplier1)
+
+    def sync(self, since=None, **params):
+        if since:
+            params['since'] = since
+        response = self.client.get(reverse('changes'), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return response.data
+
+    def actions(self, data):
+        return {(change['model'], change['id'], change['action'])
+                for change in data['changes']}
+
+    def test_first_sync(self):
+        data = self.sync()
+        self.assertFalse(data['more'])
+        self.assertEqual(self.actions(data), {
+            ('supplier', str(self.supplier1.id), 'created'),
+            ('supplier', str(self.supplier2.id), 'created'),
+            ('item', str(self.item1.id), 'created'),
+            ('item', str(self.item2.id), 'created')})
+        changed_at = [change['changed_at'] for change in data['changes']]
+        self.assertEqual(changed_at, sorted(changed_at))
+        item = next(change['data'] for change in data['changes']
+                    if change['id'] == str(self.item1.id))
+        self.assertEqual(item['price'], '100.00')
+        self.assertEqual(item['supplier_count'], 1)
+        self.assertEqual(
+            [supplier['id'] for supplier in item['suppliers']],
+            [str(self.supplier1.id)])
+
+    def test_nothing_new_costs_one_query(self):
+        cursor = self.sync()['cursor']
+        with query_budget(queries=1, rows=0):
+            data = self.sync(cursor)
+        self.assertEqual(
+            data, {'changes': [], 'cursor': cursor, 'more': False})
+
+    def test_changes_after_the_cursor(self):
+        cursor = self.sync()['cursor']
+        response = self.client.put(
+            reverse('update_item', args=[self.item2.id]), {'price': 250},
+            format='json')
+        self.assertEqual(response.status_code, 200)
+        self.supplier2.items.add(self.item1)
+        item3 = Item.objects.create(
+            name="Item3", description="Description3", price=300)
+        self.client.delete(
+            reverse('delete_supplier', args=[self.supplier1.id]))
+        data = self.sync(cursor)
+        self.assertEqual(self.actions(data), {
+            ('item', str(self.item1.id), 'updated'),
+            ('item', str(self.item2.id), 'updated'),
+            ('item', str(item3.id), 'created'),
+            ('supplier', str(self.supplier2.id), 'updated'),
+            ('supplier', str(self.supplier1.id), 'deleted')})
+        item1 = next(change for change in data['changes']
+                     if change['id'] == str(self.item1.id))
+        self.assertEqual(
+            [supplier['id'] for supplier in item1['data']['suppliers']],
+            [str(self.supplier2.id)])
+        deleted = next(change for change in data['changes']
+                       if change['action'] == 'deleted')
+        self.assertNotIn('data', deleted)
+        self.assertEqual(self.sync(data['cursor'])['changes'], [])
+
+    def test_deletions(self):
+        cursor = self.sync()['cursor']
+        item1, item2, supplier2 = (
+            str(self.item1.id), str(self.item2.id), str(self.supplier2.id))
+        self.item1.delete()
+        delete_objects(Item, [item2])
+        self.supplier2.delete()
+        self.assertEqual(
+            self.actions(self.sync(cursor)) - {
+                ('supplier', str(self.supplier1.id), 'updated')},
+            {('item', item1, 'deleted'), ('item', item2, 'deleted'),
+             ('supplier', supplier2, 'deleted')})
+
+    def test_pages(self):
+        full = self.sync()
+        changes, cursor = [], None
+        while True:
+            data = self.sync(cursor, page_size=1)
+            changes.extend(data['changes'])
+            cursor = data['cursor']
+            if not data['more']:
+                break
+        # Item1 was created before Supplier1 was last updated, it is an
+        # update for a cursor past Supplier1
+        for change in changes + full['changes']:
+            change.pop('action')
+        self.assertEqual(changes, full['changes'])
+        self.assertEqual(cursor, full['cursor'])
+
+    def test_same_timestamp(self):
+        # Rows written by one statement share their updated_at, the ID
+        # breaks the tie
+        now = timezone.now() - timedelta(seconds=1)
+        Item.objects.update(updated_at=now)
+        Supplier.objects.update(updated_at=now)
+        ids, cursor = [], None
+        while True:
+            data = self.sync(cursor, page_size=1)
+            ids.extend(change['id'] for change in data['changes'])
+            cursor = data['cursor']
+            if not data['more']:
+                break
+        self.assertEqual(len(ids), 4)
+        self.assertEqual(ids, sorted(ids))
+
+    @override_settings(INVENTORY_CHANGES_LAG_SECONDS=60)
+    def test_recent_changes_are_held_back(self):
+        self.assertEqual(self.sync()['changes'], [])
+
+    def test_invalid_cursor(self):
+        for since in ('garbage', encode_cursor(['yesterday', 'x']),
+                      encode_cursor([timezone.now()])):
+            response = self.client.get(reverse('changes'), {'since': since})
+            self.assertEqual(response.status_code, 400, since)
+        old = encode_cursor([
+            timezone.now() - timedelta(days=31), self.item1.id])
+        response = self.client.get(reverse('changes'), {'since': old})
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('older than 30 days', response.data['error'])
+
+    def test_purge_tombstones(self):
+        item1, item2 = self.item1.id, self.item2.id
+        self.item1.delete()
+        self.item2.delete()
+        Tombstone.objects.filter(object_id=item1).update(
+            deleted_at=timezone.now() - timedelta(days=40))
+        out = io.StringIO()
+        call_command('purge_tombstones', stdout=out)
+        self.assertEqual(out.getvalue().strip(), 'Deleted 1 tombstones')
+        self.assertEqual(
+            list(Tombstone.objects.values_list('object_id', flat=True)),
+            [item2])
@@ -0,0 +1,100 @@
+import uuid
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from supplier_inventory.models import Item, Supplier
+from supplier_inventory.utils import query_chunk_size
+from supplier_inventory.views import ApiMethodMixin
+
+MISSING_ID = '8057b527-d7b2-4074-8f9a-65a5bdba0d28'
+
+
+class MissingIdsTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.mixin = ApiMethodMixin()
+        self.supplier1 = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890")
+        self.supplier2 = Supplier.objects.create(
+            name="Supplier2", phone_number="0987654321")
+        self.item1 = Item.objects.create(
+            name="Item1", description="Description1", price=100)
+
+    def test_reports_every_missing_id_once(self):
+        ids = [str(self.supplier1.id), MISSING_ID, 'abc', MISSING_ID,
+               MISSING_ID.upper(), 'abc']
+        self.assertEqual(
+            self.mixin.missing_ids(ids, Supplier), [MISSING_ID, 'abc'])
+        self.assertFalse(self.mixin.check_ids(ids, Supplier))
+
+    def test_duplicates_of_existing_ids(self):
+        ids = [self.supplier1.id, str(self.supplier1.id),
+               str(self.supplier1.id).upper(), self.supplier2.id]
+        self.assertEqual(self.mixin.missing_ids(ids, Supplier), [])
+        self.assertTrue(self.mixin.check_ids(ids, Supplier))
+
+    def test_ids_given_as_string(self):
+        ids = f'{self.supplier1.id}, {MISSING_ID};{self.supplier2.id}'
+        self.assertEqual(
+            self.mixin.missing_ids(ids, Supplier), [MISSING_ID])
+
+    def test_more_ids_than_the_parameter_limit(self):
+        size = query_chunk_size()
+        ids = [str(uuid.uuid4()) for _ in range(size + 1)]
+        ids.append(str(self.supplier1.id))
+        with CaptureQueriesContext(connection) as context:
+            missing = self.mixin.missing_ids(ids, Supplier)
+        self.assertEqual(missing, ids[:-1])
+        self.assertEqual(len(context.captured_queries), 2)
+
+    def test_create_item_lists_missing_suppliers(self):
+        payload = {
+            "name": "bike", "description": "bajaj", "price": 23232,
+            "suppliers": [str(self.supplier1.id), MISSING_ID, 'abc']}
+        response = self.client.post(
+            reverse('add_item'), data=payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['missing_ids'], [MISSING_ID, 'abc'])
+        self.assertFalse(Item.objects.filter(name='bike').exists())
+
+    def test_create_item_with_duplicate_suppliers(self):
+        supplier_id = str(self.supplier1.id)
+        payload = {
+            "name": "bike", "description": "bajaj", "price": 23232,
+            "suppliers": [supplier_id, supplier_id.upper()]}
+        response = self.client.post(
+            reverse('add_item'), data=payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        item = Item.objects.get(name='bike')
+        self.assertEqual(list(item.suppliers.all()), [self.supplier1])
+
+    def test_create_supplier_lists_missing_items(self):
+        payload = {
+            "name": "New Supplier", "phone_number": "1234567890",
+            "items": [str(self.item1.id), MISSING_ID]}
+        response = self.client.post(
+            reverse('add_supplier'), data=payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data, {
+            'error': 'Some Item IDs do not exist',
+            'missing_ids': [MISSING_ID]})
+        self.assertFalse(
+            Supplier.objects.filter(name='New Supplier').exists())
+
+    def test_update_lists_missing_ids(self):
+        url = reverse('update_item', kwargs={'item_id': self.item1.id})
+        payload = {'suppliers': [MISSING_ID, str(self.supplier2.id)]}
+        response = self.client.put(url, data=payload, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['missing_ids'], [MISSING_ID])
+
+        url = reverse(
+            'update_supplier', kwargs={'supplier_id': self.supplier1.id})
+        response = self.client.put(
+            url, data={'items': ['abc']}, format='json')
+        self.assertEqual(response.data, {
+            'error': 'Some Item IDs do not exist', 'missing_ids': ['abc']})
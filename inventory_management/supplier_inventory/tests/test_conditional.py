@@ -0,0 +1,91 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from supplier_inventory.cache import response_cache
+from supplier_inventory.models import Item, Supplier
+
+
+class ConditionalGetTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        response_cache.clear()
+        self.supplier1 = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890")
+        self.item1 = Item.objects.create(
+            name="Item1", description="Description1", price=100)
+        self.item1.suppliers.add(self.supplier1)
+
+    def get_item(self, **headers):
+        return self.client.get(
+            reverse('view_items'), {'item_id': self.item1.id}, **headers)
+
+    def get_supplier(self, **headers):
+        return self.client.get(
+            reverse('view_suppliers'), {'supplier_id': self.supplier1.id},
+            **headers)
+
+    def test_item_if_none_match(self):
+        etag = self.get_item()['ETag']
+        response = self.get_item(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response.content, b'')
+
+    def test_item_if_modified_since(self):
+        last_modified = self.get_item()['Last-Modified']
+        response = self.get_item(HTTP_IF_MODIFIED_SINCE=last_modified)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_item_update_changes_etag(self):
+        etag = self.get_item()['ETag']
+        self.client.put(
+            reverse('update_item', kwargs={'item_id': self.item1.id}),
+            data={'price': 150}, format='json')
+        response = self.get_item(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_item_update_changes_supplier_etag(self):
+        etag = self.get_supplier()['ETag']
+        self.item1.name = 'Renamed'
+        self.item1.save()
+        response = self.get_supplier(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_link_change_changes_both_etags(self):
+        item_etag = self.get_item()['ETag']
+        supplier_etag = self.get_supplier()['ETag']
+        item2 = Item.objects.create(
+            name="Item2", description="Description2", price=200)
+        self.supplier1.items.add(item2)
+        self.assertEqual(
+            self.get_supplier(HTTP_IF_NONE_MATCH=supplier_etag).status_code,
+            status.HTTP_200_OK)
+        self.item1.suppliers.remove(self.supplier1)
+        self.assertEqual(
+            self.get_item(HTTP_IF_NONE_MATCH=item_etag).status_code,
+            status.HTTP_200_OK)
+
+    def test_supplier_if_none_match_from_cache(self):
+        etag = self.get_supplier()['ETag']
+        with self.assertNumQueries(0):
+            response = self.get_supplier(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_not_modified_without_cache_is_one_lookup(self):
+        etag = self.get_item()['ETag']
+        response_cache.clear()
+        response_cache.shared.clear()
+        with self.assertNumQueries(1):
+            response = self.get_item(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_conditional_get_of_missing_item(self):
+        self.get_item()
+        item_id = self.item1.id
+        self.item1.delete()
+        response = self.client.get(
+            reverse('view_items'), {'item_id': item_id},
+            HTTP_IF_NONE_MATCH='"x"')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
@@ -0,0 +1,95 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from supplier_inventory.models import Item, Supplier
+from supplier_inventory.serialiser import SupplierSerialiser
+
+
+class CreateTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.supplier1 = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890")
+        self.supplier2 = Supplier.objects.create(
+            name="Supplier2", phone_number="0987654321")
+        self.item1 = Item.objects.create(
+            name="Item1", description="Description1", price=100)
+        self.item2 = Item.objects.create(
+            name="Item2", description="Description2", price="200.50")
+
+    def post(self, name, payload):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.post(
+                reverse(name), data=payload, format='json')
+        # executemany is logged as "<n> times: <sql>"
+        statements = [
+            query['sql'].split(' times: ')[-1].split()[0]
+            for query in context.captured_queries]
+        return response, statements
+
+    def test_create_item(self):
+        updated_at = self.supplier1.updated_at
+        response, statements = self.post('add_item', {
+            "name": "bike", "description": "bajaj", "price": 23232,
+            "suppliers": [str(self.supplier1.id), str(self.supplier2.id)]})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # The check, the item, its links and the supplier versions, the
+        # savepoints standing for the transaction inside the test case
+        self.assertEqual(statements, [
+            'SELECT', 'SAVEPOINT', 'INSERT', 'INSERT', 'UPDATE', 'RELEASE'])
+
+        item = Item.objects.get(name='bike')
+        self.assertEqual(response.data['Item_id'], {item.id})
+        self.assertEqual(response.data['Item_info'], 'bike at 23232 ')
+        self.assertEqual(
+            set(item.suppliers.all()), {self.supplier1, self.supplier2})
+        self.supplier1.refresh_from_db()
+        self.assertGreater(self.supplier1.updated_at, updated_at)
+
+    def test_create_supplier_payload(self):
+        updated_at = self.item1.updated_at
+        response, statements = self.post('add_supplier', {
+            "name": "New Supplier", "phone_number": "1234567890",
+            "email": "new@example.com",
+            "items": [str(self.item2.id), str(self.item1.id)]})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        # Then the aggregates of the supplier, computed and read back
+        self.assertEqual(statements, [
+            'SELECT', 'SAVEPOINT', 'INSERT', 'INSERT', 'UPDATE', 'UPDATE',
+            'SELECT', 'RELEASE'])
+
+        supplier = Supplier.objects.get(name='New Supplier')
+        expected = SupplierSerialiser(supplier).data
+        expected['items'].sort(key=lambda item: item['name'], reverse=True)
+        self.assertEqual(response.json(), expected)
+        self.item1.refresh_from_db()
+        self.assertGreater(self.item1.updated_at, updated_at)
+
+    def test_create_supplier_without_items(self):
+        response, statements = self.post('add_supplier', {
+            "name": "New Supplier", "phone_number": "1234567890"})
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(statements, ['SAVEPOINT', 'INSERT', 'RELEASE'])
+        supplier = Supplier.objects.get(name='New Supplier')
+        self.assertEqual(response.json(), SupplierSerialiser(supplier).data)
+
+    def test_invalid_fields_write_nothing(self):
+        response, statements = self.post('add_item', {
+            "name": "bike", "description": "bajaj", "price": "cheap",
+            "suppliers": [str(self.supplier1.id)]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(response.data['error'].startswith('price: '))
+        self.assertEqual(statements, [])
+
+        response, statements = self.post('add_supplier', {
+            "name": "New Supplier", "phone_number": "1234567890123",
+            "items": [str(self.item1.id)]})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertTrue(response.data['error'].startswith('phone_number: '))
+        self.assertEqual(statements, [])
+        self.assertFalse(
+            Supplier.objects.filter(name='New Supplier').exists())
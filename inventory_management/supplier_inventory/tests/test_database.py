@@ -0,0 +1,66 @@
+import os
+import sqlite3
+import tempfile
+from django.db import connection
+from django.db.backends.sqlite3.base import DatabaseWrapper
+from django.test import SimpleTestCase, override_settings
+from supplier_inventory.database import immediate_begin
+
+PRAGMAS = {
+    'journal_mode': 'WAL',
+    'synchronous': 'NORMAL',
+    'busy_timeout': 5000,
+    'cache_size': -1024,
+}
+
+
+class SqliteProfileTests(SimpleTestCase):
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.path = os.path.join(directory.name, 'profile.sqlite3')
+
+    def open(self):
+        wrapper = DatabaseWrapper(
+            {**connection.settings_dict, 'NAME': self.path}, alias='profile')
+        wrapper.ensure_connection()
+        self.addCleanup(wrapper.close)
+        return wrapper
+
+    def pragma(self, wrapper, name):
+        return wrapper.connection.execute(f'PRAGMA {name}').fetchone()[0]
+
+    @override_settings(
+        INVENTORY_SQLITE_PRAGMAS=PRAGMAS, INVENTORY_SQLITE_IMMEDIATE=False)
+    def test_pragmas_applied_to_new_connections(self):
+        wrapper = self.open()
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(wrapper, 'synchronous'), 1)
+        self.assertEqual(self.pragma(wrapper, 'busy_timeout'), 5000)
+        self.assertEqual(self.pragma(wrapper, 'cache_size'), -1024)
+        self.assertNotIn(immediate_begin, wrapper.execute_wrappers)
+
+    @override_settings(
+        INVENTORY_SQLITE_PRAGMAS={}, INVENTORY_SQLITE_IMMEDIATE=False)
+    def test_development_keeps_the_defaults(self):
+        wrapper = self.open()
+        self.assertEqual(self.pragma(wrapper, 'journal_mode'), 'delete')
+        self.assertEqual(self.pragma(wrapper, 'synchronous'), 2)
+
+    @override_settings(INVENTORY_SQLITE_IMMEDIATE=True)
+    def test_atomic_blocks_take_the_write_lock(self):
+        wrapper = self.open()
+        wrapper.close()
+        wrapper.ensure_connection()
+        self.assertEqual(wrapper.execute_wrappers.count(immediate_begin), 1)
+
+        wrapper._start_transaction_under_autocommit()
+        other = sqlite3.connect(self.path, timeout=0, isolation_level=None)
+        self.addCleanup(other.close)
+        with self.assertRaisesMessage(
+                sqlite3.OperationalError, 'database is locked'):
+            other.execute('BEGIN IMMEDIATE')
+        wrapper.connection.execute('ROLLBACK')
+        other.execute('BEGIN IMMEDIATE')
+        other.execute('ROLLBACK')
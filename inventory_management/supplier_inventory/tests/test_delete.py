@@ -0,0 +1,128 @@
+import uuid
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from supplier_inventory.cache import item_key, response_cache, supplier_key
+from supplier_inventory.deleter import delete_objects
+from supplier_inventory.importer import insert_links, insert_rows
+from supplier_inventory.models import Item, Supplier
+from supplier_inventory.search import search_items
+
+Link = Supplier.items.through
+
+
+class DeleteTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        response_cache.clear()
+        self.supplier1 = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890")
+        self.supplier2 = Supplier.objects.create(
+            name="Supplier2", phone_number="0987654321")
+        self.item1 = Item.objects.create(
+            name="Hammer", description="Description1", price=100)
+        self.item2 = Item.objects.create(
+            name="Item2", description="Description2", price=200)
+        self.item1.suppliers.add(self.supplier1, self.supplier2)
+        self.item2.suppliers.add(self.supplier1)
+
+    def test_delete_supplier(self):
+        self.client.get(reverse('view_items'), {'item_id': self.item1.id})
+        updated_at = Item.objects.get(id=self.item1.id).updated_at
+        response = self.client.delete(
+            reverse('delete_supplier', args=[self.supplier1.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data, f'Supplier {self.supplier1.id} deleted')
+        self.assertFalse(Supplier.objects.filter(id=self.supplier1.id).exists())
+        self.assertEqual(
+            list(Link.objects.values_list('supplier_id', 'item_id')),
+            [(self.supplier2.id, self.item1.id)])
+        # The items embedding the supplier get a new version
+        self.assertGreater(
+            Item.objects.get(id=self.item1.id).updated_at, updated_at)
+        self.assertIsNone(response_cache.get(item_key(self.item1.id)))
+        response = self.client.get(
+            reverse('view_items'), {'item_id': self.item1.id})
+        self.assertEqual(
+            [supplier['id'] for supplier in response.data['suppliers']],
+            [str(self.supplier2.id)])
+
+    def test_delete_supplier_not_found(self):
+        response = self.client.delete(
+            reverse('delete_supplier', args=[uuid.uuid4()]))
+        self.assertEqual(response.status_code, 404)
+        response = self.client.delete(
+            reverse('delete_supplier', args=['non_existent_id']))
+        self.assertEqual(response.status_code, 400)
+
+    def test_delete_item(self):
+        self.client.get(
+            reverse('view_suppliers'), {'supplier_id': self.supplier2.id})
+        response = self.client.delete(
+            reverse('delete_item', args=[self.item1.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(Link.objects.filter(item_id=self.item1.id).exists())
+        self.assertEqual(search_items('hammer'), [])
+        self.assertIsNone(response_cache.get(supplier_key(self.supplier2.id)))
+        response = self.client.get(
+            reverse('view_suppliers'), {'supplier_id': self.supplier2.id})
+        self.assertEqual(response.data['items'], [])
+
+    def test_bulk_delete(self):
+        missing = str(uuid.uuid4())
+        response = self.client.delete(
+            reverse('delete_items'),
+            {'ids': [str(self.item1.id), missing, 'bad', str(self.item2.id)]},
+            format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data, {'deleted': 2, 'missing_ids': [missing, 'bad']})
+        self.assertFalse(Item.objects.exists())
+        self.assertFalse(Link.objects.exists())
+
+    def test_bulk_delete_from_query(self):
+        response = self.client.delete(
+            reverse('delete_suppliers')
+            + f'?ids={self.supplier1.id},{self.supplier2.id}')
+        self.assertEqual(response.data['deleted'], 2)
+        self.assertFalse(Supplier.objects.exists())
+        self.assertEqual(Item.objects.count(), 2)
+
+    def test_bulk_delete_nothing_found(self):
+        response = self.client.delete(
+            reverse('delete_suppliers'), [str(uuid.uuid4())], format='json')
+        self.assertEqual(response.status_code, 404)
+        response = self.client.delete(
+            reverse('delete_suppliers'), [], format='json')
+        self.assertEqual(response.status_code, 400)
+
+    def test_bulk_delete_limit(self):
+        with self.settings(INVENTORY_BULK_DELETE_MAX_IDS=1):
+            response = self.client.delete(
+                reverse('delete_items'),
+                [str(self.item1.id), str(self.item2.id)], format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Item.objects.count(), 2)
+
+    def test_statements_do_not_grow_with_links(self):
+        items = [
+            {'name': f'Item{n}', 'description': 'Description', 'price': n}
+            for n in range(2000)]
+        insert_rows(connection, Item, items)
+        prepare = Item._meta.pk.get_db_prep_save
+        insert_links(connection, [
+            (prepare(self.supplier2.id, connection),
+             prepare(item['id'], connection)) for item in items])
+
+        def statements(supplier):
+            with CaptureQueriesContext(connection) as context:
+                delete_objects(Supplier, [supplier.id])
+            return len(context.captured_queries)
+
+        self.assertEqual(statements(self.supplier1),
+                         statements(self.supplier2))
+        self.assertEqual(Item.objects.count(), 2002)
+        self.assertFalse(Link.objects.exists())
@@ -0,0 +1,215 @@
+import asyncio
+import threading
+import uuid
+from django.test import (
+    AsyncClient, SimpleTestCase, TestCase, override_settings)
+from django.urls import reverse
+from rest_framework.test import APIClient
+from inventory_management.asgi import application
+from supplier_inventory.deleter import delete_objects
+from supplier_inventory.events import (
+    Subscription, broker, format_events)
+from supplier_inventory.models import Item, Supplier
+from supplier_inventory.signals import objects_changed
+
+
+class SubscriptionTests(SimpleTestCase):
+
+    def test_filters(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        ids = ['a', 'b', 'c']
+        self.assertEqual(
+            Subscription(loop).matching('item', 'created', ids), ids)
+        self.assertEqual(
+            Subscription(loop, models=['supplier']).matching(
+                'item', 'created', ids), [])
+        self.assertEqual(
+            Subscription(loop, actions=['deleted']).matching(
+                'item', 'created', ids), [])
+        self.assertEqual(
+            Subscription(loop, ids=['c', 'd']).matching(
+                'supplier', 'deleted', ids), ['c'])
+
+    async def test_buffer_drops_the_oldest_events(self):
+        subscription = Subscription(asyncio.get_running_loop(), size=3)
+        subscription.put([{'id': '1'}, {'id': '2'}])
+        subscription.put([{'id': '3'}, {'id': '4'}, {'id': '5'}])
+        events, dropped = await subscription.get(1)
+        self.assertEqual(
+            [event['id'] for event in events], ['3', '4', '5'])
+        self.assertEqual(dropped, 2)
+        self.assertEqual(await subscription.get(0.01), ([], 0))
+
+    async def test_publish_from_another_thread(self):
+        subscription = Subscription(asyncio.get_running_loop())
+        broker.subscribe(subscription)
+        self.addCleanup(broker.unsubscribe, subscription)
+        item_id = uuid.uuid4()
+        thread = threading.Thread(
+            target=broker.publish, args=('item', 'updated', [item_id]))
+        thread.start()
+        thread.join()
+        events, _ = await subscription.get(1)
+        self.assertEqual(
+            events, [{'model': 'item', 'action': 'updated',
+                      'id': str(item_id)}])
+
+    def test_listens_only_with_subscribers(self):
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+        subscription = Subscription(loop)
+        self.assertFalse(objects_changed.has_listeners(Item))
+        broker.subscribe(subscription)
+        self.assertTrue(objects_changed.has_listeners(Item))
+        broker.unsubscribe(subscription)
+        self.assertFalse(objects_changed.has_listeners(Item))
+
+    def test_format(self):
+        self.assertEqual(
+            format_events([{'model': 'item'}], 2),
+            'event: overflow\ndata: {"dropped": 2}\n\n'
+            'event: change\ndata: {"model": "item"}\n\n')
+
+
+class ObjectsChangedTests(TestCase):
+    """
+    Checks what every write path sends once it commits.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        self.supplier1 = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890")
+        self.supplier2 = Supplier.objects.create(
+            name="Supplier2", phone_number="0987654321")
+        self.item1 = Item.objects.create(
+            name="Item1", description="Description1", price=100)
+        self.item1.suppliers.add(self.supplier1)
+        self.sent = []
+
+        def receive(sender, action, ids, **kwargs):
+            self.sent.extend(
+                (sender._meta.model_name, action, str(object_id))
+                for object_id in ids)
+        objects_changed.connect(
+            receive, weak=False, dispatch_uid='test_events')
+        self.addCleanup(objects_changed.disconnect, dispatch_uid='test_events')
+
+    def changes(self, write):
+        self.sent = []
+        with self.captureOnCommitCallbacks(execute=True):
+            write()
+        return set(self.sent)
+
+    def test_nothing_is_sent_before_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.item1.suppliers.add(self.supplier2)
+        self.assertEqual(self.sent, [])
+        for callback in callbacks:
+            callback()
+        self.assertEqual(len(self.sent), 2)
+
+    def test_api_writes(self):
+        item1, supplier1, supplier2 = (
+            str(self.item1.id), str(self.supplier1.id), str(self.supplier2.id))
+        sent = self.changes(lambda: self.client.post(reverse('add_item'), {
+            'name': 'bike', 'description': 'bajaj', 'price': 40,
+            'suppliers': [supplier2]}, format='json'))
+        item2 = Item.objects.get(name='bike').id
+        self.assertEqual(sent, {
+            ('item', 'created', str(item2)),
+            ('supplier', 'updated', supplier2)})
+
+        sent = self.changes(lambda: self.client.put(
+            reverse('update_item', args=[item1]), {'price': 5},
+            format='json'))
+        self.assertEqual(sent, {
+            ('item', 'updated', item1), ('supplier', 'updated', supplier1)})
+
+        sent = self.changes(lambda: self.client.delete(
+            reverse('delete_supplier', args=[supplier1])))
+        self.assertEqual(sent, {
+            ('supplier', 'deleted', supplier1), ('item', 'updated', item1)})
+
+    def test_orm_writes(self):
+        item1, supplier2 = str(self.item1.id), str(self.supplier2.id)
+        self.assertEqual(
+            self.changes(lambda: self.item1.suppliers.add(self.supplier2)),
+            {('item', 'updated', item1), ('supplier', 'updated', supplier2)})
+        self.assertEqual(
+            self.changes(self.supplier2.delete),
+            {('supplier', 'deleted', supplier2), ('item', 'updated', item1)})
+
+    def test_set_based_delete(self):
+        item1, supplier1 = str(self.item1.id), str(self.supplier1.id)
+        self.assertEqual(
+            self.changes(lambda: delete_objects(Item, [item1])),
+            {('item', 'deleted', item1), ('supplier', 'updated', supplier1)})
+
+
+@override_settings(INVENTORY_STREAM_HEARTBEAT_SECONDS=0.05)
+class StreamTests(SimpleTestCase):
+    """
+    Runs the stream through the ASGI application of asgi.py.
+    """
+
+    async def open_stream(self, query=''):
+        received = asyncio.Queue()
+        await received.put({'type': 'http.request', 'body': b''})
+        sent = asyncio.Queue()
+        scope = {
+            'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1',
+            'method': 'GET', 'scheme': 'http',
+            'path': reverse('stream_changes'), 'raw_path': b'',
+            'query_string': query.encode(), 'root_path': '',
+            'headers': [(b'host', b'testserver')],
+            'client': ('127.0.0.1', 1234), 'server': ('testserver', 80)}
+        task = asyncio.ensure_future(
+            application(scope, received.get, sent.put))
+        start = await asyncio.wait_for(sent.get(), 5)
+        self.assertEqual(start['status'], 200)
+        self.assertIn(
+            (b'Content-Type', b'text/event-stream'), start['headers'])
+        return task, received, sent
+
+    async def next_body(self, sent):
+        message = await asyncio.wait_for(sent.get(), 5)
+        return message.get('body', b'').decode()
+
+    async def test_stream(self):
+        item_id = str(uuid.uuid4())
+        task, received, sent = await self.open_stream(
+            f'models=item&actions=updated,deleted&ids={item_id}')
+        self.assertEqual(await self.next_body(sent), 'retry: 3000\n\n')
+        self.assertEqual(len(broker.subscriptions), 1)
+
+        broker.publish('supplier', 'updated', [item_id])
+        broker.publish('item', 'created', [item_id])
+        broker.publish('item', 'updated', [uuid.uuid4()])
+        broker.publish('item', 'deleted', [item_id])
+        self.assertEqual(
+            await self.next_body(sent),
+            'event: change\ndata: {"model": "item", "action": "deleted", '
+            f'"id": "{item_id}"}}\n\n')
+        self.assertEqual(await self.next_body(sent), ': ping\n\n')
+
+        await received.put({'type': 'http.disconnect'})
+        await asyncio.wait_for(task, 5)
+        self.assertEqual(broker.subscriptions, set())
+
+    async def test_invalid_filters(self):
+        client = AsyncClient()
+        response = await client.get(
+            reverse('stream_changes'), {'actions': 'created,renamed'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(
+            response.json()['error'],
+            "Invalid actions 'renamed', use created, updated, deleted")
+        response = await client.get(
+            reverse('stream_changes'), {'ids': 'not-a-uuid'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_needs_asgi(self):
+        response = self.client.get(reverse('stream_changes'))
+        self.assertEqual(response.status_code, 400)
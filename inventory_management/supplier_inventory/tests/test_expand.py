@@ -0,0 +1,65 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from supplier_inventory.models import Item, Supplier
+
+
+class ExpandTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.item1 = Item.objects.create(
+            name="Item1", description="Description1", price=100)
+        self.item2 = Item.objects.create(
+            name="Item2", description="Description2", price=200)
+        self.supplier1 = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890")
+        self.supplier1.items.add(self.item1, self.item2)
+
+    def add_suppliers(self, count):
+        for i in range(count):
+            supplier = Supplier.objects.create(
+                name=f"Extra{i}", phone_number="1234567890")
+            supplier.items.add(self.item1)
+
+    def test_supplier_list_expand_items(self):
+        response = self.client.get(
+            reverse('view_suppliers'), {'expand': 'items'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        items = response.data[0]['items']
+        self.assertEqual(
+            sorted(item['name'] for item in items), ['Item1', 'Item2'])
+        self.assertEqual(items[0]['price'][-3:], '.00')
+
+    def test_supplier_list_without_expand_has_no_items(self):
+        response = self.client.get(reverse('view_suppliers'))
+        self.assertNotIn('items', response.data[0])
+
+    def test_supplier_list_expand_query_count_is_constant(self):
+        url = reverse('view_suppliers')
+        with self.assertNumQueries(2):
+            self.client.get(url, {'expand': 'items'})
+        self.add_suppliers(20)
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'expand': 'items'})
+        self.assertEqual(len(response.data), 21)
+
+    def test_item_list_expand_suppliers(self):
+        self.add_suppliers(1)
+        url = reverse('view_items')
+        with self.assertNumQueries(2):
+            response = self.client.get(url, {'expand': 'suppliers'})
+        suppliers = {
+            item['name']: item['suppliers'] for item in response.data}
+        self.assertEqual(len(suppliers['Item1']), 2)
+        self.assertEqual(
+            set(suppliers['Item2'][0]), {'id', 'name', 'phone_number'})
+
+    def test_invalid_expand(self):
+        response = self.client.get(
+            reverse('view_items'), {'expand': 'items'})
+        self.assertEqual(response.status_code, 400)
+        response = self.client.get(
+            reverse('view_suppliers'), {'expand': 'suppliers'})
+        self.assertEqual(response.status_code, 400)
@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from supplier_inventory.exporter import export_items
+from supplier_inventory.models import Item, Supplier
+
+
+class ItemExportTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.supplier1 = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890")
+        self.supplier2 = Supplier.objects.create(
+            name="Supplier2", phone_number="0987654321")
+        self.items = []
+        for i in range(5):
+            item = Item.objects.create(
+                name=f"Item{i}", description="Description", price=i)
+            item.suppliers.add(self.supplier1)
+            self.items.append(item)
+        self.items[0].suppliers.add(self.supplier2)
+
+    def streamed(self, response):
+        return b''.join(response.streaming_content).decode()
+
+    def test_export_ndjson(self):
+        response = self.client.get(reverse('export_items'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        rows = [json.loads(line) for line in self.streamed(response).splitlines()]
+        self.assertEqual(
+            [row['name'] for row in rows], [f"Item{i}" for i in range(5)])
+        self.assertEqual(rows[1]['price'], '1.00')
+        self.assertEqual(rows[1]['suppliers'], [str(self.supplier1.id)])
+        self.assertEqual(
+            set(rows[0]['suppliers']),
+            {str(self.supplier1.id), str(self.supplier2.id)})
+
+    def test_export_csv(self):
+        response = self.client.get(reverse('export_items'), {'type': 'csv'})
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.DictReader(io.StringIO(self.streamed(response))))
+        self.assertEqual(len(rows), 5)
+        self.assertEqual(len(rows[0]['suppliers'].split(',')), 2)
+
+    def test_export_invalid_type(self):
+        response = self.client.get(reverse('export_items'), {'type': 'xml'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_export_query_count_per_chunk(self):
+        # one cursor over the items plus a supplier lookup per chunk
+        with self.assertNumQueries(4):
+            chunks = list(export_items('ndjson', chunk_size=2))
+        self.assertEqual(len(chunks), 3)
+
+    def test_export_command(self):
+        output = io.StringIO()
+        call_command(
+            'export_items', '--format', 'csv', '--chunk-size', '2',
+            stdout=output)
+        rows = list(csv.DictReader(io.StringIO(output.getvalue())))
+        self.assertEqual(
+            [row['name'] for row in rows], [f"Item{i}" for i in range(5)])
@@ -0,0 +1,94 @@
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from supplier_inventory.cache import response_cache
+from supplier_inventory.models import Item, Supplier
+
+
+class SparseFieldsetTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        response_cache.clear()
+        self.supplier1 = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890")
+        self.item1 = Item.objects.create(
+            name="Item1", description="Description1", price=100)
+        self.item2 = Item.objects.create(
+            name="Item2", description="Description2", price=200)
+        self.item1.suppliers.add(self.supplier1)
+
+    def test_item_list_fields(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                reverse('view_items'), {'fields': 'id,name,price'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data,
+            [{'id': str(self.item1.id), 'name': 'Item1', 'price': '100.00'},
+             {'id': str(self.item2.id), 'name': 'Item2', 'price': '200.00'}])
+        self.assertNotIn('description', context.captured_queries[0]['sql'])
+
+    def test_item_list_fields_keep_paginating(self):
+        response = self.client.get(
+            reverse('view_items'), {'fields': 'name', 'page_size': 1})
+        self.assertEqual(response.data, [{'name': 'Item1'}])
+        response = self.client.get(
+            reverse('view_items'),
+            {'fields': 'name', 'page_size': 1,
+             'cursor': response.headers['X-Next-Cursor']})
+        self.assertEqual(response.data, [{'name': 'Item2'}])
+
+    def test_item_list_fields_with_expand(self):
+        response = self.client.get(
+            reverse('view_items'),
+            {'fields': 'name,suppliers', 'expand': 'suppliers'})
+        self.assertEqual(response.data[0]['name'], 'Item1')
+        self.assertEqual(
+            response.data[0]['suppliers'][0]['name'], 'Supplier1')
+        with self.assertNumQueries(1):
+            response = self.client.get(
+                reverse('view_items'),
+                {'fields': 'name', 'expand': 'suppliers'})
+        self.assertEqual(response.data[0], {'name': 'Item1'})
+
+    def test_suppliers_only_with_expand(self):
+        response = self.client.get(
+            reverse('view_items'), {'fields': 'suppliers'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data['error'],
+            "Invalid field 'suppliers', use id, created_at, name, "
+            "description, price, supplier_count")
+
+    def test_item_detail_fields(self):
+        response = self.client.get(
+            reverse('view_items'),
+            {'item_id': self.item1.id, 'fields': 'price,name'})
+        self.assertEqual(response.data['item'], {
+            'name': 'Item1', 'price': '100.00'})
+        self.assertEqual(len(response.data['suppliers']), 1)
+        response = self.client.get(
+            reverse('view_items'), {'item_id': self.item1.id})
+        self.assertIn('description', response.data['item'])
+
+    def test_supplier_fields(self):
+        response = self.client.get(
+            reverse('view_suppliers'), {'fields': 'name'})
+        self.assertEqual(response.data, [{'name': 'Supplier1'}])
+        response = self.client.get(
+            reverse('view_suppliers'),
+            {'supplier_id': self.supplier1.id, 'fields': 'id,items'})
+        self.assertEqual(list(response.data), ['id', 'items'])
+        self.assertEqual(response.data['items'][0]['name'], 'Item1')
+
+    def test_invalid_fields(self):
+        response = self.client.get(
+            reverse('view_suppliers'), {'fields': 'name,password'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.get(reverse('view_items'), {'fields': ' , '})
+        self.assertEqual(
+            response.data['error'], 'Please add at least one field')
@@ -0,0 +1,71 @@
+from io import StringIO
+from django.core.management import CommandError, call_command
+from django.db.models import Count
+from django.test import TestCase
+from supplier_inventory.generator import generate_inventory
+from supplier_inventory.models import Item, Supplier
+from supplier_inventory.search import search_items
+
+
+class GenerateInventoryTests(TestCase):
+
+    def test_counts_and_density(self):
+        created = generate_inventory(
+            200, 10, density=2.5, seed=1, batch_size=64)
+        self.assertEqual(Item.objects.count(), 200)
+        self.assertEqual(Supplier.objects.count(), 10)
+        links = Supplier.items.through.objects.count()
+        self.assertEqual(created, {'items': 200, 'suppliers': 10,
+                                   'links': links})
+        self.assertTrue(400 <= links <= 600)
+        counts = Item.objects.annotate(
+            count=Count('suppliers')).values_list('count', flat=True)
+        self.assertEqual(set(counts), {2, 3})
+
+    def test_ids_are_ascending_uuid4(self):
+        generate_inventory(50, 5, seed=2)
+        # In insertion order
+        ids = [item.id for item in Item.objects.raw(
+            f'SELECT id FROM {Item._meta.db_table} ORDER BY rowid')]
+        self.assertEqual(ids, sorted(ids))
+        self.assertEqual({pk.version for pk in ids}, {4})
+
+    def test_same_seed_same_inventory(self):
+        generate_inventory(20, 4, seed=3)
+        first = list(Item.objects.values_list('id', 'name', 'price'))
+        Item.objects.all().delete()
+        Supplier.objects.all().delete()
+        generate_inventory(20, 4, seed=3)
+        self.assertEqual(
+            list(Item.objects.values_list('id', 'name', 'price')), first)
+
+    def test_search_index_is_rebuilt(self):
+        generate_inventory(30, 3, seed=4)
+        name = Item.objects.values_list('name', flat=True).first()
+        self.assertIn(name, [item.name for item in search_items(name)])
+        # The triggers are back for rows added afterwards
+        Item.objects.create(name='Zeppelin', description='Airship', price=1)
+        self.assertEqual(len(search_items('zeppelin')), 1)
+
+    def test_invalid_numbers(self):
+        with self.assertRaises(ValueError):
+            generate_inventory(-1, 1)
+        with self.assertRaises(ValueError):
+            generate_inventory(10, 0)
+        generate_inventory(10, 0, density=0)
+        self.assertEqual(Item.objects.count(), 10)
+
+
+class SeedInventoryCommandTests(TestCase):
+
+    def test_seed(self):
+        out = StringIO()
+        call_command(
+            'seed_inventory', items=40, suppliers=4, density=1, seed=5,
+            stdout=out)
+        self.assertTrue(out.getvalue().startswith(
+            'Created 40 items, 4 suppliers and 40 links in'))
+
+    def test_invalid(self):
+        with self.assertRaisesMessage(CommandError, 'without suppliers'):
+            call_command('seed_inventory', items=5, suppliers=0)
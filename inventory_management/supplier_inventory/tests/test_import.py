@@ -0,0 +1,90 @@
+import json
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from supplier_inventory.importer import ItemImporter
+from supplier_inventory.models import Item, Supplier
+
+
+class ItemImportTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('import_items')
+        self.supplier1 = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890")
+        self.supplier2 = Supplier.objects.create(
+            name="Supplier2", phone_number="0987654321")
+
+    def post_ndjson(self, rows):
+        body = '\n'.join(
+            row if isinstance(row, str) else json.dumps(row) for row in rows)
+        return self.client.post(
+            self.url, data=body, content_type='application/x-ndjson')
+
+    def test_import_ndjson(self):
+        response = self.post_ndjson([
+            {"name": "bike", "description": "bajaj", "price": "23232",
+             "suppliers": [str(self.supplier1.id), str(self.supplier2.id)]},
+            {"name": "phone", "description": "tecno", "price": 12,
+             "suppliers": [str(self.supplier1.id)]},
+        ])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data, {'created': 2, 'errors': []})
+        bike = Item.objects.get(name='bike')
+        self.assertIsNotNone(bike.created_at)
+        self.assertEqual(bike.suppliers.count(), 2)
+        self.assertEqual(self.supplier1.items.count(), 2)
+
+    def test_import_csv(self):
+        body = (
+            'name,description,price,suppliers\n'
+            f'bike,bajaj,100.50,"{self.supplier1.id},{self.supplier2.id}"\n'
+            f'phone,tecno,12,{self.supplier2.id}\n')
+        response = self.client.post(
+            self.url, data=body, content_type='text/csv')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 2)
+        self.assertEqual(
+            Item.objects.get(name='bike').suppliers.count(), 2)
+
+    def test_import_reports_row_errors(self):
+        supplier = str(self.supplier1.id)
+        response = self.post_ndjson([
+            {"name": "ok", "description": "d", "price": 1,
+             "suppliers": [supplier]},
+            {"description": "d", "price": 1, "suppliers": [supplier]},
+            {"name": "bad price", "description": "d", "price": "abc",
+             "suppliers": [supplier]},
+            {"name": "no supplier", "description": "d", "price": 1},
+            {"name": "unknown", "description": "d", "price": 1,
+             "suppliers": ["8057b527-d7b2-4074-8f9a-65a5bdba0d28"]},
+            "{not json",
+        ])
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['created'], 1)
+        self.assertEqual(
+            [error['row'] for error in response.data['errors']],
+            [2, 3, 4, 5, 6])
+        self.assertEqual(
+            response.data['errors'][3]['error'],
+            'Some Supplier IDs do not exist')
+        self.assertEqual(Item.objects.count(), 1)
+
+    def test_import_unsupported_content_type(self):
+        response = self.client.post(
+            self.url, data='<xml/>', content_type='application/xml')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_import_in_chunks(self):
+        rows = (
+            (row, {"name": f"Item{row}", "description": "d", "price": row,
+                   "suppliers": [str(self.supplier1.id)]})
+            for row in range(1, 11))
+        # per chunk: supplier check, savepoint, two inserts,
+        # supplier version bump, release
+        with self.assertNumQueries(4 * 6):
+            report = ItemImporter(chunk_size=3).run(rows)
+        self.assertEqual(report, {'created': 10, 'errors': []})
+        self.assertEqual(self.supplier1.items.count(), 10)
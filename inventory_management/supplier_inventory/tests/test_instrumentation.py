@@ -0,0 +1,64 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from supplier_inventory.cache import response_cache
+from supplier_inventory.models import Item, Supplier
+
+
+@override_settings(
+    INVENTORY_QUERY_TIMING=True, INVENTORY_QUERY_BUDGET=50,
+    INVENTORY_LATENCY_BUDGET_MS=0)
+class QueryTimingTests(TestCase):
+
+    def setUp(self):
+        response_cache.clear()
+        self.supplier = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890")
+        self.item = Item.objects.create(
+            name="Item1", description="Description1", price=100)
+        self.item.suppliers.add(self.supplier)
+
+    def test_headers(self):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(
+                reverse('view_items'), {'item_id': self.item.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response['X-Query-Count'], str(len(context.captured_queries)))
+        db, total = response['Server-Timing'].split(', ')
+        self.assertRegex(
+            db, rf'^db;dur=[\d.]+;desc="{len(context)} queries"$')
+        self.assertRegex(total, r'^total;dur=[\d.]+$')
+
+    def test_async_views_are_counted(self):
+        response = self.client.get(
+            reverse('async_view_items'), {'item_id': self.item.id})
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(int(response['X-Query-Count']), 0)
+
+    async def test_async_client(self):
+        response = await self.async_client.get(
+            reverse('async_view_suppliers'))
+        self.assertEqual(response.status_code, 200)
+        self.assertGreater(int(response['X-Query-Count']), 0)
+
+    @override_settings(INVENTORY_QUERY_BUDGET=1)
+    def test_requests_over_budget_are_logged(self):
+        with self.assertLogs(
+                'supplier_inventory.instrumentation', 'WARNING') as logs:
+            self.client.get(reverse('view_items'), {'item_id': self.item.id})
+        [message] = logs.output
+        self.assertIn(f'GET /api/view-items/?item_id={self.item.id}', message)
+        self.assertIn('over the budget of 1 queries', message)
+        self.assertIn('SELECT', message)
+
+    def test_requests_within_budget_are_not_logged(self):
+        with self.assertNoLogs('supplier_inventory.instrumentation'):
+            self.client.get(reverse('view_items'), {'item_id': self.item.id})
+
+    @override_settings(INVENTORY_QUERY_TIMING=False)
+    def test_disabled(self):
+        response = self.client.get(reverse('view_items'))
+        self.assertNotIn('X-Query-Count', response)
+        self.assertNotIn('Server-Timing', response)
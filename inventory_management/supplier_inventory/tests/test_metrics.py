@@ -0,0 +1,104 @@
+import threading
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+from supplier_inventory.metrics import MetricsRegistry, metrics
+from supplier_inventory.models import Item
+
+
+class MetricsRegistryTests(SimpleTestCase):
+
+    def setUp(self):
+        self.registry = MetricsRegistry(buckets=(0.01, 0.1))
+
+    def test_histogram(self):
+        for seconds in (0.005, 0.01, 0.05, 2):
+            self.registry.observe('view_items', 'GET', 200, seconds)
+        self.registry.observe('view_items', 'GET', 404, 0.001)
+        lines = self.registry.render().splitlines()
+        labels = 'view="view_items",method="GET"'
+        for line in (
+                f'inventory_request_duration_seconds_bucket{{{labels},'
+                'le="0.01"} 3',
+                f'inventory_request_duration_seconds_bucket{{{labels},'
+                'le="0.1"} 4',
+                f'inventory_request_duration_seconds_bucket{{{labels},'
+                'le="+Inf"} 5',
+                f'inventory_request_duration_seconds_sum{{{labels}}} 2.066',
+                f'inventory_request_duration_seconds_count{{{labels}}} 5',
+                f'inventory_requests_total{{{labels},status="200"}} 4',
+                f'inventory_requests_total{{{labels},status="404"}} 1'):
+            self.assertIn(line, lines)
+
+    def test_in_flight(self):
+        self.registry.track('add_item', 'POST', 1)
+        self.registry.track('add_item', 'POST', 1)
+        self.registry.track('add_item', 'POST', -1)
+        self.assertIn(
+            'inventory_requests_in_flight{view="add_item",method="POST"} 1',
+            self.registry.render())
+
+    def test_threads_record_into_their_own_shard(self):
+        def record():
+            for _ in range(1000):
+                self.registry.observe('view_items', 'GET', 200, 0.002)
+        threads = [threading.Thread(target=record) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.registry.shards), 4)
+        _, statuses, _ = self.registry.collect()
+        self.assertEqual(statuses, {('view_items', 'GET', 200): 4000})
+
+    def test_label_values_are_escaped(self):
+        self.registry.observe('a"b\\c\nd', 'GET', 200, 0.001)
+        self.assertIn('view="a\\"b\\\\c\\nd"', self.registry.render())
+
+
+class MetricsEndpointTests(TestCase):
+
+    def setUp(self):
+        metrics.clear()
+        self.item = Item.objects.create(
+            name="Item1", description="Description1", price=100)
+
+    def scrape(self):
+        response = self.client.get(reverse('metrics'))
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        return response.content.decode().splitlines()
+
+    def test_requests_are_recorded(self):
+        self.client.get(reverse('view_items'), {'item_id': self.item.id})
+        self.client.get(reverse('view_items'), {'item_id': 'missing'})
+        self.client.get('/api/nowhere/')
+        self.client.get(
+            reverse('async_view_items'), {'item_id': self.item.id})
+        lines = self.scrape()
+        for line in (
+                'inventory_requests_total{view="view_items",method="GET",'
+                'status="200"} 1',
+                'inventory_requests_total{view="view_items",method="GET",'
+                'status="400"} 1',
+                'inventory_requests_total{view="unmatched",method="GET",'
+                'status="404"} 1',
+                'inventory_requests_total{view="async_view_items",'
+                'method="GET",status="200"} 1',
+                'inventory_requests_in_flight{view="view_items",'
+                'method="GET"} 0',
+                'inventory_request_duration_seconds_count{'
+                'view="view_items",method="GET"} 2'):
+            self.assertIn(line, lines)
+
+    def test_scrape_counts_itself_in_flight(self):
+        self.assertIn(
+            'inventory_requests_in_flight{view="metrics",method="GET"} 1',
+            self.scrape())
+
+    async def test_async_requests(self):
+        await self.async_client.get(reverse('async_view_suppliers'))
+        response = await self.async_client.get(reverse('metrics'))
+        self.assertIn(
+            'inventory_requests_total{view="async_view_suppliers",'
+            'method="GET",status="200"} 1',
+            response.content.decode().splitlines())
@@ -0,0 +1,88 @@
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from supplier_inventory.models import Item, Supplier
+
+
+class ItemPaginationTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.items = [
+            Item.objects.create(
+                name=f"Item{i}", description="Description", price=i)
+            for i in range(5)]
+
+    def read_all(self, url, **params):
+        names, cursor = [], None
+        while True:
+            query = dict(params, cursor=cursor) if cursor else params
+            response = self.client.get(url, query)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            names.extend(row['name'] for row in response.data)
+            cursor = response.headers.get('X-Next-Cursor')
+            if not cursor:
+                return names
+
+    def test_pages_cover_all_items_once(self):
+        names = self.read_all(reverse('view_items'), page_size=2)
+        self.assertEqual(names, [item.name for item in self.items])
+
+    def test_last_page_has_no_cursor(self):
+        response = self.client.get(reverse('view_items'), {'page_size': 5})
+        self.assertEqual(len(response.data), 5)
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+    def test_page_size_capped(self):
+        with override_settings(INVENTORY_MAX_PAGE_SIZE=3):
+            response = self.client.get(
+                reverse('view_items'), {'page_size': 50})
+        self.assertEqual(len(response.data), 3)
+        self.assertIn('X-Next-Cursor', response.headers)
+
+    @override_settings(INVENTORY_PAGE_SIZE=4)
+    def test_default_page_size(self):
+        response = self.client.get(reverse('view_items'))
+        self.assertEqual(len(response.data), 4)
+
+    def test_same_created_at_ordered_by_id(self):
+        Item.objects.update(created_at=self.items[0].created_at)
+        names = self.read_all(reverse('view_items'), page_size=2)
+        expected = [
+            item.name for item in sorted(self.items, key=lambda i: i.id.hex)]
+        self.assertEqual(names, expected)
+
+    def test_invalid_cursor(self):
+        response = self.client.get(
+            reverse('view_items'), {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_invalid_page_size(self):
+        response = self.client.get(reverse('view_items'), {'page_size': 0})
+        self.assertEqual(response.status_code, 400)
+
+
+class SupplierPaginationTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        for i in range(3):
+            Supplier.objects.create(
+                name=f"Supplier{i}", phone_number="1234567890")
+
+    def test_pages_cover_all_suppliers(self):
+        url = reverse('view_suppliers')
+        first = self.client.get(url, {'page_size': 2})
+        self.assertEqual(len(first.data), 2)
+        second = self.client.get(
+            url, {'page_size': 2, 'cursor': first.headers['X-Next-Cursor']})
+        self.assertEqual(len(second.data), 1)
+        self.assertNotIn('X-Next-Cursor', second.headers)
+        self.assertEqual(
+            [row['name'] for row in first.data + second.data],
+            ['Supplier0', 'Supplier1', 'Supplier2'])
+        self.assertEqual(
+            set(first.data[0]),
+            {'id', 'name', 'phone_number', 'email', 'item_count',
+             'min_item_price', 'max_item_price', 'avg_item_price'})
@@ -0,0 +1,175 @@
+import math
+from django.db import connection
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from supplier_inventory.cache import response_cache
+from supplier_inventory.importer import insert_links, insert_rows
+from supplier_inventory.models import Item, Supplier
+from supplier_inventory.testing import query_budget
+from supplier_inventory.utils import query_chunk_size
+
+
+class QueryBudgetTests(TestCase):
+
+    def setUp(self):
+        Item.objects.create(name="Item1", description="Description1", price=1)
+        Item.objects.create(name="Item2", description="Description2", price=2)
+
+    def test_within_budget(self):
+        with query_budget(queries=1, rows=2) as budget:
+            list(Item.objects.all())
+        self.assertEqual((budget.queries, budget.rows), (1, 2))
+
+    def test_rows_over_budget_lists_the_sql(self):
+        with self.assertRaises(AssertionError) as context:
+            with query_budget(queries=2, rows=1):
+                list(Item.objects.values_list('name', flat=True))
+                Item.objects.filter(name='Item1').first()
+        message = str(context.exception)
+        self.assertIn('3 rows, budget 1', message)
+        self.assertIn('1. 2 rows: SELECT "supplier_inventory_item"."name"',
+                      message)
+        self.assertIn("2. 1 rows: SELECT", message)
+        self.assertIn("'Item1'", message)
+
+    def test_queries_over_budget(self):
+        @query_budget(queries=1)
+        def count_twice():
+            Item.objects.count()
+            Supplier.objects.count()
+        with self.assertRaisesMessage(AssertionError, '2 queries, budget 1'):
+            count_twice()
+
+    def test_errors_inside_are_not_masked(self):
+        with self.assertRaises(KeyError):
+            with query_budget(queries=0):
+                Item.objects.count()
+                raise KeyError
+
+
+class ViewBudgets:
+    """
+    Runs every handler of ItemView and SupplierView under a query
+    budget, against a supplier with size items and an item with size
+    suppliers. The budgets are a fixed number of statements plus one per
+    chunk of IDs where a handler has to go through all related IDs, and
+    the rows the response is made of, so a query per related row fails
+    at once.
+    """
+    size = None
+
+    @classmethod
+    def setUpTestData(cls):
+        size = cls.size
+        items = [
+            {'name': f'Item{n}', 'description': 'Description', 'price': n}
+            for n in range(size + 1)]
+        suppliers = [
+            {'name': f'Supplier{n}', 'phone_number': '1234567890'}
+            for n in range(size + 1)]
+        insert_rows(connection, Item, items)
+        insert_rows(connection, Supplier, suppliers)
+        cls.item, cls.items = items[0]['id'], [
+            item['id'] for item in items[1:]]
+        cls.supplier, cls.suppliers = suppliers[0]['id'], [
+            supplier['id'] for supplier in suppliers[1:]]
+        prepare = Item._meta.pk.get_db_prep_save
+        insert_links(connection, [
+            (prepare(supplier, connection), prepare(item, connection))
+            for supplier, item in (
+                [(cls.supplier, item) for item in cls.items]
+                + [(supplier, cls.item) for supplier in cls.suppliers])])
+
+    def setUp(self):
+        self.client = APIClient()
+        response_cache.clear()
+
+    @property
+    def chunks(self) -> int:
+        return math.ceil(self.size / query_chunk_size())
+
+    def request(self, method, url, data=None, status=200):
+        response = getattr(self.client, method)(url, data, format='json')
+        self.assertEqual(response.status_code, status, response.content)
+        return response
+
+    def test_item_list(self):
+        with query_budget(queries=1, rows=101):
+            self.request('get', reverse('view_items'))
+
+    def test_item_list_expanded(self):
+        # The page of items plus the suppliers of the page
+        with query_budget(queries=2, rows=101 + self.size + 100):
+            self.request(
+                'get', reverse('view_items'), {'expand': 'suppliers'})
+
+    def test_item_details(self):
+        with query_budget(queries=2, rows=1 + self.size):
+            self.request('get', reverse('view_items'), {'item_id': self.item})
+
+    def test_item_create(self):
+        with query_budget(queries=4 + 2 * self.chunks, rows=self.size):
+            self.request('post', reverse('add_item'), {
+                'name': 'Item', 'description': 'Description', 'price': 10,
+                'suppliers': self.suppliers}, 201)
+
+    def test_item_update(self):
+        # The suppliers are checked, added unless already linked and
+        # their versions bumped
+        with query_budget(queries=10 + 4 * self.chunks, rows=1 + 3 * self.size):
+            self.request(
+                'put', reverse('update_item', args=[self.item]),
+                {'price': 5, 'suppliers': self.suppliers})
+
+    def test_item_delete(self):
+        # The tombstone of the change feed is one INSERT
+        with query_budget(queries=8, rows=1 + self.size):
+            self.request('delete', reverse('delete_item', args=[self.item]))
+
+    def test_supplier_delete(self):
+        with query_budget(queries=8, rows=1 + self.size):
+            self.request(
+                'delete', reverse('delete_supplier', args=[self.supplier]))
+
+    def test_supplier_list(self):
+        with query_budget(queries=1, rows=101):
+            self.request('get', reverse('view_suppliers'))
+
+    def test_supplier_list_expanded(self):
+        with query_budget(queries=2, rows=101 + self.size + 100):
+            self.request(
+                'get', reverse('view_suppliers'), {'expand': 'items'})
+
+    def test_supplier_details(self):
+        with query_budget(queries=2, rows=1 + self.size):
+            self.request(
+                'get', reverse('view_suppliers'),
+                {'supplier_id': self.supplier})
+
+    def test_supplier_create(self):
+        # Its aggregates are computed and read back
+        with query_budget(queries=6 + 2 * self.chunks, rows=1 + self.size):
+            self.request('post', reverse('add_supplier'), {
+                'name': 'Supplier', 'phone_number': '1234567890',
+                'items': self.items}, 201)
+
+    def test_supplier_update(self):
+        # The response reads the aggregates and lists the items once more
+        with query_budget(
+                queries=11 + 4 * self.chunks, rows=2 + 4 * self.size):
+            self.request(
+                'put', reverse('update_supplier', args=[self.supplier]),
+                {'name': 'Renamed', 'items': self.items})
+
+
+class OneRelatedRowBudgetTests(ViewBudgets, TestCase):
+    size = 1
+
+
+class HundredRelatedRowsBudgetTests(ViewBudgets, TestCase):
+    size = 100
+
+
+class TenThousandRelatedRowsBudgetTests(ViewBudgets, TestCase):
+    size = 10000
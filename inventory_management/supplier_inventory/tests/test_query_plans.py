@@ -0,0 +1,132 @@
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from supplier_inventory.models import Item, Supplier
+from supplier_inventory.pagination import encode_cursor
+from supplier_inventory.views import (
+    ITEM_ORDERINGS, SUPPLIER_ORDERINGS, ApiMethodMixin)
+
+
+class QueryPlanTests(TestCase):
+    """
+    Runs EXPLAIN QUERY PLAN on the queries of the read paths and fails
+    if SQLite would scan a table or sort the rows instead of using an
+    index.
+    """
+
+    def setUp(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('Query plans are checked on SQLite')
+        self.client = APIClient()
+        self.supplier1 = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890")
+        self.item1 = Item.objects.create(
+            name="Item1", description="Description1", price=100)
+        self.item2 = Item.objects.create(
+            name="Item2", description="Description2", price=200)
+        self.item1.suppliers.add(self.supplier1)
+
+    def explain(self, sql, params=()):
+        with connection.cursor() as cursor:
+            cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+            return [row[-1] for row in cursor.fetchall()]
+
+    def assertIndexed(self, sql, params=()):
+        for step in self.explain(sql, params):
+            scan = step.startswith('SCAN ') and not (
+                'USING INDEX' in step or 'USING COVERING INDEX' in step
+                or 'VIRTUAL TABLE' in step or 'CONSTANT ROW' in step)
+            self.assertFalse(scan, f'{step} in plan of {sql}')
+            self.assertNotIn('TEMP B-TREE', step, f'plan of {sql}')
+
+    def assertRequestIndexed(self, url, params=None):
+        with CaptureQueriesContext(connection) as context:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, 200, response.content)
+        selects = [
+            query['sql'] for query in context.captured_queries
+            if query['sql'].startswith('SELECT')]
+        self.assertTrue(selects)
+        for sql in selects:
+            self.assertIndexed(sql)
+
+    def assertQuerysetIndexed(self, queryset):
+        self.assertIndexed(*queryset.query.sql_with_params())
+
+    def test_item_list(self):
+        url = reverse('view_items')
+        cursor = encode_cursor([self.item1.created_at, self.item1.id])
+        self.assertRequestIndexed(url)
+        self.assertRequestIndexed(url, {'cursor': cursor})
+        self.assertRequestIndexed(url, {'expand': 'suppliers'})
+
+    def test_item_detail(self):
+        self.assertRequestIndexed(
+            reverse('view_items'), {'item_id': self.item1.id})
+
+    def test_supplier_list(self):
+        url = reverse('view_suppliers')
+        cursor = encode_cursor([self.supplier1.created_at, self.supplier1.id])
+        self.assertRequestIndexed(url)
+        self.assertRequestIndexed(url, {'cursor': cursor})
+        self.assertRequestIndexed(url, {'expand': 'items'})
+
+    def test_supplier_detail(self):
+        self.assertRequestIndexed(
+            reverse('view_suppliers'), {'supplier_id': self.supplier1.id})
+
+    def test_check_ids(self):
+        with CaptureQueriesContext(connection) as context:
+            ApiMethodMixin().check_ids([self.supplier1.id], Supplier)
+        self.assertIndexed(context.captured_queries[0]['sql'])
+
+    def test_price_and_name_lookups(self):
+        self.assertQuerysetIndexed(
+            Item.objects.filter(price__gte=10).order_by('price', 'id'))
+        self.assertQuerysetIndexed(
+            Item.objects.filter(name='Item1').order_by('id'))
+        self.assertQuerysetIndexed(
+            Item.objects.filter(name__gt='I').order_by('name', 'id'))
+        self.assertQuerysetIndexed(
+            Supplier.objects.filter(name='Supplier1').order_by('id'))
+
+    def test_links_from_both_sides(self):
+        Link = Supplier.items.through
+        for column, target in (('item_id', 'supplier_id'),
+                               ('supplier_id', 'item_id')):
+            self.assertQuerysetIndexed(
+                Link.objects.filter(
+                    **{f'{column}__in': [self.item1.id]}).values(target))
+
+    def test_aggregate_orderings(self):
+        # supplier2 has no items, its prices are null
+        supplier2 = Supplier.objects.create(
+            name="Supplier2", phone_number="0987654321")
+        for url, orderings, rows in (
+                (reverse('view_items'), ITEM_ORDERINGS, [self.item1]),
+                (reverse('view_suppliers'), SUPPLIER_ORDERINGS,
+                 [self.supplier1, supplier2])):
+            for name in orderings:
+                for ordering in (name, f'-{name}'):
+                    self.assertRequestIndexed(url, {'ordering': ordering})
+                    for row in rows:
+                        row.refresh_from_db()
+                        cursor = encode_cursor([getattr(row, name), row.id])
+                        self.assertRequestIndexed(
+                            url, {'ordering': ordering, 'cursor': cursor})
+        self.assertRequestIndexed(
+            reverse('view_items'),
+            {'ordering': '-supplier_count', 'min_suppliers': 1})
+        self.assertRequestIndexed(
+            reverse('view_suppliers'),
+            {'ordering': 'min_item_price', 'min_price': 50})
+
+    @override_settings(INVENTORY_CHANGES_LAG_SECONDS=0)
+    def test_change_feed(self):
+        self.item2.delete()
+        url = reverse('changes')
+        self.assertRequestIndexed(url)
+        cursor = encode_cursor([self.item1.updated_at, self.item1.id])
+        self.assertRequestIndexed(url, {'since': cursor})
@@ -0,0 +1,186 @@
+import os
+import sqlite3
+import tempfile
+import time
+from unittest import mock
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import (
+    RequestFactory, SimpleTestCase, TestCase, TransactionTestCase,
+    override_settings)
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from supplier_inventory import signals
+from supplier_inventory.cache import ResponseCache, response_cache
+from supplier_inventory.models import Item
+from supplier_inventory.routing import (
+    STICKY_COOKIE, ReplicaRouter, ReplicaRoutingMiddleware, copy_database,
+    reads_from_primary)
+
+REPLICAS = override_settings(
+    INVENTORY_READ_REPLICAS=['replica'], INVENTORY_REPLICA_STICKY_SECONDS=10)
+
+
+@REPLICAS
+class ReplicaRouterTests(SimpleTestCase):
+
+    def setUp(self):
+        self.router = ReplicaRouter()
+
+    def test_reads_go_to_replicas(self):
+        self.assertEqual(self.router.db_for_read(Item), 'replica')
+        self.assertEqual(self.router.db_for_write(Item), 'default')
+        with reads_from_primary():
+            self.assertEqual(self.router.db_for_read(Item), 'default')
+        self.assertEqual(self.router.db_for_read(Item), 'replica')
+
+    def test_replicas_are_not_migrated(self):
+        self.assertFalse(
+            self.router.allow_migrate('replica', 'supplier_inventory'))
+        self.assertIsNone(
+            self.router.allow_migrate('default', 'supplier_inventory'))
+
+    @override_settings(INVENTORY_READ_REPLICAS=[])
+    def test_without_replicas(self):
+        self.assertEqual(self.router.db_for_read(Item), 'default')
+
+
+@REPLICAS
+class ReplicaTransactionTests(TestCase):
+
+    def test_reads_inside_transactions_stay_on_primary(self):
+        self.assertTrue(connection.in_atomic_block)
+        self.assertEqual(ReplicaRouter().db_for_read(Item), 'default')
+
+
+@REPLICAS
+class ReplicaRoutingMiddlewareTests(SimpleTestCase):
+
+    def setUp(self):
+        self.factory = RequestFactory()
+        self.routed = []
+
+    def get_response(self, request):
+        self.routed.append(ReplicaRouter().db_for_read(Item))
+        return HttpResponse()
+
+    async def aget_response(self, request):
+        return self.get_response(request)
+
+    def call(self, request):
+        response = ReplicaRoutingMiddleware(self.get_response)(request)
+        return self.routed.pop(), response
+
+    def test_write_sticks_the_client_to_the_primary(self):
+        db, response = self.call(self.factory.post('/api/add-item/'))
+        self.assertEqual(db, 'default')
+        cookie = response.cookies[STICKY_COOKIE]
+        self.assertEqual(cookie['max-age'], 10)
+
+        self.factory.cookies[STICKY_COOKIE] = cookie.value
+        db, response = self.call(self.factory.get('/api/view-items/'))
+        self.assertEqual(db, 'default')
+        self.assertNotIn(STICKY_COOKIE, response.cookies)
+
+    def test_reads_without_window_go_to_replicas(self):
+        db, _ = self.call(self.factory.get('/api/view-items/'))
+        self.assertEqual(db, 'replica')
+        for until in (time.time() - 1, time.time() + 3600, 'abc'):
+            self.factory.cookies[STICKY_COOKIE] = str(until)
+            db, _ = self.call(self.factory.get('/api/view-items/'))
+            self.assertEqual(db, 'replica')
+
+    async def test_async_requests(self):
+        middleware = ReplicaRoutingMiddleware(self.aget_response)
+        await middleware(self.factory.put('/api/update-item/1'))
+        self.assertEqual(self.routed.pop(), 'default')
+        await middleware(self.factory.get('/api/async/view-items/'))
+        self.assertEqual(self.routed.pop(), 'replica')
+
+
+@REPLICAS
+class PinnedCacheTests(TestCase):
+    """
+    The process wide response_cache plays a worker that cached an item,
+    a second ResponseCache the worker the client writes through.
+    """
+
+    def setUp(self):
+        response_cache.clear()
+        self.client = APIClient()
+        self.item = Item.objects.create(
+            name="Item1", description="Item", price=100)
+        self.url = reverse('view_items')
+
+    def get_name(self):
+        response = self.client.get(self.url, {'item_id': self.item.id})
+        self.assertEqual(response.status_code, 200)
+        return response.data['item']['name']
+
+    def test_pinned_read_after_write_through_another_worker(self):
+        self.assertEqual(self.get_name(), 'Item1')
+        writer = ResponseCache()
+        self.assertIsNotNone(writer.get(('item', self.item.id)))
+        with mock.patch.object(signals, 'response_cache', writer):
+            response = self.client.put(
+                reverse('update_item', args=[self.item.id]),
+                {'name': 'Renamed'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        cookie = self.client.cookies.pop(STICKY_COOKIE)
+        # Other clients get the local copy until INVENTORY_CACHE_LOCAL_TTL
+        self.assertEqual(self.get_name(), 'Item1')
+        self.client.cookies[STICKY_COOKIE] = cookie
+        self.assertEqual(self.get_name(), 'Renamed')
+
+    def test_pinned_hit_costs_one_lookup(self):
+        self.client.put(
+            reverse('update_item', args=[self.item.id]), {'price': 5},
+            format='json')
+        self.assertEqual(self.get_name(), 'Item1')
+        with self.assertNumQueries(1):
+            self.assertEqual(self.get_name(), 'Item1')
+
+
+class SyncReplicaTests(TransactionTestCase):
+
+    def test_copy_database(self):
+        Item.objects.create(name="Item1", description="Item", price=100)
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'replica.sqlite3')
+            self.assertGreater(copy_database(connection, path), 0)
+            Item.objects.create(name="Item2", description="Item", price=100)
+            copy_database(connection, path)
+            replica = sqlite3.connect(path)
+            try:
+                names = replica.execute(
+                    'SELECT name FROM supplier_inventory_item '
+                    'ORDER BY name').fetchall()
+            finally:
+                replica.close()
+        self.assertEqual(names, [('Item1',), ('Item2',)])
+
+    @override_settings(INVENTORY_READ_REPLICAS=[])
+    def test_command_needs_a_replica(self):
+        with self.assertRaisesMessage(CommandError, 'INVENTORY_REPLICA_DB'):
+            call_command('sync_replica')
+
+
+@REPLICAS
+@override_settings(INVENTORY_CHANGES_LAG_SECONDS=0)
+class ChangeFeedRoutingTests(TransactionTestCase):
+    """
+    The replica alias is not configured, a read routed to it fails.
+    """
+
+    def test_change_feed_reads_from_primary(self):
+        item = Item.objects.create(name="Item1", description="Item", price=100)
+        self.assertEqual(ReplicaRouter().db_for_read(Item), 'replica')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('changes'))
+        self.assertEqual(response.status_code, 200, response.content)
+        self.assertEqual(
+            [change['id'] for change in response.json()['changes']],
+            [str(item.id)])
+        self.assertEqual(len(queries), 3)
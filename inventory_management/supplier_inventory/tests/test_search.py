@@ -0,0 +1,90 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+from supplier_inventory.models import Item, Supplier
+from supplier_inventory.pagination import encode_cursor
+from supplier_inventory.search import build_match_query
+
+
+class ItemSearchTests(TestCase):
+
+    def setUp(self):
+        self.client = APIClient()
+        self.url = reverse('search_items')
+        self.supplier1 = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890")
+        self.bike = Item.objects.create(
+            name="bike", description="bajaj boxer", price=23232)
+        self.phone = Item.objects.create(
+            name="phone", description="tecno is good", price=12)
+        self.bike_phone = Item.objects.create(
+            name="bike phone holder", description="fits a phone", price=5)
+        self.phone.suppliers.add(self.supplier1)
+
+    def search(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [item['name'] for item in response.data]
+
+    def test_search_matches_name_and_description(self):
+        self.assertEqual(self.search(q='bajaj'), ['bike'])
+        self.assertEqual(
+            set(self.search(q='bike')), {'bike', 'bike phone holder'})
+
+    def test_search_ranks_better_matches_first(self):
+        self.assertEqual(
+            self.search(q='phone'), ['bike phone holder', 'phone'])
+
+    def test_search_prefix(self):
+        self.assertEqual(self.search(q='tec'), ['phone'])
+
+    def test_search_all_words(self):
+        self.assertEqual(self.search(q='bike holder'), ['bike phone holder'])
+
+    def test_search_price_filters(self):
+        self.assertEqual(self.search(q='phone', min_price=10), ['phone'])
+        self.assertEqual(
+            self.search(q='bike', max_price='100'), ['bike phone holder'])
+
+    def test_search_supplier_filter(self):
+        self.assertEqual(
+            self.search(q='phone', supplier_id=self.supplier1.id), ['phone'])
+
+    def test_index_follows_updates_and_deletes(self):
+        self.bike.name = 'scooter'
+        self.bike.save()
+        self.assertEqual(self.search(q='scooter'), ['scooter'])
+        self.assertEqual(self.search(q='bike'), ['bike phone holder'])
+        self.bike_phone.delete()
+        self.assertEqual(self.search(q='bike'), [])
+
+    def test_search_pagination(self):
+        first = self.client.get(self.url, {'q': 'phone', 'page_size': 1})
+        self.assertEqual(len(first.data), 1)
+        second = self.client.get(
+            self.url,
+            {'q': 'phone', 'page_size': 1,
+             'cursor': first.headers['X-Next-Cursor']})
+        self.assertEqual(second.data[0]['name'], 'phone')
+        self.assertNotIn('X-Next-Cursor', second.headers)
+
+    def test_search_invalid_cursor(self):
+        for cursor in ('garbage', encode_cursor([]), encode_cursor(['x']),
+                       encode_cursor([-1]), encode_cursor([1.5]),
+                       encode_cursor([None]), encode_cursor([1, 2]),
+                       'WzFd'):
+            response = self.client.get(
+                self.url, {'q': 'phone', 'cursor': cursor})
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST, cursor)
+            self.assertEqual(response.data['error'], 'Invalid cursor')
+
+    def test_search_quotes_syntax(self):
+        self.assertEqual(self.search(q='"phone AND ('), [])
+        self.assertEqual(build_match_query('a "b'), '"a" """b"*')
+
+    def test_search_without_query(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['error'], 'Please add a search query')
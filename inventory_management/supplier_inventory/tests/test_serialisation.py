@@ -0,0 +1,104 @@
+from decimal import Decimal
+from django.db.models import Prefetch
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from supplier_inventory.cache import response_cache
+from supplier_inventory.models import Item, Supplier
+from supplier_inventory.projection import Projection
+from supplier_inventory.renderers import FastJSONRenderer
+from supplier_inventory.serialiser import (
+    ItemSerialiser, ItemWithSuppliersSerialiser, SupplierSerialiser,
+    SupplierSummarySerialiser)
+
+
+class FastSerialisationTests(TestCase):
+    """
+    The GETs serialise values() rows with projections and render them
+    with orjson; the bytes must match the ModelSerializer and
+    JSONRenderer output.
+    """
+
+    def setUp(self):
+        self.client = APIClient()
+        response_cache.clear()
+        self.supplier1 = Supplier.objects.create(
+            name="Supplier1", phone_number="1234567890",
+            email="one@example.com")
+        self.supplier2 = Supplier.objects.create(
+            name="Sûpplier \u2028 \"2\"", phone_number="0987654321")
+        self.item1 = Item.objects.create(
+            name="Item1", description="Line\nbreak\ttab \u2029 \u2713",
+            price=100)
+        self.item2 = Item.objects.create(
+            name="Item2", description="", price=Decimal('0.5'))
+        self.item3 = Item.objects.create(
+            name="Item3", description="d", price=Decimal('99999999.99'))
+        self.item1.suppliers.add(self.supplier1, self.supplier2)
+        self.item2.suppliers.add(self.supplier2)
+
+    def render(self, data):
+        return JSONRenderer().render(data)
+
+    def test_item_list(self):
+        items = Item.objects.order_by('created_at', 'id')
+        response = self.client.get(reverse('view_items'))
+        self.assertEqual(
+            response.content,
+            self.render(ItemSerialiser(items, many=True).data))
+
+    def test_item_list_expand(self):
+        items = Item.objects.order_by('created_at', 'id').prefetch_related(
+            Prefetch('suppliers', queryset=Supplier.objects.order_by('id')))
+        response = self.client.get(
+            reverse('view_items'), {'expand': 'suppliers'})
+        expected = ItemWithSuppliersSerialiser(items, many=True).data
+        for item in response.json():
+            item['suppliers'].sort(key=lambda supplier: supplier['id'])
+        self.assertEqual(
+            self.render(response.json()), self.render(expected))
+
+    def test_item_detail(self):
+        response = self.client.get(
+            reverse('view_items'), {'item_id': self.item2.id})
+        self.item2.refresh_from_db()
+        expected = {
+            'item': ItemSerialiser(self.item2).data,
+            'suppliers': list(self.item2.suppliers.values(
+                'id', 'name', 'phone_number'))}
+        self.assertEqual(response.content, self.render(expected))
+
+    def test_supplier_list(self):
+        suppliers = Supplier.objects.order_by('created_at', 'id')
+        response = self.client.get(reverse('view_suppliers'))
+        self.assertEqual(
+            response.content,
+            self.render(SupplierSummarySerialiser(suppliers, many=True).data))
+
+    def test_supplier_detail(self):
+        for supplier in (self.supplier1, self.supplier2):
+            supplier.refresh_from_db()
+            response = self.client.get(
+                reverse('view_suppliers'), {'supplier_id': supplier.id})
+            self.assertEqual(
+                response.content,
+                self.render(SupplierSerialiser(supplier).data))
+
+    def test_projection_matches_serialiser(self):
+        projection = Projection(ItemSerialiser)
+        rows = projection.rows(
+            projection.values(Item.objects.order_by('created_at', 'id')))
+        self.assertEqual(
+            rows,
+            ItemSerialiser(
+                Item.objects.order_by('created_at', 'id'), many=True).data)
+
+    def test_renderer_falls_back(self):
+        renderer = FastJSONRenderer()
+        data = {'big': 2 ** 70, 'line': '\u2028'}
+        self.assertEqual(renderer.render(data), self.render(data))
+        self.assertEqual(
+            renderer.render({'a': [1]}, 'application/json; indent=2'),
+            JSONRenderer().render({'a': [1]}, 'application/json; indent=2'))
+        self.assertEqual(renderer.render(None), b'')
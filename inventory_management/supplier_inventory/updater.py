@@ -0,0 +1,166 @@
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Tuple
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils import timezone
+from .aggregates import refresh_aggregates
+from .importer import ITEM_FIELDS, split_ids
+from .models import Item, Supplier
+from .signals import Link, items_changed
+from .utils import chunked, query_chunk_size
+
+
+class ItemUpdater:
+    """
+    Applies partial updates to many items in one transaction.
+
+    Every change is a dict holding the item id, any of name, description
+    and price, and optionally suppliers to link to the item. Items are
+    not loaded: the existing IDs are checked with one query per chunk,
+    the updates are written with one bulk_update per set of touched
+    fields and the new links with one insert, followed by one UPDATE per
+    chunk of the supplier counts of the items they link, so the cost
+    grows with the number of distinct field sets rather than with the
+    number of items.
+    """
+
+    def __init__(self, max_items: int = None):
+        self.max_items = max_items or getattr(
+            settings, 'INVENTORY_BULK_UPDATE_MAX_ITEMS', 10000)
+        self.item_fields = {
+            name: Item._meta.get_field(name) for name in ITEM_FIELDS}
+        self.item_pk = Item._meta.pk
+        self.supplier_pk = Supplier._meta.pk
+
+    def run(self, changes: Any) -> Dict[str, Any]:
+        """
+        Validates and applies the changes.
+
+        Invalid changes are reported and skipped, the valid ones are
+        applied together.
+
+        Args:
+            changes (list): The changes, one dict per item.
+
+        Returns:
+            dict: The number of updated items and the result of every
+            change, in the order they were given.
+
+        Raises:
+            ValueError: If changes is not a list or is too long.
+        """
+        if not isinstance(changes, list) or not changes:
+            raise ValueError('Please send a list of item changes')
+        if len(changes) > self.max_items:
+            raise ValueError(
+                f'At most {self.max_items} items can be updated at once')
+
+        results, cleaned, seen = [], [], set()
+        for change in changes:
+            item_id = change.get('id') if isinstance(change, dict) else None
+            result = {'id': item_id}
+            results.append(result)
+            try:
+                item_id, values, supplier_ids = self.clean_change(change)
+            except ValidationError as error:
+                result['error'] = ' '.join(error.messages)
+                continue
+            if item_id in seen:
+                result['error'] = 'Duplicate item ID'
+                continue
+            seen.add(item_id)
+            cleaned.append((result, item_id, values, supplier_ids))
+
+        existing_items = self.existing(Item, seen)
+        existing_suppliers = self.existing(
+            Supplier, set().union(*(ids for *_, ids in cleaned)))
+
+        valid = []
+        for result, item_id, values, supplier_ids in cleaned:
+            if item_id not in existing_items:
+                result['error'] = 'Item not found'
+            elif not supplier_ids <= existing_suppliers:
+                result['error'] = 'Some Supplier IDs do not exist'
+            else:
+                result['status'] = 'updated'
+                valid.append((item_id, values, supplier_ids))
+
+        self.apply(valid)
+        return {'updated': len(valid), 'results': results}
+
+    def clean_change(self, change: Any) -> Tuple[Any, Dict[str, Any], set]:
+        """
+        Validates a change.
+
+        Returns:
+            tuple: The item ID, the cleaned field values and the
+            supplier IDs to link.
+
+        Raises:
+            ValidationError: If the change is invalid.
+        """
+        if not isinstance(change, dict):
+            raise ValidationError('Change must be an object')
+        try:
+            item_id = self.item_pk.to_python(change.get('id'))
+        except ValidationError:
+            raise ValidationError('Invalid item ID')
+        if item_id is None:
+            raise ValidationError('Please add the item ID')
+
+        values = {}
+        for name, value in change.items():
+            if name in ('id', 'suppliers'):
+                continue
+            if name not in self.item_fields:
+                raise ValidationError(f"Unknown field '{name}'")
+            try:
+                values[name] = self.item_fields[name].clean(value, None)
+            except ValidationError as error:
+                raise ValidationError(f"{name}: {' '.join(error.messages)}")
+
+        try:
+            supplier_ids = {
+                self.supplier_pk.to_python(value)
+                for value in split_ids(change.get('suppliers'))}
+        except ValidationError:
+            raise ValidationError('Some Supplier IDs do not exist')
+        if not values and not supplier_ids:
+            raise ValidationError('Nothing to update')
+        return item_id, values, supplier_ids
+
+    def existing(self, model, ids: Iterable) -> set:
+        """
+        Returns the subset of IDs present in the table of the model.
+        """
+        found = set()
+        for chunk in chunked(ids, query_chunk_size()):
+            found.update(
+                model.objects.filter(id__in=chunk).values_list('id', flat=True))
+        return found
+
+    def apply(self, valid: List[Tuple[Any, Dict[str, Any], set]]) -> None:
+        """
+        Writes the validated changes in a single transaction.
+        """
+        if not valid:
+            return
+        now = timezone.now()
+        groups, links = defaultdict(list), []
+        for item_id, values, supplier_ids in valid:
+            # bulk_update sets the same columns on every row of a call,
+            # so items are grouped by the fields they change
+            groups[tuple(sorted(values))].append(
+                Item(id=item_id, updated_at=now, **values))
+            links.extend(
+                Link(supplier_id=supplier_id, item_id=item_id)
+                for supplier_id in supplier_ids)
+
+        with transaction.atomic():
+            for fields, items in groups.items():
+                Item.objects.bulk_update(items, [*fields, 'updated_at'])
+            if links:
+                Link.objects.bulk_create(links, ignore_conflicts=True)
+                refresh_aggregates(Item, {link.item_id for link in links})
+            items_changed(item_id for item_id, _, _ in valid)
@@ -1,5 +1,10 @@
-from .views import ItemView, SupplierView
+from .views import (
+    CacheStatsView, ChangeFeedView, ItemBatchView, ItemBulkDeleteView,
+    ItemBulkUpdateView, ItemExportView, ItemImportView, ItemSearchView,
+    ItemView, MetricsView, SupplierBatchView, SupplierBulkDeleteView,
+    SupplierView)
 from django.urls import path
+from . import async_views
 
 
 urlpatterns = [
@@ -7,6 +12,10 @@ urlpatterns = [
         'view-items/',
         ItemView.as_view(),
         name='view_items'),
+    path(
+        'view-items/batch/',
+        ItemBatchView.as_view(),
+        name='view_items_batch'),
     path(
         'add-item/',
         ItemView.as_view(),
@@ -19,10 +28,34 @@ urlpatterns = [
         'delete-item/<str:item_id>',
         ItemView.as_view(),
         name='delete_item'),
+    path(
+        'update-items/',
+        ItemBulkUpdateView.as_view(),
+        name='update_items'),
+    path(
+        'delete-items/',
+        ItemBulkDeleteView.as_view(),
+        name='delete_items'),
+    path(
+        'import-items/',
+        ItemImportView.as_view(),
+        name='import_items'),
+    path(
+        'export-items/',
+        ItemExportView.as_view(),
+        name='export_items'),
+    path(
+        'search-items/',
+        ItemSearchView.as_view(),
+        name='search_items'),
     path(
         'view-suppliers/',
         SupplierView.as_view(),
         name='view_suppliers'),
+    path(
+        'view-suppliers/batch/',
+        SupplierBatchView.as_view(),
+        name='view_suppliers_batch'),
     path(
         'add-supplier/',
         SupplierView.as_view(),
@@ -35,4 +68,32 @@ urlpatterns = [
         'delete-supplier/<str:supplier_id>',
         SupplierView.as_view(),
         name='delete_supplier'),
+    path(
+        'delete-suppliers/',
+        SupplierBulkDeleteView.as_view(),
+        name='delete_suppliers'),
+    path(
+        'changes/',
+        ChangeFeedView.as_view(),
+        name='changes'),
+    path(
+        'cache-stats/',
+        CacheStatsView.as_view(),
+        name='cache_stats'),
+    path(
+        'metrics/',
+        MetricsView.as_view(),
+        name='metrics'),
+    path(
+        'async/view-items/',
+        async_views.view_items,
+        name='async_view_items'),
+    path(
+        'async/view-suppliers/',
+        async_views.view_suppliers,
+        name='async_view_suppliers'),
+    path(
+        'async/stream-changes/',
+        async_views.stream_changes,
+        name='stream_changes'),
 ]
@@ -0,0 +1,27 @@
+from itertools import islice
+from typing import Iterable, Iterator, List
+from django.db import connections
+
+
+def chunked(iterable: Iterable, size: int) -> Iterator[List]:
+    """
+    Splits an iterable into lists of at most size elements.
+
+    Args:
+        iterable (Iterable): The values to split.
+        size (int): The maximum length of a chunk.
+
+    Returns:
+        Iterator: The chunks, the last one may be shorter.
+    """
+    iterator = iter(iterable)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
+
+def query_chunk_size(using: str = 'default') -> int:
+    """
+    Returns how many values can be bound in a single IN (...) lookup
+    on the given database.
+    """
+    return connections[using].features.max_query_params or 1000
@@ -0,0 +1,54 @@
+from datetime import datetime
+from typing import Any, Optional
+from django.http import HttpRequest, HttpResponse
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, quote_etag
+
+
+def get_etag(object_id: Any, updated_at: datetime) -> str:
+    """
+    Returns the ETag of an object version.
+
+    Args:
+        object_id (UUID): The ID of the object.
+        updated_at (datetime): The updated_at of the object.
+
+    Returns:
+        str: The quoted ETag.
+    """
+    version = int(updated_at.timestamp() * 1_000_000)
+    return quote_etag(f'{object_id.hex}-{version:x}')
+
+
+def not_modified(
+        request: HttpRequest,
+        object_id: Any,
+        updated_at: datetime) -> Optional[HttpResponse]:
+    """
+    Returns a 304 response if the client already holds this version
+    of the object, None otherwise.
+    """
+    return get_conditional_response(
+        request,
+        etag=get_etag(object_id, updated_at),
+        last_modified=int(updated_at.timestamp()))
+
+
+def is_conditional(request: HttpRequest) -> bool:
+    """
+    Tells whether the request carries If-None-Match or If-Modified-Since.
+    """
+    return ('HTTP_IF_NONE_MATCH' in request.META
+            or 'HTTP_IF_MODIFIED_SINCE' in request.META)
+
+
+def set_validators(
+        response: HttpResponse,
+        object_id: Any,
+        updated_at: datetime) -> HttpResponse:
+    """
+    Sets the ETag and Last-Modified headers of an object version.
+    """
+    response['ETag'] = get_etag(object_id, updated_at)
+    response['Last-Modified'] = http_date(updated_at.timestamp())
+    return response
@@ -1,12 +1,59 @@
-from django.http import HttpRequest
+from datetime import datetime
+from django.http import (
+    Http404, HttpRequest, HttpResponse, StreamingHttpResponse)
 from rest_framework.response import Response
 from .models import Item, Supplier
 from rest_framework.views import APIView
 from django.shortcuts import get_object_or_404
-from .serialiser import ItemSerialiser, SupplierSerialiser
-from typing import List, Type
+from .serialiser import (
+    ItemSerialiser, ItemSupplierSerialiser, ItemWithSuppliersSerialiser,
+    SupplierSerialiser, SupplierSummarySerialiser)
+from typing import Any, Dict, List, Optional, Tuple, Type
+from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.db.models import Model
 from .decorator import handle_exceptions
+from .pagination import (
+    decode_cursor, encode_cursor, get_filters, get_ordering, get_page_size,
+    paginate, set_next_cursor)
+from .search import search_items
+from .importer import ItemImporter, parse_upload, split_ids
+from .updater import ItemUpdater
+from .creator import (
+    ITEM_COLUMNS, SUPPLIER_COLUMNS, clean_fields, create_item,
+    create_supplier)
+from .deleter import delete_object, delete_objects
+from .exporter import EXPORT_CONTENT_TYPES, export_items
+from .cache import item_key, response_cache, supplier_key
+from .changes import get_since, next_cursor, read_changes
+from .versioning import is_conditional, not_modified, set_validators
+from .projection import get_projection, nest, serialiser_fields
+from .routing import reading_from_primary, reads_from_primary
+from .metrics import CONTENT_TYPE, metrics
+from .utils import chunked, query_chunk_size
+
+# The GETs read values() rows serialised by these projections, which
+# give the same output as the serialisers at a fraction of the cost.
+ITEM_FIELDS = get_projection(ItemSerialiser)
+ITEM_SUPPLIER_FIELDS = get_projection(ItemSupplierSerialiser)
+SUPPLIER_FIELDS = get_projection(SupplierSummarySerialiser)
+
+# What the lists can be ordered by with ?ordering= and the lookups of
+# their range filters, all backed by (field, id) indexes
+ITEM_ORDERINGS = ('created_at', 'supplier_count')
+ITEM_FILTERS = {
+    'min_suppliers': 'supplier_count__gte',
+    'max_suppliers': 'supplier_count__lte',
+}
+SUPPLIER_ORDERINGS = (
+    'created_at', 'item_count', 'min_item_price', 'max_item_price',
+    'avg_item_price')
+SUPPLIER_FILTERS = {
+    'min_items': 'item_count__gte',
+    'max_items': 'item_count__lte',
+    'min_price': 'min_item_price__gte',
+    'max_price': 'max_item_price__lte',
+}
 
 
 class ApiMethodMixin:
@@ -33,9 +80,13 @@ class ApiMethodMixin:
         updated = self.update_object_attributes(data_copy, obj)
 
         if related_ids:
-            if not self.check_ids(related_ids, self.related_model):
-                return {"error": "Some Supplier IDs do not exist"}
-            getattr(obj, self.related_name).add(*related_ids)
+            missing = self.missing_ids(related_ids, self.related_model)
+            if missing:
+                return {
+                    "error":
+                        f"Some {self.related_model.__name__} IDs do not exist",
+                    "missing_ids": missing}
+            getattr(obj, self.related_name).add(*split_ids(related_ids))
 
             updated = True
 
@@ -63,7 +114,282 @@ class ApiMethodMixin:
                 updated = True
         return updated
 
-    def check_ids(self, object_ids: List[int], obj_class: Type[Model]) -> int:
+    def get_expand(self, request: HttpRequest) -> Optional[str]:
+        """
+        Reads the expand query parameter of a list request.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            str: The related name to expand, or None if nothing is expanded.
+
+        Raises:
+            ValueError: If the relation can not be expanded on this view.
+        """
+        expand = request.query_params.get('expand')
+        if expand and expand != self.related_name:
+            raise ValueError(
+                f"Invalid expand '{expand}', use '{self.related_name}'")
+        return expand or None
+
+    def get_fields(
+            self,
+            request: HttpRequest,
+            serialiser_class) -> Optional[List[str]]:
+        """
+        Reads the fields query parameter, a comma separated subset of
+        the fields of the serialiser.
+
+        Args:
+            request (HttpRequest): The HTTP request object, a plain
+                Django one for the async views.
+            serialiser_class: The serialiser of the response.
+
+        Returns:
+            list: The requested fields in output order, or None if all
+            fields are requested.
+
+        Raises:
+            ValueError: If a field is not a field of the serialiser.
+        """
+        fields = request.GET.get('fields')
+        if fields is None:
+            return None
+        allowed = serialiser_fields(serialiser_class)
+        requested = {field.strip() for field in fields.split(',')}
+        requested.discard('')
+        if not requested:
+            raise ValueError('Please add at least one field')
+        for field in sorted(requested):
+            if field not in allowed:
+                raise ValueError(
+                    f"Invalid field '{field}', use {', '.join(allowed)}")
+        return [field for field in allowed if field in requested]
+
+    def get_page(self, request: HttpRequest) -> Response:
+        """
+        Returns a page of objects, with their related objects if the
+        request expands them, reading only the requested fields, in the
+        requested ordering and narrowed by the requested filters.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            Response: The page, the cursor of the next page is sent in
+            the X-Next-Cursor header.
+
+        Raises:
+            ValueError: If expand, fields, the ordering, the cursor or
+            the page size is invalid.
+            ValidationError: If a filter value is invalid.
+        """
+        expand = self.get_expand(request)
+        ordering = get_ordering(request, self.orderings)
+        queryset = self.model.objects.filter(
+            get_filters(request, self.model, self.filters))
+        serialiser_class = (
+            self.expanded_serialiser_class if expand
+            else self.serialiser_class)
+        fields = self.get_fields(request, serialiser_class)
+        if fields is None:
+            fields = serialiser_fields(serialiser_class)
+        projection = get_projection(
+            self.serialiser_class,
+            tuple(field for field in fields if field != self.related_name))
+        # The cursor needs the ordering fields and nest needs the id
+        extra = [
+            field.lstrip('-') for field in ordering
+            if field.lstrip('-') not in projection.columns]
+
+        rows, next_cursor = paginate(
+            projection.values(queryset, *extra), request, ordering)
+        if self.related_name in fields:
+            nest(rows, self.related_name, self.related_fields,
+                 self.related_model.objects.all(), self.related_link)
+        for row in rows:
+            for field in extra:
+                del row[field]
+        return set_next_cursor(Response(projection.rows(rows)), next_cursor)
+
+    def get_cached_details(
+            self, request: HttpRequest, object_id: str) -> Response:
+        """
+        Returns the details of one object from the response cache,
+        answering conditional requests with 304 Not Modified.
+
+        Each cache entry keeps the updated_at of the object. On a miss
+        a request carrying If-None-Match or If-Modified-Since is checked
+        with a primary key lookup of updated_at before the object is
+        loaded from the default database and serialised. The full
+        details are cached and narrowed to the fields query parameter
+        when it is given.
+
+        A client pinned to the primary after a write must see it, while
+        the local cache tier of this worker may still hold the object as
+        it was before the write made through another worker. Its
+        requests check the updated_at of a hit on the primary first.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            object_id (str): The ID of the object.
+
+        Returns:
+            Response: The details with ETag and Last-Modified headers,
+            or a 304 response.
+
+        Raises:
+            Http404: If the object does not exist.
+            ValueError: If fields is invalid.
+        """
+        fields = self.get_fields(request, self.details_serialiser_class)
+        object_id = self.model._meta.pk.to_python(object_id)
+        key = self.cache_key(object_id)
+        entry = response_cache.get(key)
+        checked = reading_from_primary() or (
+            entry is None and is_conditional(request))
+        if checked:
+            updated_at = self.model.objects.filter(
+                pk=object_id).values_list('updated_at', flat=True).first()
+            if updated_at is None:
+                raise Http404
+            if entry is not None and entry[0] != updated_at:
+                entry = None
+        if entry is None:
+            if checked and (
+                    response := not_modified(request, object_id, updated_at)):
+                return response
+            # Shared by every client, the cache is filled from the
+            # primary so that a lagging replica cannot outlive a write
+            with reads_from_primary():
+                entry = self.get_details(object_id)
+            response_cache.set(key, entry)
+
+        updated_at, data = entry
+        if response := not_modified(request, object_id, updated_at):
+            return response
+        if fields is not None:
+            data = self.narrow_details(data, fields)
+        return set_validators(Response(data), object_id, updated_at)
+
+    def get_batch(self, request: HttpRequest, object_ids: Any) -> Response:
+        """
+        Returns the details of many objects, keyed by ID.
+
+        The objects are read with one id__in query plus one query for
+        their related objects per chunk of IDs, chunks staying under
+        the bound parameter limit of the database.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            object_ids: A list of IDs or a string of IDs separated by
+                commas.
+
+        Returns:
+            Response: The number of objects found and the details of
+            every requested ID, or an error for IDs that are invalid
+            or do not exist.
+
+        Raises:
+            ValueError: If no or too many IDs are given, or fields is
+            invalid.
+        """
+        fields = self.get_fields(request, self.details_serialiser_class)
+        object_ids = split_ids(object_ids)
+        if not object_ids:
+            raise ValueError('Please add the IDs')
+        max_ids = getattr(settings, 'INVENTORY_BATCH_MAX_IDS', 1000)
+        if len(object_ids) > max_ids:
+            raise ValueError(f'At most {max_ids} IDs can be fetched at once')
+
+        name = self.model.__name__
+        pk = self.model._meta.pk
+        results, valid = {}, {}
+        for raw_id in object_ids:
+            try:
+                object_id = pk.to_python(raw_id)
+            except ValidationError:
+                results[str(raw_id)] = {'error': f'Invalid {name} ID'}
+                continue
+            valid[object_id] = results[str(object_id)] = None
+
+        found = {}
+        for chunk in chunked(valid, query_chunk_size()):
+            found.update(self.get_many_details(chunk))
+        for object_id in valid:
+            details = found.get(object_id)
+            if details is None:
+                details = {'error': f'{name} not found'}
+            elif fields is not None:
+                details = self.narrow_details(details, fields)
+            results[str(object_id)] = details
+        return Response({'found': len(found), 'results': results})
+
+    def find_ids(
+            self,
+            object_ids: Any,
+            obj_class: Type[Model],
+            projection=None) -> Tuple[Dict[Any, Any], List]:
+        """
+        Looks up objects by ID.
+
+        The IDs are deduplicated once normalised, so the same UUID
+        written in different cases counts once, and are looked up with
+        one query per chunk of the database's parameter limit. An ID
+        that is not a valid primary key is reported as missing.
+
+        Args:
+            object_ids (list): The IDs to look up, a list or a string
+                separated by commas, semicolons or spaces.
+            obj_class (Model): Model class to query for object IDs.
+            projection (Projection): Reads the found objects as values()
+                rows of this projection, only their IDs by default.
+
+        Returns:
+            tuple: The found objects keyed by normalised ID, their rows
+            or their IDs, and the missing IDs as they were given, both
+            in the order they were first given.
+
+        Raises:
+            ValidationError: If object_ids is not a list or a string.
+        """
+        pk = obj_class._meta.pk
+        # normalised ID -> ID as given, invalid IDs are keyed as given
+        given, invalid = {}, set()
+        for object_id in split_ids(object_ids):
+            try:
+                key = pk.to_python(object_id)
+            except ValidationError:
+                key = object_id
+                invalid.add(key)
+            given.setdefault(key, object_id)
+
+        rows = {}
+        for chunk in chunked(given.keys() - invalid, query_chunk_size()):
+            queryset = obj_class.objects.filter(pk__in=chunk)
+            if projection is None:
+                rows.update(
+                    (key, key)
+                    for key in queryset.values_list('pk', flat=True))
+            else:
+                rows.update(
+                    (row['id'], row) for row in projection.values(queryset))
+        found = {key: rows[key] for key in given if key in rows}
+        missing = [
+            object_id for key, object_id in given.items()
+            if key not in rows]
+        return found, missing
+
+    def missing_ids(
+            self, object_ids: Any, obj_class: Type[Model]) -> List:
+        """
+        Returns the object IDs that are not present in the database, as
+        they were given and in the order they were first given.
+        """
+        return self.find_ids(object_ids, obj_class)[1]
+
+    def check_ids(self, object_ids: Any, obj_class: Type[Model]) -> bool:
         """
         Check if all object IDs are present in the database.
 
@@ -74,8 +400,7 @@ class ApiMethodMixin:
         Returns:
             bool: True if all object IDs are present, False otherwise.
         """
-        return obj_class.objects.filter(
-            id__in=object_ids).count() == len(object_ids)
+        return not self.missing_ids(object_ids, obj_class)
 
 
 
@@ -87,6 +412,14 @@ class ItemView(APIView, ApiMethodMixin):
     related_model = Supplier
     model = Item
     related_name = 'suppliers'
+    related_link = 'items'
+    related_fields = ITEM_SUPPLIER_FIELDS
+    orderings = ITEM_ORDERINGS
+    filters = ITEM_FILTERS
+    serialiser_class = ItemSerialiser
+    expanded_serialiser_class = ItemWithSuppliersSerialiser
+    details_serialiser_class = ItemSerialiser
+    cache_key = staticmethod(item_key)
 
     @handle_exceptions
     def get(self, request: HttpRequest) -> Response:
@@ -99,25 +432,76 @@ class ItemView(APIView, ApiMethodMixin):
         Returns:
             Response: JSON response containing
             item details and associated suppliers
-            or all items if no specific item ID is provided.
+            or a page of items if no specific item ID is provided.
+            The cursor of the next page is sent in the X-Next-Cursor header.
+            With ?expand=suppliers every item of the page carries its
+            suppliers, loaded in a single batched query.
+            ?ordering= orders the page by created_at or supplier_count,
+            '-' first for descending, and ?min_suppliers= and
+            ?max_suppliers= narrow it by supplier_count.
+            A single item carries ETag and Last-Modified headers and
+            conditional requests for an unchanged item get 304.
         Raises:
             Exception: If an error occurs during the retrieval process.
         """
         item_id = request.query_params.get('item_id')
 
         if not item_id:
-            all_items = Item.objects.all()
-            all_items_json = ItemSerialiser(all_items, many=True).data
-            return Response(all_items_json)
+            return self.get_page(request)
+
+        return self.get_cached_details(request, item_id)
 
-        item = get_object_or_404(
-            Item.objects.prefetch_related('suppliers'), id=item_id)
+    def get_details(self, item_id: str) -> Tuple[datetime, dict]:
+        """
+        Serialises an item and its suppliers.
+
+        Args:
+            item_id (str): The ID of the item.
+
+        Returns:
+            tuple: The updated_at of the item and a dict with the item
+            details and the list of its suppliers.
+        """
+        item = ITEM_FIELDS.values(
+            Item.objects.filter(id=item_id), 'updated_at').first()
+        if item is None:
+            raise Http404
+        updated_at = item.pop('updated_at')
+        all_suppliers = ITEM_SUPPLIER_FIELDS.rows(ITEM_SUPPLIER_FIELDS.values(
+            Supplier.objects.filter(items=item_id)))
+        return updated_at, {
+            'item': ITEM_FIELDS.row(item), 'suppliers': all_suppliers}
 
-        item_json = ItemSerialiser(item).data
-        all_suppliers = item.suppliers.all().values(
-            'id', 'name', 'phone_number')
-        combined_data = {'item': item_json, 'suppliers': all_suppliers}
-        return Response(combined_data)
+    def get_many_details(self, item_ids: List) -> Dict[Any, dict]:
+        """
+        Serialises many items and their suppliers with two queries.
+
+        Args:
+            item_ids (list): The IDs of the items, within the bound
+                parameter limit.
+
+        Returns:
+            dict: The details of the existing items keyed by ID, in the
+            format of get_details.
+        """
+        items = list(ITEM_FIELDS.values(Item.objects.filter(id__in=item_ids)))
+        nest(items, 'suppliers', ITEM_SUPPLIER_FIELDS, Supplier.objects.all(),
+             'items')
+        keys = [item['id'] for item in items]
+        suppliers = [item.pop('suppliers') for item in items]
+        return {
+            key: {'item': item, 'suppliers': item_suppliers}
+            for key, item, item_suppliers in zip(
+                keys, ITEM_FIELDS.rows(items), suppliers)}
+
+    def narrow_details(self, details: dict, fields: List[str]) -> dict:
+        """
+        Keeps only the given fields of the item, its suppliers are
+        always listed.
+        """
+        item = details['item']
+        return {'item': {field: item[field] for field in fields},
+                'suppliers': details['suppliers']}
 
     @handle_exceptions
     def post(self, request: HttpRequest) -> Response:
@@ -136,22 +520,29 @@ class ItemView(APIView, ApiMethodMixin):
         """
 
         suppliers_ids = request.data.get('suppliers')
-        name = request.data.get('name')
-        description = request.data.get('description')
-        price = request.data.get('price')
-
         if not suppliers_ids:
             return Response(
                 {"Error": "Please add the supplier"}, status=400)
 
-        if not self.check_ids(suppliers_ids, Supplier):
+        if not isinstance(suppliers_ids, list):
+            return Response(
+                {"error": "suppliers must be a list of IDs"}, 400)
+
+        try:
+            values = clean_fields(Item, request.data, ITEM_COLUMNS)
+        except ValidationError as error:
+            return Response({"error": ' '.join(error.messages)}, 400)
+
+        found, missing = self.find_ids(suppliers_ids, Supplier)
+        if missing:
             return Response(
-                {"error": "Some Supplier IDs do not exist"}, 400)
+                {"error": "Some Supplier IDs do not exist",
+                 "missing_ids": missing}, 400)
 
-        item = Item.objects.create(
-            name=name, description=description, price=price)
-        item.suppliers.add(*suppliers_ids)
-        return Response({'Item_id': {item.id}, 'Item_info': str(item)}, 201)
+        values = create_item(values, found)
+        return Response(
+            {'Item_id': {values['id']}, 'Item_info': str(Item(**values))},
+            201)
 
     @handle_exceptions
     def put(self, request: HttpRequest, item_id: str) -> Response:
@@ -181,6 +572,9 @@ class ItemView(APIView, ApiMethodMixin):
         """
         Handle DELETE requests to remove an item from the database.
 
+        The item is deleted with its supplier links without being
+        loaded, see delete_objects.
+
         Args:
             request (HttpRequest): The HTTP request object.
             item_id (str): The ID of the item to delete.
@@ -191,20 +585,353 @@ class ItemView(APIView, ApiMethodMixin):
                 Exception: If an error occurs during the deletion process.
         """
 
-        item = get_object_or_404(Item, id=item_id)
-        item_details = str(item)
-        item.delete()
-        return Response(f'{item_details} deleted')
+        if not delete_object(Item, item_id):
+            raise Http404
+        return Response(f'Item {item_id} deleted')
+
+
+class BatchView(APIView):
+    """
+    Handles GET and POST requests fetching many objects by ID, with the
+    details returned by details_view_class for a single object.
+    """
+    details_view_class = None
+
+    @handle_exceptions
+    def get(self, request: HttpRequest) -> Response:
+        """
+        Handle GET requests for the IDs listed in ?ids=, separated by
+        commas.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            Response: JSON response with the details keyed by ID.
+            Raises:
+                Exception: If the IDs or fields are invalid.
+        """
+        return self.details_view_class().get_batch(
+            request, request.query_params.get('ids'))
+
+    @handle_exceptions
+    def post(self, request: HttpRequest) -> Response:
+        """
+        Handle POST requests for the IDs listed in the ids of the body,
+        or given as the body, for lists too long for a URL.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            Response: JSON response with the details keyed by ID.
+            Raises:
+                Exception: If the IDs or fields are invalid.
+        """
+        data = request.data
+        object_ids = data if isinstance(data, list) else data.get('ids')
+        return self.details_view_class().get_batch(request, object_ids)
+
+
+class ItemImportView(APIView):
+    """
+    Handles POST requests importing many items from an NDJSON or CSV upload.
+    """
+
+    @handle_exceptions
+    def post(self, request: HttpRequest) -> Response:
+        """
+        Handle POST requests streaming items into the database.
+
+        The body is read line by line and inserted in chunks, each row
+        needs a name, description, price and at least one supplier ID.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            Response: JSON response with the number of created items
+            and the errors of the rejected rows.
+            Raises:
+                Exception: If an error occurs during the import process.
+        """
+        rows = parse_upload(request.stream, request.content_type)
+        report = ItemImporter().run(rows)
+        return Response(report, 201 if report['created'] else 400)
+
+
+class ItemBulkUpdateView(APIView):
+    """
+    Handles PATCH requests updating many items at once.
+    """
+
+    @handle_exceptions
+    def patch(self, request: HttpRequest) -> Response:
+        """
+        Handle PATCH requests applying a list of item changes in a
+        single transaction.
+
+        Every change holds the item id, the fields to change and
+        optionally the IDs of suppliers to link to the item. Invalid
+        changes are skipped and reported, the others are applied.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            Response: JSON response with the number of updated items
+            and the result of every change.
+            Raises:
+                Exception: If the body is not a list of changes.
+        """
+        report = ItemUpdater().run(request.data)
+        return Response(report, 200 if report['updated'] else 400)
+
+
+class ItemExportView(APIView):
+    """
+    Handles GET requests exporting the full catalogue.
+    """
+
+    @handle_exceptions
+    def get(self, request: HttpRequest) -> StreamingHttpResponse:
+        """
+        Handle GET requests streaming every item with its supplier IDs
+        as NDJSON, or as CSV with ?type=csv.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            StreamingHttpResponse: The export, generated chunk by chunk
+            while it is sent.
+            Raises:
+                Exception: If the export type is not supported.
+        """
+        export_format = request.query_params.get('type', 'ndjson')
+        response = StreamingHttpResponse(
+            export_items(export_format),
+            content_type=EXPORT_CONTENT_TYPES[export_format])
+        response['Content-Disposition'] = (
+            f'attachment; filename="items.{export_format}"')
+        return response
+
+
+class ItemSearchView(APIView):
+    """
+    Handles GET requests searching items by name and description.
+    """
+
+    @handle_exceptions
+    def get(self, request: HttpRequest) -> Response:
+        """
+        Handle GET requests returning a page of the items matching ?q=,
+        best matches first.
+
+        The results can be narrowed with ?min_price=, ?max_price= and
+        ?supplier_id=. The cursor of the next page is sent in the
+        X-Next-Cursor header.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            Response: JSON response with the matching items.
+            Raises:
+                Exception: If the query or a filter is invalid.
+        """
+        params = request.query_params
+        price = Item._meta.get_field('price')
+        min_price = params.get('min_price')
+        max_price = params.get('max_price')
+        supplier_id = params.get('supplier_id')
+
+        page_size = get_page_size(request)
+        offset = 0
+        if cursor := params.get('cursor'):
+            values = decode_cursor(cursor)
+            # The cursor holds the offset of the next page as digits
+            if (len(values) != 1 or not isinstance(values[0], str)
+                    or not (values[0].isascii() and values[0].isdigit())):
+                raise ValueError('Invalid cursor')
+            offset = int(values[0])
+
+        items = search_items(
+            params.get('q', ''),
+            offset=offset,
+            limit=page_size + 1,
+            min_price=price.to_python(min_price) if min_price else None,
+            max_price=price.to_python(max_price) if max_price else None,
+            supplier_id=Supplier._meta.pk.to_python(
+                supplier_id) if supplier_id else None)
+
+        next_cursor = None
+        if len(items) > page_size:
+            items = items[:page_size]
+            next_cursor = encode_cursor([offset + page_size])
+        items_json = ItemSerialiser(items, many=True).data
+        return set_next_cursor(Response(items_json), next_cursor)
+
+
+class ChangeFeedView(APIView):
+    """
+    Handles GET requests listing the items and suppliers created,
+    updated or deleted since a cursor, for incremental syncs.
+    """
+
+    @handle_exceptions
+    def get(self, request: HttpRequest) -> Response:
+        """
+        Handle GET requests returning a page of the changes after the
+        cursor given in ?since=, oldest first, every change from the
+        start without it.
+
+        Items come with their suppliers and suppliers with the fields of
+        the supplier list, deletions with their ID only. An object
+        changed many times appears once, at its last change. It is
+        'created' when created after the time of the cursor, otherwise
+        'updated', which a client that stopped in the middle of a sync
+        may not have seen yet either: both are upserts. The cursor of
+        the response is the ?since= of the next request, whether more
+        changes follow or not.
+
+        The feed is read from the primary. A replica may not have the
+        changes of transactions that committed after its last sync
+        while holding later ones, and the cursor would move past the
+        missing changes for good.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            Response: JSON response with the changes, the next cursor
+            and whether more changes follow.
+            Raises:
+                Exception: If the cursor or the page size is invalid.
+        """
+        token = request.query_params.get('since')
+        since = get_since(token)
+        with reads_from_primary():
+            changes, more = read_changes(since, get_page_size(request))
+
+            live = {}
+            for model, changed in (
+                    (Item, self.load_items),
+                    (Supplier, self.load_suppliers)):
+                object_ids = [
+                    change.object_id for change in changes
+                    if change.model == model._meta.model_name
+                    and not change.deleted]
+                for chunk in chunked(object_ids, query_chunk_size()):
+                    live.update(changed(chunk))
+
+        changes_json = []
+        for change in changes:
+            change_json = {
+                'model': change.model,
+                'id': str(change.object_id),
+                'changed_at': change.changed_at.isoformat(),
+            }
+            if change.deleted:
+                change_json['action'] = 'deleted'
+            else:
+                data = live.get((change.model, change.object_id))
+                if data is None:
+                    # Deleted since, its tombstone comes later
+                    continue
+                created = since is None or change.created_at > since[0]
+                change_json['action'] = 'created' if created else 'updated'
+                change_json['data'] = data
+            changes_json.append(change_json)
+        return Response({
+            'changes': changes_json,
+            'cursor': next_cursor(changes, token),
+            'more': more,
+        })
+
+    def load_items(self, item_ids: List) -> Dict[Tuple[str, Any], dict]:
+        """
+        Serialises changed items with their suppliers in two queries,
+        keyed by ('item', id).
+        """
+        items = list(ITEM_FIELDS.values(Item.objects.filter(id__in=item_ids)))
+        nest(items, 'suppliers', ITEM_SUPPLIER_FIELDS, Supplier.objects.all(),
+             'items')
+        keys = [('item', item['id']) for item in items]
+        suppliers = [item.pop('suppliers') for item in items]
+        return {
+            key: dict(item, suppliers=item_suppliers)
+            for key, item, item_suppliers in zip(
+                keys, ITEM_FIELDS.rows(items), suppliers)}
+
+    def load_suppliers(
+            self, supplier_ids: List) -> Dict[Tuple[str, Any], dict]:
+        """
+        Serialises changed suppliers in one query, keyed by
+        ('supplier', id).
+        """
+        suppliers = list(SUPPLIER_FIELDS.values(
+            Supplier.objects.filter(id__in=supplier_ids)))
+        keys = [('supplier', supplier['id']) for supplier in suppliers]
+        return dict(zip(keys, SUPPLIER_FIELDS.rows(suppliers)))
+
+
+class CacheStatsView(APIView):
+    """
+    Handles GET requests reporting the response cache counters.
+    """
+
+    @handle_exceptions
+    def get(self, request: HttpRequest) -> Response:
+        """
+        Handle GET requests returning the hit, miss and eviction counts
+        of the item and supplier detail cache of this worker.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            Response: JSON response with the cache counters.
+        """
+        return Response(response_cache.stats())
+
+
+class MetricsView(APIView):
+    """
+    Handles GET requests exposing the request metrics to Prometheus.
+    """
+
+    def get(self, request: HttpRequest) -> HttpResponse:
+        """
+        Handle GET requests returning the latency histograms, status
+        code counters and in-flight gauges of this worker in the
+        Prometheus text format.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            HttpResponse: The metrics as text.
+        """
+        return HttpResponse(metrics.render(), content_type=CONTENT_TYPE)
 
 
 class SupplierView(APIView, ApiMethodMixin):
     """
-    Handles GET, POST, and PUT requests for supplier details and
+    Handles GET, POST, PUT, and DELETE requests for supplier details and
     associated items.
     """
     related_model = Item
     model = Supplier
     related_name = 'items'
+    related_link = 'suppliers'
+    related_fields = ITEM_FIELDS
+    orderings = SUPPLIER_ORDERINGS
+    filters = SUPPLIER_FILTERS
+    serialiser_class = SupplierSummarySerialiser
+    expanded_serialiser_class = SupplierSerialiser
+    details_serialiser_class = SupplierSerialiser
+    cache_key = staticmethod(supplier_key)
 
     @handle_exceptions
     def get(self, request: HttpRequest) -> Response:
@@ -217,20 +944,69 @@ class SupplierView(APIView, ApiMethodMixin):
         Returns:
             Response: JSON response containing supplier
             details and associated items
-            or all suppliers if no specific supplier ID is provided.
+            or a page of suppliers if no specific supplier ID is provided.
+            The cursor of the next page is sent in the X-Next-Cursor header.
+            With ?expand=items every supplier of the page carries its
+            items, loaded in a single batched query.
+            ?ordering= orders the page by created_at, item_count or
+            the min, max or avg item price, '-' first for descending.
+            ?min_items= and ?max_items= narrow it by item_count,
+            ?min_price= and ?max_price= to the suppliers whose items
+            all cost at least or at most the given price.
+            A single supplier carries ETag and Last-Modified headers and
+            conditional requests for an unchanged supplier get 304.
             Raises:
                 Exception: If an error occurs during the retrieval process.
         """
 
         if supplier_id := request.query_params.get('supplier_id'):
-            supplier = get_object_or_404(Supplier, id=supplier_id)
-            serialiser = SupplierSerialiser(supplier)
-            return Response(serialiser.data)
+            return self.get_cached_details(request, supplier_id)
+
+        return self.get_page(request)
+
+    def get_details(self, supplier_id: str) -> Tuple[datetime, dict]:
+        """
+        Serialises a supplier and its items.
+
+        Args:
+            supplier_id (str): The ID of the supplier.
+
+        Returns:
+            tuple: The updated_at of the supplier and its details.
+        """
+        supplier = SUPPLIER_FIELDS.values(
+            Supplier.objects.filter(id=supplier_id), 'updated_at').first()
+        if supplier is None:
+            raise Http404
+        updated_at = supplier.pop('updated_at')
+        supplier_json = SUPPLIER_FIELDS.row(supplier)
+        supplier_json['items'] = ITEM_FIELDS.rows(ITEM_FIELDS.values(
+            Item.objects.filter(suppliers=supplier_id)))
+        return updated_at, supplier_json
+
+    def get_many_details(self, supplier_ids: List) -> Dict[Any, dict]:
+        """
+        Serialises many suppliers and their items with two queries.
+
+        Args:
+            supplier_ids (list): The IDs of the suppliers, within the
+                bound parameter limit.
+
+        Returns:
+            dict: The details of the existing suppliers keyed by ID, in
+            the format of get_details.
+        """
+        suppliers = list(SUPPLIER_FIELDS.values(
+            Supplier.objects.filter(id__in=supplier_ids)))
+        nest(suppliers, 'items', ITEM_FIELDS, Item.objects.all(), 'suppliers')
+        keys = [supplier['id'] for supplier in suppliers]
+        return dict(zip(keys, SUPPLIER_FIELDS.rows(suppliers)))
 
-        all_suppliers = Supplier.objects.all().values(
-            'id', 'name', 'phone_number', 'email'
-        )
-        return Response(all_suppliers)
+    def narrow_details(self, details: dict, fields: List[str]) -> dict:
+        """
+        Keeps only the given fields of the supplier.
+        """
+        return {field: details[field] for field in fields}
 
     @handle_exceptions
     def post(self, request: HttpRequest) -> Response:
@@ -246,22 +1022,27 @@ class SupplierView(APIView, ApiMethodMixin):
             Raises:
                 Exception: If an error occurs during the creation process.
         """
-        name = request.data.get('name')
-        phone_number = request.data.get('phone_number')
-        email = request.data.get('email')
-        items_ids = request.data.get('items')
+        try:
+            values = clean_fields(Supplier, request.data, SUPPLIER_COLUMNS)
+        except ValidationError as error:
+            return Response({"error": ' '.join(error.messages)}, 400)
 
-        supplier = Supplier.objects.create(
-            name=name, phone_number=phone_number, email=email)
+        # The items are read once, to check them and for the response
+        found, missing = self.find_ids(
+            request.data.get('items') or [], Item, ITEM_FIELDS)
+        if missing:
+            return Response(
+                {"error": "Some Item IDs do not exist",
+                 "missing_ids": missing}, 400)
 
-        if items_ids:
-            if isinstance(items_ids, str):
-                items_ids = items_ids.split(', ')
-            if not self.check_ids(items_ids, Item):
-                return Response('Some id of items dont exist', 400)
-            supplier.items.add(*items_ids)
-        serialiser = SupplierSerialiser(supplier)
-        return Response(serialiser.data, 201)
+        values = create_supplier(values, found)
+        supplier = SUPPLIER_FIELDS.row(
+            {column: values[column] for column in SUPPLIER_FIELDS.columns})
+        # The items were read before the new supplier was linked to them
+        for item in found.values():
+            item['supplier_count'] += 1
+        supplier['items'] = ITEM_FIELDS.rows(found.values())
+        return Response(supplier, 201)
 
     @handle_exceptions
     def put(self, request: HttpRequest, supplier_id: str) -> Response:
@@ -284,5 +1065,101 @@ class SupplierView(APIView, ApiMethodMixin):
             return Response(result, 400)
 
         supplier.save()
+        # Linking items changed the aggregates in the database
+        supplier.refresh_from_db(fields=Supplier.maintained_fields)
         serialiser = SupplierSerialiser(supplier)
         return Response(serialiser.data)
+
+    @handle_exceptions
+    def delete(self, request: HttpRequest, supplier_id: str) -> Response:
+        """
+        Handle DELETE requests to remove a supplier from the database.
+
+        The supplier is deleted with its item links without being
+        loaded, see delete_objects.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+            supplier_id (str): The ID of the supplier to delete.
+
+        Returns:
+            Response: JSON response confirming the deletion of the
+            supplier.
+            Raises:
+                Exception: If an error occurs during the deletion process.
+        """
+        if not delete_object(Supplier, supplier_id):
+            raise Http404
+        return Response(f'Supplier {supplier_id} deleted')
+
+
+class BulkDeleteView(APIView):
+    """
+    Handles DELETE requests removing many objects of model at once.
+    """
+    model = None
+
+    @handle_exceptions
+    def delete(self, request: HttpRequest) -> Response:
+        """
+        Handle DELETE requests for the IDs listed in ?ids=, separated by
+        commas, or in the ids of the body, or given as the body.
+
+        The objects and their links are removed in one transaction with
+        set based statements, see delete_objects.
+
+        Args:
+            request (HttpRequest): The HTTP request object.
+
+        Returns:
+            Response: JSON response with the number of deleted objects
+            and the IDs that are invalid or do not exist, 404 if none
+            was deleted.
+            Raises:
+                Exception: If no or too many IDs are given.
+        """
+        object_ids = request.query_params.get('ids')
+        if object_ids is None:
+            data = request.data
+            object_ids = data if isinstance(data, list) else data.get('ids')
+        object_ids = split_ids(object_ids)
+        if not object_ids:
+            raise ValueError('Please add the IDs')
+        max_ids = getattr(settings, 'INVENTORY_BULK_DELETE_MAX_IDS', 10000)
+        if len(object_ids) > max_ids:
+            raise ValueError(f'At most {max_ids} IDs can be deleted at once')
+
+        deleted, missing = delete_objects(self.model, object_ids)
+        return Response(
+            {'deleted': len(deleted), 'missing_ids': missing},
+            200 if deleted else 404)
+
+
+class ItemBulkDeleteView(BulkDeleteView):
+    """
+    Handles DELETE requests removing many items with their links.
+    """
+    model = Item
+
+
+class SupplierBulkDeleteView(BulkDeleteView):
+    """
+    Handles DELETE requests removing many suppliers with their links.
+    """
+    model = Supplier
+
+
+class ItemBatchView(BatchView):
+    """
+    Handles GET and POST requests fetching many items with their
+    suppliers.
+    """
+    details_view_class = ItemView
+
+
+class SupplierBatchView(BatchView):
+    """
+    Handles GET and POST requests fetching many suppliers with their
+    items.
+    """
+    details_view_class = SupplierView